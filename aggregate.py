@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Streaming group-by accumulators: O(groups) memory instead of a list per group.
+
+Acc keeps count, running sum and Welford's mean/M2, so mean, variance, standard
+deviation and standard error come out of one pass. The mean is reported from the
+running sum, a plain left-to-right addition. Before Python 3.12 that is exactly
+what `sum(list)` does, so averages match the list-based code bit-for-bit; from
+3.12 `sum()` of floats uses compensated summation, so the two can differ in the
+last few ulps.
+
+Accumulators are also mergeable partial aggregates: `pack` serializes a group
+table as {key: [n, sum, M2]} and `rollup` merges any set of them (Chan et al.'s
+parallel update), so national or regional figures are exact count-weighted
+results computed in O(states) without rescanning rows.
+
+KLL sketches do the same for quantiles (medians, p90), with the error bound
+documented on the class.
+
+`grouped` and `grouped_sketches` build the same tables from NumPy columns of
+integer group keys in one vectorized pass: np.bincount adds each group's values
+in row order, so counts and sums are bit-for-bit the add() loop's (M2 is
+computed two-pass, equal to Welford's to rounding), and each sketch receives
+its values in row order, so it ends in the same state.
+"""
+import math, random
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+
+class Acc:
+    __slots__ = ('n', 'total', 'mean', 'm2')
+
+    def __init__(self, n=0, total=0, mean=0.0, m2=0.0):
+        self.n = n
+        self.total = total
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, x):
+        self.n += 1
+        self.total += x
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+
+    def merge(self, other):
+        """Fold another Acc into this one."""
+        if not other.n:
+            return self
+        if not self.n:
+            self.n, self.total, self.mean, self.m2 = other.n, other.total, other.mean, other.m2
+            return self
+        n = self.n + other.n
+        d = other.mean - self.mean
+        self.m2 += other.m2 + d * d * self.n * other.n / n
+        self.mean += d * other.n / n
+        self.total += other.total
+        self.n = n
+        return self
+
+    def to_list(self):
+        return [self.n, self.total, self.m2]
+
+    @classmethod
+    def from_list(cls, v):
+        n, total, m2 = v
+        return cls(n, total, total / n if n else 0.0, m2)
+
+    def __bool__(self):
+        return self.n > 0
+
+    def __len__(self):
+        return self.n
+
+    def avg(self, ndigits=3):
+        return round(self.total / self.n, ndigits) if self.n else None
+
+    def var(self):
+        """Sample variance (n - 1 denominator)."""
+        return self.m2 / (self.n - 1) if self.n > 1 else None
+
+    def sd(self, ndigits=3):
+        v = self.var()
+        return round(math.sqrt(v), ndigits) if v is not None else None
+
+    def se(self, ndigits=4):
+        v = self.var()
+        return round(math.sqrt(v / self.n), ndigits) if v is not None else None
+
+
+def groups():
+    """key -> Acc, created on first use (drop-in for defaultdict(list))."""
+    return defaultdict(Acc)
+
+
+def _split(keys):
+    """Distinct keys in order of first appearance, and each row's index into them."""
+    codes, uniq = pd.factorize(keys)
+    return uniq, codes
+
+
+def grouped(keys, values, label=lambda k: k, integer=False):
+    """groups() table for rows with int `keys` and float `values`, keyed label(key)
+    in order of first appearance (as the add() loop inserts them). integer=True
+    keeps sums as ints, like adding int values."""
+    out = groups()
+    if not len(keys):
+        return out
+    uniq, g = _split(keys)
+    n = np.bincount(g)
+    total = np.bincount(g, weights=values)
+    mean = total / n
+    m2 = np.bincount(g, weights=(values - mean[g]) ** 2)
+    for k, cnt, s, mu, q in zip(uniq.tolist(), n.tolist(), total.tolist(), mean.tolist(), m2.tolist()):
+        out[label(k)] = Acc(cnt, int(s) if integer else s, mu, q)
+    return out
+
+
+def key_str(key):
+    return "|".join(map(str, key)) if isinstance(key, tuple) else str(key)
+
+
+def pack(table):
+    """{key: Acc} -> JSON-able {"race|year": [n, sum, M2]}, skipping empty groups."""
+    return {key_str(k): acc.to_list() for k, acc in table.items() if acc}
+
+
+def rollup(partials):
+    """Merge an iterable of {name: pack(...)} dicts into {name: {key: Acc}}."""
+    out = defaultdict(groups)
+    for part in partials:
+        for name, table in part.items():
+            dst = out[name]
+            for k, v in table.items():
+                dst[k].merge(Acc.from_list(v))
+    return out
+
+
+class KLL:
+    """KLL quantile sketch (Karnin, Lang & Liberty 2016), mergeable and serializable.
+
+    Level h holds items of weight 2**h; a full level is sorted and every other
+    item (random offset) is promoted to the level above. Capacity shrinks by c
+    per level below the top, so size stays O(k) regardless of n.
+
+    Error bound: the rank of a returned quantile is within eps*n of the requested
+    rank, eps = O(1/k) with high probability. For k=200 (the default) Apache
+    DataSketches calibrates this at ~1.65% normalized rank error at 99% confidence;
+    on 1M uniform values this implementation's worst p10..p90 error is under 1%,
+    single or merged from 50 pieces (check: `python aggregate.py`). Groups smaller than the bottom level's
+    capacity (~k) are exact. Coin flips come from a fixed seed, so a build is
+    reproducible whatever the merge order of equal inputs.
+    """
+
+    def __init__(self, k=200, c=2 / 3, seed=0):
+        self.k = k
+        self.c = c
+        self.n = 0
+        self.size = 0
+        self.levels = [[]]
+        self.rng = random.Random(seed)
+        self._resize()
+
+    def _resize(self):
+        top = len(self.levels) - 1
+        self._caps = [int(math.ceil(self.k * self.c ** (top - h))) + 1 for h in range(top + 1)]
+        self._max = sum(self._caps)
+
+    def add(self, x):
+        self.n += 1
+        self.size += 1
+        self.levels[0].append(x)
+        if self.size >= self._max:
+            self._compress()
+
+    def update(self, xs):
+        """add() each of xs in order; compacts at the same points, so the result is identical."""
+        i = 0
+        while i < len(xs):
+            m = max(1, min(len(xs) - i, self._max - self.size))
+            self.levels[0].extend(xs[i:i + m])
+            self.n += m
+            self.size += m
+            i += m
+            if self.size >= self._max:
+                self._compress()
+
+    def _compress(self):
+        h = 0
+        while self.size >= self._max and h < len(self.levels):
+            level = self.levels[h]
+            if len(level) >= self._caps[h]:
+                if h + 1 == len(self.levels):
+                    self.levels.append([])
+                    self._resize()
+                level.sort()
+                keep = level.pop() if len(level) % 2 else None
+                promoted = level[self.rng.random() < 0.5::2]
+                self.levels[h + 1].extend(promoted)
+                self.levels[h] = [keep] if keep is not None else []
+                self.size -= len(promoted)
+            h += 1
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        self._resize()
+        for h, level in enumerate(other.levels):
+            self.levels[h].extend(level)
+        self.n += other.n
+        self.size = sum(map(len, self.levels))
+        while self.size >= self._max:
+            self._compress()
+        return self
+
+    def _weighted(self):
+        items = sorted((x, 1 << h) for h, level in enumerate(self.levels) for x in level)
+        return items, sum(w for _, w in items)
+
+    def quantile(self, q, ndigits=3):
+        items, total = self._weighted()
+        if not items:
+            return None
+        target = q * total
+        cum = 0
+        for x, w in items:
+            cum += w
+            if cum >= target:
+                return round(x, ndigits)
+        return round(items[-1][0], ndigits)
+
+    def quantiles(self, qs=(0.5, 0.9), ndigits=3):
+        return {f"p{round(q * 100)}": self.quantile(q, ndigits) for q in qs}
+
+    def to_list(self):
+        return [self.k, self.n, self.levels]
+
+    @classmethod
+    def from_list(cls, v):
+        k, n, levels = v
+        sk = cls(k)
+        sk.n = n
+        sk.levels = [list(level) for level in levels]
+        sk.size = sum(map(len, sk.levels))
+        sk._resize()
+        return sk
+
+
+def sketches(k=200):
+    """key -> KLL, created on first use."""
+    return defaultdict(lambda: KLL(k))
+
+
+def grouped_sketches(keys, values, label=lambda k: k, k=200):
+    """sketches() table for rows with int `keys`, like grouped()."""
+    out = sketches(k)
+    if not len(keys):
+        return out
+    uniq, g = _split(keys)
+    order = np.argsort(g.astype(np.min_scalar_type(len(uniq))), kind='stable')  # radix sort
+    bounds = np.cumsum(np.bincount(g))[:-1]
+    for key, part in zip(uniq.tolist(), np.split(values[order], bounds)):
+        out[label(key)].update(part.tolist())
+    return out
+
+
+def pack_sketches(table):
+    return {key_str(k): sk.to_list() for k, sk in table.items() if sk.n}
+
+
+def rollup_sketches(parts):
+    """Merge an iterable of {name: pack_sketches(...)} into {name: {key: KLL}}."""
+    out = defaultdict(sketches)
+    for part in parts:
+        for name, table in part.items():
+            dst = out[name]
+            for k, v in table.items():
+                dst[k].merge(KLL.from_list(v))
+    return out
+
+
+if __name__ == "__main__":
+    # Empirical KLL rank error, single sketch and merged from 50 pieces
+    rng = random.Random(1)
+    xs = [rng.random() for _ in range(1000000)]
+    one = KLL()
+    for x in xs:
+        one.add(x)
+    parts = []
+    for i in range(50):
+        sk = KLL()
+        for x in xs[i::50]:
+            sk.add(x)
+        parts.append(sk)
+    merged = parts[0]
+    for sk in parts[1:]:
+        merged.merge(sk)
+    for label, sk in (("single", one), ("merged", merged)):
+        err = max(abs(sk.quantile(q, 9) - q) for q in [i / 100 for i in range(10, 91)])
+        size = sum(map(len, sk.levels))
+        print(f"{label}: n={sk.n:,} stored={size} max rank error p10..p90 = {err:.4f}")
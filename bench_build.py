@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Benchmark build_precomputed.py serial vs. --jobs N, and check outputs are byte-identical.
+
+Run from the directory build_precomputed.py normally runs in (with data/ and web/).
+"""
+import argparse, os, shutil, subprocess, sys, tempfile, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+OUTPUTS = [os.path.join("data", "precomputed.json"), os.path.join("web", "src", "data", "precomputed.ts")]
+
+
+def run_build(jobs, keep):
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(HERE, "build_precomputed.py"),
+                    "--no-cache", "--jobs", str(jobs)], check=True, stdout=subprocess.DEVNULL)
+    secs = time.perf_counter() - t0
+    for path in OUTPUTS:
+        shutil.copy(path, os.path.join(keep, f"{jobs}_{os.path.basename(path)}"))
+    return secs
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--jobs", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1])
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as keep:
+        serial = run_build(1, keep)
+        print(f"  jobs= 1: {serial:7.2f}s")
+        for jobs in sorted(set(args.jobs) - {1}):
+            secs = run_build(jobs, keep)
+            same = all(
+                open(os.path.join(keep, f"1_{os.path.basename(p)}"), "rb").read()
+                == open(os.path.join(keep, f"{jobs}_{os.path.basename(p)}"), "rb").read()
+                for p in OUTPUTS)
+            print(f"  jobs={jobs:2d}: {secs:7.2f}s  speedup {serial / secs:4.1f}x  "
+                  f"byte-identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Benchmark raw-CSV filtering: row-by-row DictReader vs. columnar pyarrow batches.
+
+Usage:
+  python bench_filter.py data/CA_2022_raw.csv ...   # real downloads
+  python bench_filter.py --rows 1000000             # synthetic raw file (synth.py)
+"""
+import argparse, os, tempfile, time
+
+import synth
+from slim import SlimSample
+
+
+def run(engine, paths, out):
+    sample = SlimSample(out, cap=10 ** 12, engine=engine)
+    t0 = time.perf_counter()
+    for p in paths:
+        sample.add_raw(p)
+    sample.finish()
+    return time.perf_counter() - t0, sample.total
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("paths", nargs="*")
+    ap.add_argument("--rows", type=int, default=500000, help="synthetic rows if no paths given")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = args.paths
+        if not paths:
+            synth.generate(tmp, args.rows, ["CA"], [2022], quiet=True)
+            paths = [os.path.join(tmp, "CA_2022_raw.csv")]
+        raw_rows = sum(sum(1 for _ in open(p)) - 1 for p in paths)
+        mb = sum(os.path.getsize(p) for p in paths) / 1e6
+        print(f"{len(paths)} file(s), {raw_rows:,} raw rows, {mb:,.1f} MB")
+
+        outputs = {}
+        for engine in ("rows", "arrow"):
+            out = os.path.join(tmp, f"{engine}.csv")
+            secs, kept = run(engine, paths, out)
+            outputs[engine] = out
+            print(f"  {engine:5s}: {secs:7.2f}s  {raw_rows / secs:12,.0f} rows/s  "
+                  f"{mb / secs:7.1f} MB/s  kept {kept:,}")
+
+        with open(outputs["rows"], "rb") as a, open(outputs["arrow"], "rb") as b:
+            same = a.read() == b.read()
+        print(f"  outputs identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
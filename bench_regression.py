@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark the regression design + solve: dense (prep + statsmodels) vs. sparse CSR + normal equations.
+
+Each (path, rows) case runs in its own process on the same seeded synthetic
+rows (synth.frames), cleaned, timing design and solve and reporting the peak
+memory traced while they run (tracemalloc sees numpy buffers) plus the
+process's max RSS.
+A case that dies (e.g. out of memory) is reported as failed.
+
+Usage:
+  python bench_regression.py                          # 1M, 5M, 15M rows
+  python bench_regression.py --rows 1000000 --paths sparse
+"""
+import argparse, json, resource, subprocess, sys, time, tracemalloc
+
+import pandas as pd
+
+import synth
+
+
+def one(path, n):
+    import regression, statsmodels.api as sm
+    from ols import SuffStats
+
+    df = pd.concat([regression.clean(rows) for rows in synth.frames(n, columns=regression.REG_COLS)],
+                   ignore_index=True)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    if path == 'dense':
+        X, y, race_cols = regression.design(df)
+        X = sm.add_constant(X)
+        t1 = time.perf_counter()
+        model = sm.OLS(y, X).fit()
+    else:
+        X, y, names, race_cols = regression.design_sparse(df)
+        t1 = time.perf_counter()
+        ss = SuffStats()
+        ss.add(X, y, names)
+        model = ss.solve(ss.columns())
+    t2 = time.perf_counter()
+    peak = tracemalloc.get_traced_memory()[1]
+    print(json.dumps({
+        'path': path, 'rows': n, 'nobs': int(model.nobs), 'columns': X.shape[1],
+        'design_s': round(t1 - t0, 2), 'solve_s': round(t2 - t1, 2),
+        'peak_mb': round(peak / 2 ** 20), 'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024),
+        'coef': {c: float(model.params[c]) for c in race_cols},
+    }))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, nargs="+", default=[1000000, 5000000, 15000000])
+    ap.add_argument("--paths", nargs="+", choices=["dense", "sparse"], default=["dense", "sparse"])
+    ap.add_argument("--one", nargs=2, metavar=("PATH", "ROWS"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.one:
+        return one(args.one[0], int(args.one[1]))
+
+    for n in args.rows:
+        results = {}
+        for path in args.paths:
+            proc = subprocess.run([sys.executable, __file__, "--one", path, str(n)],
+                                  capture_output=True, text=True)
+            if proc.returncode:
+                print(f"  {n:>11,} {path:6s}: failed (exit {proc.returncode}{', out of memory?' if proc.returncode < 0 else ''})")
+                continue
+            r = results[path] = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(f"  {n:>11,} {path:6s}: design {r['design_s']:7.2f}s  solve {r['solve_s']:7.2f}s  "
+                  f"peak {r['peak_mb']:6,} MB  max RSS {r['max_rss_mb']:6,} MB  ({r['columns']} columns)")
+        if len(results) == 2:
+            diff = max(abs(results['dense']['coef'][c] - results['sparse']['coef'][c])
+                       for c in results['dense']['coef'])
+            print(f"  {'':>11} max race coefficient difference: {diff:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Compare the site's data payload: one precomputed.ts with every state vs. the
+national module plus per-state shards (build_precomputed.write_site).
+
+Both are generated from data/precomputed.json into a temp directory. For each
+it reports what first paint ships (raw and gzipped module bytes) and the
+main-thread cost of evaluating that module in Node (V8, the same engine as
+Chrome), the part of time-to-interactive the data controls. Shards are only
+fetched when a state is selected, so their sizes are listed separately.
+
+Usage:
+  python bench_site.py
+  python bench_site.py --json data/precomputed.json --reps 200
+"""
+import argparse, gzip, json, os, shutil, subprocess, tempfile
+
+import build_precomputed
+
+# Evaluates the module body (TypeScript's `as const` / export stripped) `reps` times,
+# each with a unique trailing comment so V8's compile cache can't serve a repeat.
+# With `node -e`, process.argv[1:] are the extra arguments.
+EVAL_JS = r"""
+const fs = require("fs");
+const src = fs.readFileSync(process.argv[1], "utf8")
+  .replace(/ as const;/g, ";").replace(/export default data;/, "return data;");
+const reps = +process.argv[2], times = [];
+for (let i = 0; i < reps; i++) {
+  const t = process.hrtime.bigint();
+  new Function(src + `\n// ${i}`)();
+  times.push(Number(process.hrtime.bigint() - t) / 1e6);
+}
+times.sort((a, b) => a - b);
+console.log(JSON.stringify({ median_ms: times[reps >> 1], p90_ms: times[Math.floor(reps * 0.9)] }));
+"""
+
+
+def single_module(precomputed):
+    """The module as build_precomputed wrote it before the split."""
+    return ("const data = " + json.dumps(precomputed) + " as const;\n\nexport default data;\n").encode()
+
+
+def evaluate(path, reps):
+    if not shutil.which("node"):
+        return None
+    out = subprocess.run(["node", "-e", EVAL_JS, path, str(reps)], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def describe(label, module, path, reps):
+    cost = evaluate(path, reps)
+    line = (f"  {label:8s} module {len(module) / 1024:6.1f}KB raw, "
+            f"{len(gzip.compress(module, 9)) / 1024:5.1f}KB gzip")
+    if cost:
+        line += f", eval {cost['median_ms']:.2f}ms median / {cost['p90_ms']:.2f}ms p90"
+    print(line)
+    return len(module)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--json", default=os.path.join(build_precomputed.DATA_DIR, "precomputed.json"))
+    ap.add_argument("--reps", type=int, default=100, help="evaluations per module")
+    args = ap.parse_args()
+    with open(args.json) as f:
+        precomputed = json.load(f)
+
+    with tempfile.TemporaryDirectory() as web:
+        os.makedirs(os.path.join(web, os.path.dirname(build_precomputed.SITE_MODULE)))
+        before = single_module(precomputed)
+        before_path = os.path.join(web, "single.ts")
+        with open(before_path, "wb") as f:
+            f.write(before)
+        sizes = build_precomputed.write_site(precomputed, web)
+        after_path = os.path.join(web, build_precomputed.SITE_MODULE)
+        with open(after_path, "rb") as f:
+            after = f.read()
+
+        print(f"First paint ({len(precomputed['by_state'])} states):")
+        b = describe("single", before, before_path, args.reps)
+        a = describe("split", after, after_path, args.reps)
+        print(f"  split module is {a / b:.0%} of the single module")
+
+        shard_dir = os.path.join(web, build_precomputed.SHARD_DIR)
+        shards = sorted(sizes["shards"].values())
+        zipped = sorted(len(gzip.compress(open(os.path.join(shard_dir, f), "rb").read(), 9))
+                        for f in os.listdir(shard_dir))
+        if shards:
+            print(f"Per state selected: 1 shard, {shards[len(shards) // 2] / 1024:.1f}KB median "
+                  f"({zipped[len(zipped) // 2] / 1024:.1f}KB gzip), {shards[-1] / 1024:.1f}KB max; "
+                  f"all {len(shards)} together {sum(shards) / 1024:.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Benchmark loading slim CSVs vs. the Parquet store (run `python store.py convert` first)."""
+import os, time
+
+import pandas as pd
+
+import store
+
+NUMERIC = ['rate_spread', 'income', 'loan_amount', 'loan_to_value_ratio']
+COLUMNS = ['activity_year', 'state_code', 'derived_race', 'derived_ethnicity', 'loan_type'] + NUMERIC
+
+
+def load_csv(states):
+    chunks = []
+    for s in states:
+        df = pd.read_csv(store.slim_csv_path(s), dtype=str)
+        for col in NUMERIC:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        chunks.append(df)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def timed(label, fn, baseline=None):
+    t0 = time.perf_counter()
+    out = fn()
+    secs = time.perf_counter() - t0
+    speedup = f"  {baseline / secs:5.1f}x" if baseline else ""
+    print(f"  {label:34s} {secs:7.2f}s{speedup}")
+    return secs, out
+
+
+def main():
+    if not store.exists():
+        raise SystemExit("no store: run `python store.py convert` first")
+    states = store.states()
+    csv_mb = sum(os.path.getsize(store.slim_csv_path(s)) for s in states) / 1e6
+    pq_mb = store.du(store.STORE_DIR) / 1e6
+    print(f"{len(states)} states: CSV {csv_mb:,.1f} MB, Parquet {pq_mb:,.1f} MB "
+          f"({csv_mb / pq_mb:.1f}x smaller)")
+
+    base, df = timed("CSV, all columns + to_numeric", lambda: load_csv(states))
+    print(f"    {len(df):,} rows")
+    timed("store, all columns", lambda: store.read_pandas(), base)
+    timed("store, 9 regression columns", lambda: store.read_pandas(columns=COLUMNS), base)
+    timed("store, 9 columns, one year", lambda: store.read_pandas(columns=COLUMNS, years=[2023]), base)
+    timed("store, spread > 1 (pushdown)",
+          lambda: store.read_pandas(columns=COLUMNS, where=store.ds.field('rate_spread') > 1), base)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark ingest's write-then-parse download path against --stream.
+
+Serves synthetic raw extracts (synth.py) from standin.py and runs both paths on them:
+  file    fetch_many saves <ST>_<YEAR>_raw.csv, SlimSample parses it, os.remove
+  stream  stream_many hands each response body straight to SlimSample
+Both must keep the same rows. Reports wall clock, the bytes the process sent to
+storage (/proc/self/io write_bytes, where available) and the bytes fetched.
+The raw files go under --dir (data/ by default, the disk ingest.py uses).
+
+Usage:
+  python bench_stream.py --files 4 --rows 500000
+  python bench_stream.py --gzip --drop 0.3 --engine rows
+"""
+import argparse, os, shutil, tempfile, time
+
+import fetch, ingest, standin, synth
+from slim import SlimSample
+
+STATES = ["VT", "WY", "RI", "DC", "DE", "ND", "SD", "MT", "AK", "ME", "NH", "HI"]
+
+
+def io_counters():
+    """/proc/self/io as a dict of ints ({} off Linux)."""
+    try:
+        with open("/proc/self/io") as f:
+            return {k: int(v) for k, v in (line.split(":") for line in f)}
+    except OSError:
+        return {}
+
+
+def run(mode, jobs, args, tmp):
+    dl = fetch.Downloader(concurrency=args.concurrency, rate=0, retries=12, backoff=0.01,
+                          journal=os.path.join(tmp, "_downloads.jsonl"))
+    texts, raw = {}, 0
+    before = io_counters()
+    t0 = time.perf_counter()
+    if mode == "stream":
+        for key, got in dl.stream_many([(key, url, ingest.sampler(*key, args.cap, args.engine))
+                                        for key, url, _ in jobs], lookahead=0):
+            if not got:
+                raise SystemExit(f"{key}: stream failed")
+            sample, info = got
+            texts[key] = sample.text()
+            raw += info["size"]
+    else:
+        for key, path in dl.fetch_many(jobs):
+            if not path:
+                raise SystemExit(f"{key}: download failed")
+            sample = SlimSample(None, cap=args.cap, seed=ingest.partition_seed(*key),
+                                engine=args.engine)
+            sample.add_raw(path)
+            raw += os.path.getsize(path)
+            os.remove(path)
+            texts[key] = sample.text()
+    secs = time.perf_counter() - t0
+    after = io_counters()
+    written = after["write_bytes"] - before["write_bytes"] if after else None
+    return {"secs": secs, "raw": raw, "wire": dl.stats.bytes, "written": written,
+            "resumed": dl.stats.resumed, "texts": texts}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--files", type=int, default=4, help="state-year extracts to serve")
+    ap.add_argument("--rows", type=int, default=300000, help="raw rows per extract (on average)")
+    ap.add_argument("--cap", type=int, default=ingest.PARTITION_CAP)
+    ap.add_argument("--engine", choices=["rows", "arrow"], default=ingest.DEFAULT_ENGINE)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--gzip", action="store_true", help="stand-in gzips bodies (stream path asks for it)")
+    ap.add_argument("--drop", type=float, default=0.0, help="stand-in cuts bodies off with this probability")
+    ap.add_argument("--repeat", type=int, default=2, help="alternating runs per path; best time kept")
+    ap.add_argument("--dir", default="data" if os.path.isdir("data") else None,
+                    help="where the file path writes raw files")
+    args = ap.parse_args()
+
+    src = tempfile.mkdtemp()
+    tmp = tempfile.mkdtemp(dir=args.dir)
+    try:
+        states = STATES[:args.files]
+        meta = synth.generate(src, args.rows * len(states), states, [2022], quiet=True)
+        mb = sum(f["bytes"] for f in meta["files"].values()) / 1e6
+        server = standin.serve(src, 0, drop=args.drop, gzip=args.gzip)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        jobs = [((st, 2022), fetch.hmda_url(st, 2022, base), os.path.join(tmp, f"{st}_2022_raw.csv"))
+                for st in states]
+        print(f"{len(states)} extracts x {args.rows:,} rows ({mb:,.1f} MB raw), engine {args.engine}, "
+              f"gzip {args.gzip}, drop {args.drop}, raw files in {os.path.abspath(tmp)}")
+
+        if args.gzip:
+            run("stream", jobs, args, tmp)  # untimed: the stand-in compresses each file once
+        best = {}
+        for _ in range(args.repeat):
+            for mode in ("file", "stream"):
+                r = run(mode, jobs, args, tmp)
+                if mode not in best or r["secs"] < best[mode]["secs"]:
+                    best[mode] = r
+        server.shutdown()
+
+        for mode in ("file", "stream"):
+            r = best[mode]
+            written = f"{r['written'] / 1e6:9,.1f} MB" if r["written"] is not None else "      n/a"
+            print(f"  {mode:6s} {r['secs']:7.2f}s  {r['raw'] / 1e6 / r['secs']:7.1f} MB/s raw  "
+                  f"disk writes {written}  fetched {r['wire'] / 1e6:8,.1f} MB  resumed {r['resumed']}")
+        f, s = best["file"], best["stream"]
+        same = f["texts"] == s["texts"]
+        print(f"  stream vs file: {f['secs'] - s['secs']:+.2f}s saved ({f['secs'] / s['secs']:.2f}x), "
+              f"{f['raw'] / 1e6:,.1f} MB not written and {f['raw'] / 1e6:,.1f} MB not read back, "
+              f"{(f['wire'] - s['wire']) / 1e6:,.1f} MB less fetched; same rows kept: {same}")
+        if not same:
+            raise SystemExit(1)
+    finally:
+        shutil.rmtree(src, ignore_errors=True)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark: synthetic HMDA data (synth.py) through every stage,
+timed and memory-profiled, with the results written as JSON.
+
+  generate                synth.py raw extracts (kept in --work; reused when unchanged)
+  filter/ENGINE           SlimSample.add_raw over each state's years -> <ST>_slim_merged.csv,
+                          capped at --cap as the downloaders do (arrow, rows)
+  process_state/ENGINE    build_precomputed.process_state per state (numpy, rows)
+  load_data               regression.load_data: stratified sample of the slim CSVs
+  prep                    regression.prep on that frame (clean + dense design)
+  fit                     statsmodels OLS on prep's design
+
+Each stage runs in a fresh process with --work as its directory, so its peak
+RSS is its own and the scripts read the synthetic data/ there. A result has
+wall and CPU seconds, rows in and rows/s, RSS before the stage and the process
+peak; --trace-memory reruns each stage under tracemalloc for the peak it
+traces (numpy buffers included; the rerun's time is not used). Engines of the
+same stage must produce the same output, which is checked.
+
+Results go to bench_results/<UTC time>.json with the git commit, library
+versions and machine, so runs can be compared: --compare OLD.json prints the
+change per stage.
+
+Usage:
+  python bench_suite.py --rows 1000000
+  python bench_suite.py --rows 50000000 --stages filter process_state --cap 0
+  python bench_suite.py --rows 1000000 --compare bench_results/2026-10-18T120000.json
+"""
+import argparse, glob, hashlib, json, math, os, platform, resource, subprocess, sys, time, tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STAGES = ["generate", "filter", "process_state", "load_data", "prep", "fit"]
+ENGINES = {"filter": ["arrow", "rows"], "process_state": ["numpy", "rows"]}
+DEFAULT_STATES = ["CA", "TX", "NY", "GA", "MN", "OR", "NM", "VT"]
+RESULTS_DIR = os.path.join(HERE, "bench_results")
+
+
+def rss_mb():
+    """Current RSS (VmRSS), or the peak so far where /proc isn't available."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def slim_paths(states):
+    return [os.path.join("data", f"{st}_slim_merged.csv") for st in states]
+
+
+def digest(paths):
+    h = hashlib.sha256()
+    for p in paths:
+        with open(p, "rb") as f:
+            for buf in iter(lambda: f.read(1 << 20), b""):
+                h.update(buf)
+    return h.hexdigest()[:16]
+
+
+def close(a, b, rel=1e-6):
+    """a == b, up to float rounding: engines sum in different orders, and differ
+    in whether a whole number comes out as int or float."""
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(close(a[k], b[k], rel) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(close(x, y, rel) for x, y in zip(a, b))
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return math.isclose(a, b, rel_tol=rel, abs_tol=rel)
+    return a == b
+
+
+def save_output(stage, engine, obj):
+    """What this engine produced, for main() to compare across engines."""
+    os.makedirs("outputs", exist_ok=True)
+    with open(os.path.join("outputs", f"{stage}-{engine}.json"), "w") as f:
+        json.dump(obj, f, default=str)
+
+
+def count_rows(paths):
+    return sum(sum(1 for _ in open(p)) - 1 for p in paths if os.path.exists(p))
+
+
+# --- stages: setup() runs untimed, then run(setup's result) -> (rows in, detail) ---
+
+def stage_generate(cfg, engine):
+    import synth
+
+    def run(_):
+        meta = synth.generate("raw", cfg["rows"], cfg["states"], cfg["years"], cfg["seed"], quiet=True)
+        size = sum(f["bytes"] for f in meta["files"].values())
+        detail = {"files": len(meta["files"]), "mb": round(size / 1e6, 1),
+                  "generated_in_s": meta["seconds"], "reused": bool(meta.get("reused"))}
+        return (0 if detail["reused"] else cfg["rows"]), detail
+    return None, run
+
+
+def stage_filter(cfg, engine):
+    from slim import SlimSample
+
+    def run(_):
+        raw = kept = 0
+        for st in cfg["states"]:
+            sample = SlimSample(os.path.join("data", f"{st}_slim_merged.csv"),
+                                cap=cfg["cap"] or 10 ** 12, seed=42, engine=engine)
+            for path in sorted(glob.glob(os.path.join("raw", f"{st}_*_raw.csv"))):
+                sample.add_raw(path)
+            kept += sample.total
+            sample.finish()
+        with open(os.path.join("raw", "synth.json")) as f:
+            raw = sum(v["rows"] for v in json.load(f)["files"].values())
+        save_output("filter", engine, digest(slim_paths(cfg["states"])))
+        return raw, {"kept": kept, "written": count_rows(slim_paths(cfg["states"]))}
+    return None, run
+
+
+def stage_process_state(cfg, engine):
+    import build_precomputed
+
+    def run(_):
+        results = {st: build_precomputed.process_state(st, engine) for st in cfg["states"]}
+        save_output("process_state", engine, results)
+        return count_rows(slim_paths(cfg["states"])), {}
+    return None, run
+
+
+def regression_module():
+    from pathlib import Path
+    import regression
+    regression.DATA_DIR = Path("data").resolve()  # the synthetic slims, not the repo's
+    return regression
+
+
+def stage_load_data(cfg, engine):
+    regression = regression_module()
+
+    def run(_):
+        df = regression.load_data()
+        return count_rows(slim_paths(cfg["states"])), {"loaded": len(df)}
+    return None, run
+
+
+def stage_prep(cfg, engine):
+    regression = regression_module()
+
+    def run(df):
+        X, y, race_cols = regression.prep(df)
+        return len(df), {"design": list(X.shape)}
+    return regression.load_data(), run
+
+
+def stage_fit(cfg, engine):
+    regression = regression_module()
+    import statsmodels.api as sm
+
+    def run(prepared):
+        X, y, race_cols = prepared
+        model = sm.OLS(y, X).fit()
+        return len(X), {"columns": X.shape[1],
+                        "black": round(float(model.params.get('race_Black or African American', 0)), 4)}
+    return regression.prep(regression.load_data()), run
+
+
+def one(cfg, stage, engine, trace):
+    """Run one stage in this process and print its result as a JSON line."""
+    os.chdir(cfg["work"])
+    os.makedirs("data", exist_ok=True)
+    setup, run = globals()[f"stage_{stage}"](cfg, engine)
+    before = rss_mb()
+    if trace:
+        tracemalloc.start()
+    t0, c0 = time.perf_counter(), time.process_time()
+    rows, detail = run(setup)
+    secs, cpu = time.perf_counter() - t0, time.process_time() - c0
+    result = {"stage": stage, "engine": engine, "rows": rows, "seconds": round(secs, 3),
+              "cpu_seconds": round(cpu, 3), "rows_per_s": round(rows / secs) if secs else None,
+              "rss_before_mb": round(before, 1),
+              "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+              "detail": detail}
+    if trace:
+        result["traced_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+    print(json.dumps(result))
+
+
+def child(cfg, stage, engine, trace=False):
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--one", json.dumps(cfg),
+                           stage, engine or "", "1" if trace else ""],
+                          capture_output=True, text=True)
+    if proc.returncode:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["(no output)"]
+        return {"stage": stage, "engine": engine, "failed": proc.returncode, "error": tail[0]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def environment():
+    import numpy, pandas
+    versions = {"python": platform.python_version(), "numpy": numpy.__version__, "pandas": pandas.__version__}
+    for mod in ("pyarrow", "statsmodels", "scipy"):
+        try:
+            versions[mod] = __import__(mod).__version__
+        except ImportError:
+            versions[mod] = None
+    git = lambda *a: subprocess.run(["git", "-C", HERE, *a], capture_output=True, text=True).stdout.strip()
+    mem = None
+    try:
+        with open("/proc/meminfo") as f:
+            mem = round(int(f.readline().split()[1]) / 2 ** 20, 1)
+    except OSError:
+        pass
+    return {"commit": git("rev-parse", "HEAD") or None, "dirty": bool(git("status", "--porcelain", "--", "*.py")),
+            "machine": platform.machine(), "system": platform.system(), "cpus": os.cpu_count(),
+            "memory_gb": mem, "versions": versions}
+
+
+def label(r):
+    return r["stage"] + (f"/{r['engine']}" if r.get("engine") else "")
+
+
+def describe(r):
+    if "failed" in r:
+        return f"  {label(r):22s} FAILED (exit {r['failed']}): {r['error']}"
+    if r["detail"].get("reused"):
+        return f"  {label(r):22s} reused {r['detail']['mb']:,.1f} MB (generated in {r['detail']['generated_in_s']:.1f}s)"
+    traced = f"  traced {r['traced_peak_mb']:8,.1f} MB" if "traced_peak_mb" in r else ""
+    return (f"  {label(r):22s} {r['seconds']:8.2f}s  cpu {r['cpu_seconds']:8.2f}s  "
+            f"{r['rows']:>12,} rows  {r['rows_per_s'] or 0:>11,}/s  "
+            f"rss {r['rss_before_mb']:7,.0f} -> {r['peak_rss_mb']:7,.0f} MB{traced}")
+
+
+def compare(results, old_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    before = {label(r): r for r in old["results"] if "failed" not in r}
+    print(f"\nvs {old_path} ({old['environment'].get('commit', '?')[:10]}, {old['params']['rows']:,} rows):")
+    for r in results:
+        o = before.get(label(r))
+        if "failed" in r or not o or r["detail"].get("reused") or o["detail"].get("reused"):
+            continue
+        print(f"  {label(r):22s} time {r['seconds'] / o['seconds'] if o['seconds'] else 0:5.2f}x  "
+              f"peak rss {r['peak_rss_mb'] / o['peak_rss_mb']:5.2f}x")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=1000000, help="synthetic raw rows (1M-50M)")
+    ap.add_argument("--states", nargs="+", default=DEFAULT_STATES)
+    ap.add_argument("--years", nargs="+", type=int, default=None, help="default: 2018-2023")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--cap", type=int, default=500000,
+                    help="slim rows kept per state, as download_extra_years.py (0: keep all)")
+    ap.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    ap.add_argument("--engines", nargs="+", default=None, help="only these engines (default: all)")
+    ap.add_argument("--trace-memory", action="store_true", help="also run each stage under tracemalloc")
+    ap.add_argument("--work", default=os.path.join(HERE, "data", "bench"),
+                    help="raw and slim files (big: ~280 MB per 1M rows)")
+    ap.add_argument("--json", default=None, help="results file (default bench_results/<time>.json)")
+    ap.add_argument("--compare", metavar="OLD.json", help="print the change against an earlier run")
+    ap.add_argument("--one", nargs=4, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.one:
+        cfg, stage, engine, trace = args.one
+        return one(json.loads(cfg), stage, engine or None, bool(trace))
+
+    cfg = {"work": os.path.abspath(args.work), "rows": args.rows, "states": sorted(args.states),
+           "years": args.years, "seed": args.seed, "cap": args.cap}
+    os.makedirs(cfg["work"], exist_ok=True)
+    stages = [s for s in STAGES if s in args.stages or s == "generate"]
+    # Later stages read the slim files; make them if this run won't
+    slims = [os.path.join(cfg["work"], p) for p in slim_paths(cfg["states"])]
+    if "filter" not in stages and any(s in stages for s in STAGES[2:]) and \
+            not all(os.path.exists(p) for p in slims):
+        stages.insert(1, "filter")
+    print(f"{args.rows:,} rows, {len(cfg['states'])} states, cap {args.cap or 'none'}, work {cfg['work']}")
+
+    results = []
+    for stage in stages:
+        engines = [e for e in ENGINES.get(stage, [None]) if not args.engines or e is None or e in args.engines]
+        outputs = []
+        for engine in engines or ENGINES[stage][:1]:
+            r = child(cfg, stage, engine)
+            if args.trace_memory and "failed" not in r:
+                traced = child(cfg, stage, engine, trace=True)
+                r["traced_peak_mb"] = traced.get("traced_peak_mb")
+            print(describe(r))
+            results.append(r)
+            path = os.path.join(cfg["work"], "outputs", f"{stage}-{engine}.json")
+            if engine and "failed" not in r and os.path.exists(path):
+                with open(path) as f:
+                    outputs.append((engine, json.load(f)))
+        if len(outputs) > 1:
+            same = all(close(outputs[0][1], out) for _, out in outputs[1:])
+            print(f"  {stage}: {' and '.join(e for e, _ in outputs)} outputs "
+                  f"{'agree' if same else 'DISAGREE'}")
+            for r in results:
+                if r["stage"] == stage and "failed" not in r:
+                    r["outputs_agree"] = same
+
+    record = {"started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "environment": environment(),
+              "params": {k: v for k, v in cfg.items() if k != "work"}, "results": results}
+    path = args.json or os.path.join(RESULTS_DIR, time.strftime("%Y-%m-%dT%H%M%S", time.gmtime()) + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(record, f, indent=1)
+    print(f"Results: {path}")
+    if args.compare:
+        compare(results, args.compare)
+    if any("failed" in r for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,21 @@
 #!/usr/bin/env python3
-"""Build precomputed.ts from all HMDA slim CSVs."""
-import os, json, csv, gc
+"""Build the site data (precomputed.ts + per-state JSON shards) from the Parquet store or slim CSVs."""
+import argparse, os, json, csv, gc, hashlib, math, multiprocessing, shutil, tempfile
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+import instrument
+from aggregate import (groups, grouped, grouped_sketches, pack, rollup, sketches,
+                       pack_sketches, rollup_sketches)
+
+try:
+    import store
+except ImportError:  # no pyarrow: slim CSVs only
+    store = None
 
 DATA_DIR = "data"
 
@@ -28,119 +42,361 @@ RACE_MAP = {
 
 LT_NAMES = {'1':'Conventional','2':'FHA','3':'VA','4':'USDA'}
 
-def process_state(state_code):
+# numpy engine codes (0 = none): race uint8, loan type uint8, year uint16
+RACES = ['white', 'black', 'hispanic', 'asian']
+LT_CODES = list(LT_NAMES)
+BRACKETS = ['<50K', '50-100K', '100-150K', '150K+']
+
+# Census regions, for exact roll-ups from the per-state partial aggregates
+REGIONS = {
+    'Northeast': ['CT','ME','MA','NH','RI','VT','NJ','NY','PA'],
+    'Midwest': ['IL','IN','MI','OH','WI','IA','KS','MN','MO','NE','ND','SD'],
+    'South': ['DE','DC','FL','GA','MD','NC','SC','VA','WV','AL','KY','MS','TN','AR','LA','OK','TX'],
+    'West': ['AZ','CO','ID','MT','NV','NM','UT','WY','AK','CA','HI','OR','WA'],
+}
+
+# Written next to precomputed.json; not shipped to the site
+PARTIALS_PATH = os.path.join(DATA_DIR, "state_partials.json")
+SKETCHES_PATH = os.path.join(DATA_DIR, "state_sketches.json")
+# Written by `python regression.py --grouped`; merged in when present
+REGRESSION_BY_GROUP = os.path.join(DATA_DIR, "regression_by_group.json")
+
+# Site data: a national module in the bundle, plus one JSON shard per state under
+# public/, named by content hash so it can be cached forever and fetched on demand
+SITE_MODULE = os.path.join("src", "data", "precomputed.ts")
+SHARD_DIR = os.path.join("public", "data", "states")
+SHARD_URL = "/data/states"
+# Per-state fields kept in the national module (map, rankings, pickers)
+SUMMARY_FIELDS = ['total_loans', 'rate_gap_bw', 'rate_gap_hw']
+
+ROW_COLS = ['derived_race', 'derived_ethnicity', 'interest_rate', 'rate_spread',
+            'income', 'loan_amount', 'loan_type', 'activity_year']
+
+USE_STORE = store is not None and store.exists()
+
+# Per-state aggregation: 'numpy' (typed columns, grouped bincount reductions) or
+# 'rows' (a dict per row); both write the same JSON
+DEFAULT_ENGINE = 'numpy'
+
+# Per-state stats keyed by the state's manifest fingerprint, so a rebuild only
+# reprocesses states with changed partitions. Keyed on the code too: this file,
+# aggregate.py, and store.py / slim.py, which type, read and filter the rows.
+STATS_CACHE = os.path.join(DATA_DIR, "state_stats_cache.json")
+_h = hashlib.sha256()
+for _src in (__file__, *(os.path.join(os.path.dirname(os.path.abspath(__file__)), f)
+                         for f in ("aggregate.py", "store.py", "slim.py"))):
+    with open(_src, 'rb') as _f:
+        _h.update(_f.read())
+CODE_VERSION = _h.hexdigest()[:16]
+
+# The one parse of each numeric field, shared by both engines and both sources
+# (typed store values or slim-CSV strings); each raises on a missing or invalid value
+def number(v):
+    """A finite float: None, 'NA', 'Exempt', NaN and inf are all invalid."""
+    x = float(v)
+    if not math.isfinite(x):
+        raise ValueError(f"not a finite number: {v!r}")
+    return x
+
+def whole(v):
+    """A whole number as int: 75, '75' and 75.0 parse the same; 75.5 is invalid."""
+    x = number(v)
+    if x != int(x):
+        raise ValueError(f"not a whole number: {v!r}")
+    return int(x)
+
+def year_of(v):
+    """An activity year: a whole number above 0."""
+    y = whole(v)
+    if y <= 0:
+        raise ValueError(f"not a year: {v!r}")
+    return y
+
+def iter_rows(state_code):
+    """Yield row dicts for a state: typed values from the store, strings from a slim CSV.
+
+    Missing numerics are None in the store and 'NA'/'Exempt' in the CSVs; both fail
+    number() / whole() / year_of() the same way.
+    """
+    if USE_STORE:
+        for batch in store.iter_batches(columns=ROW_COLS, states=[state_code]):
+            yield from batch.to_pylist()
+        return
     # Prefer merged file
     slim_path = os.path.join(DATA_DIR, f"{state_code}_slim_merged.csv")
     if not os.path.exists(slim_path):
         slim_path = os.path.join(DATA_DIR, f"{state_code}_slim.csv")
     if not os.path.exists(slim_path):
-        return None
-    
+        return
+    with open(slim_path) as f:
+        yield from csv.DictReader(f)
+
+def state_codes():
+    if USE_STORE:
+        return store.states()
+    codes = []
+    for f in sorted(os.listdir(DATA_DIR)):
+        # Prefer merged files (6 years), fall back to original slims (2 years)
+        if f.endswith('_slim_merged.csv'):
+            codes.append(f.replace('_slim_merged.csv', ''))
+        elif f.endswith('_slim.csv') and not os.path.exists(os.path.join(DATA_DIR, f.replace('_slim.csv', '_slim_merged.csv'))):
+            codes.append(f.replace('_slim.csv', ''))
+    return sorted(codes)
+
+@instrument.traced("build.tally_rows", rows=lambda r: r[0], fields=("state_code",))
+def tally_rows(state_code):
+    """Row engine: one dict per row through Acc/KLL add()."""
     # Collect by race
-    rates_by_race = defaultdict(list)
-    spreads_by_race = defaultdict(list)
-    income_by_race = defaultdict(list)
-    loan_amt_by_race = defaultdict(list)
+    rates_by_race = groups()
+    spreads_by_race = groups()
+    income_by_race = groups()
+    loan_amt_by_race = groups()
     
     # By race and loan type
-    rates_by_race_lt = defaultdict(list)
-    spreads_by_race_lt = defaultdict(list)
+    spreads_by_race_lt = groups()
     
     # By race and income bracket
-    spreads_by_race_income = defaultdict(list)
+    spreads_by_race_income = groups()
     
     # By year
-    rates_by_race_year = defaultdict(list)
-    spreads_by_race_year = defaultdict(list)
+    rates_by_race_year = groups()
+    spreads_by_race_year = groups()
+    
+    # Quantile sketches for the same spread groups (medians, p90)
+    rate_q_by_race = sketches()
+    spread_q_by_race = sketches()
+    spread_q_by_race_lt = sketches()
+    spread_q_by_race_income = sketches()
+    spread_q_by_race_year = sketches()
     
     total = 0
     
-    with open(slim_path) as f:
-        for row in csv.DictReader(f):
-            raw_race = row.get('derived_race', '')
-            raw_ethnicity = row.get('derived_ethnicity', '')
-            
-            # Hispanic ethnicity overrides race classification
-            if raw_ethnicity == 'Hispanic or Latino':
-                race = 'hispanic'
-            else:
-                race = RACE_MAP.get(raw_race)
-                if not race:
-                    continue
-            
-            rate_str = row.get('interest_rate', '')
-            spread_str = row.get('rate_spread', '')
-            income_str = row.get('income', '')
-            loan_str = row.get('loan_amount', '')
-            lt = row.get('loan_type', '')
-            year_str = row.get('activity_year', '')
-            
-            try:
-                rate = float(rate_str)
-            except:
+    for row in iter_rows(state_code):
+        raw_race = row.get('derived_race', '')
+        raw_ethnicity = row.get('derived_ethnicity', '')
+        
+        # Hispanic ethnicity overrides race classification
+        if raw_ethnicity == 'Hispanic or Latino':
+            race = 'hispanic'
+        else:
+            race = RACE_MAP.get(raw_race)
+            if not race:
                 continue
+        
+        rate_str = row.get('interest_rate', '')
+        spread_str = row.get('rate_spread', '')
+        income_str = row.get('income', '')
+        loan_str = row.get('loan_amount', '')
+        lt = row.get('loan_type', '')
+        year_str = row.get('activity_year', '')
+        
+        try:
+            rate = number(rate_str)
+        except:
+            continue
+        
+        total += 1
+        rates_by_race[race].add(rate)
+        rate_q_by_race[race].add(rate)
+        
+        # Rate spread
+        spread = None
+        try:
+            spread = number(spread_str)
+            spreads_by_race[race].add(spread)
+            spread_q_by_race[race].add(spread)
+            if lt in LT_NAMES:
+                spreads_by_race_lt[(race, lt)].add(spread)
+                spread_q_by_race_lt[(race, lt)].add(spread)
             
-            total += 1
-            rates_by_race[race].append(rate)
-            
-            # Rate spread
-            try:
-                spread = float(spread_str)
-                spreads_by_race[race].append(spread)
-                if lt in LT_NAMES:
-                    spreads_by_race_lt[(race, lt)].append(spread)
-                
-                # Income bracket
-                try:
-                    inc = int(income_str)
-                    if inc < 50: bracket = '<50K'
-                    elif inc < 100: bracket = '50-100K'
-                    elif inc < 150: bracket = '100-150K'
-                    else: bracket = '150K+'
-                    spreads_by_race_income[(race, bracket)].append(spread)
-                except:
-                    pass
-            except:
-                pass
-            
-            # Income and loan amount
-            try:
-                income_by_race[race].append(int(income_str))
-            except:
-                pass
-            try:
-                loan_amt_by_race[race].append(float(loan_str))
-            except:
-                pass
-            
-            # Yearly
+            # Income bracket
             try:
-                year = int(year_str)
-                rates_by_race_year[(race, year)].append(rate)
-                try:
-                    spreads_by_race_year[(race, year)].append(spread)
-                except:
-                    pass
+                inc = whole(income_str)
+                if inc < 50: bracket = '<50K'
+                elif inc < 100: bracket = '50-100K'
+                elif inc < 150: bracket = '100-150K'
+                else: bracket = '150K+'
+                spreads_by_race_income[(race, bracket)].add(spread)
+                spread_q_by_race_income[(race, bracket)].add(spread)
             except:
                 pass
+        except:
+            pass
+        
+        # Income and loan amount
+        try:
+            income_by_race[race].add(whole(income_str))
+        except:
+            pass
+        try:
+            loan_amt_by_race[race].add(number(loan_str))
+        except:
+            pass
+        
+        # Yearly
+        try:
+            year = year_of(year_str)
+            rates_by_race_year[(race, year)].add(rate)
+            if spread is not None:
+                spreads_by_race_year[(race, year)].add(spread)
+                spread_q_by_race_year[(race, year)].add(spread)
+        except:
+            pass
     
+    tables = {
+        "rate_by_race": rates_by_race,
+        "spread_by_race": spreads_by_race,
+        "income_by_race": income_by_race,
+        "loan_amount_by_race": loan_amt_by_race,
+        "spread_by_race_lt": spreads_by_race_lt,
+        "spread_by_race_income": spreads_by_race_income,
+        "rate_by_race_year": rates_by_race_year,
+        "spread_by_race_year": spreads_by_race_year,
+    }
+    quantiles = {
+        "rate_by_race": rate_q_by_race,
+        "spread_by_race": spread_q_by_race,
+        "spread_by_race_lt": spread_q_by_race_lt,
+        "spread_by_race_income": spread_q_by_race_income,
+        "spread_by_race_year": spread_q_by_race_year,
+    }
+    return total, tables, quantiles
+
+def iter_frames(state_code):
+    """A state's ROW_COLS as DataFrames of categoricals (numbers from the store stay
+    numeric): store batches, or the slim CSV read as dictionary-encoded strings."""
+    if USE_STORE:
+        for batch in store.iter_batches(columns=ROW_COLS, states=[state_code]):
+            yield batch.to_pandas()
+        return
+    slim_path = os.path.join(DATA_DIR, f"{state_code}_slim_merged.csv")
+    if not os.path.exists(slim_path):
+        slim_path = os.path.join(DATA_DIR, f"{state_code}_slim.csv")
+    if not os.path.exists(slim_path):
+        return
+    if store is not None:
+        table = store.read_slim_csv(slim_path, columns=ROW_COLS)
+        yield table.from_arrays([c.dictionary_encode() for c in table.columns],
+                                names=table.column_names).to_pandas()
+        return
+    yield from pd.read_csv(slim_path, usecols=lambda c: c in ROW_COLS, dtype='category',
+                           keep_default_na=False, chunksize=1000000)
+
+def parse(values, fn):
+    """fn(value) per row as the row engine's try/except does, but called once per
+    distinct value: (parsed float64, ok mask)."""
+    codes, uniques = pd.factorize(values)
+    parsed = np.zeros(len(uniques) + 1)
+    ok = np.zeros(len(uniques) + 1, dtype=bool)
+    for i, u in enumerate(uniques):
+        try:
+            parsed[i] = fn(u)
+            ok[i] = True
+        except Exception:
+            pass
+    return parsed[codes], ok[codes]  # code -1 (missing) hits the spare last slot
+
+def lookup(values, table, dtype=np.uint8):
+    """table.get(value, 0) per row, once per distinct value."""
+    codes, uniques = pd.factorize(values)
+    return np.array([table.get(u, 0) for u in uniques] + [0], dtype=dtype)[codes]
+
+@instrument.traced("build.encode", rows=lambda out: len(out['race']))
+def encode(df):
+    """A frame of ROW_COLS -> compact typed columns for tally_columns."""
+    col = lambda c: df[c] if c in df else pd.Series([None] * len(df), dtype=object)
+    race = lookup(col('derived_race'), {k: RACES.index(v) + 1 for k, v in RACE_MAP.items()})
+    hispanic = lookup(col('derived_ethnicity'), {'Hispanic or Latino': 1}).astype(bool)
+    race[hispanic] = RACES.index('hispanic') + 1
+    out = {'race': race,
+           'lt': lookup(col('loan_type'), {c: i + 1 for i, c in enumerate(LT_CODES)})}
+    for name, c, fn in [('rate', 'interest_rate', number), ('spread', 'rate_spread', number),
+                        ('income', 'income', whole), ('loan', 'loan_amount', number),
+                        ('year', 'activity_year', year_of)]:
+        out[name], out[name + '_ok'] = parse(col(c), fn)
+    return out
+
+@instrument.traced("build.tally_columns", rows=lambda r: r[0], fields=("state_code",))
+def tally_columns(state_code):
+    """NumPy engine: the same tables as tally_rows from integer-coded columns."""
+    parts = [encode(df) for df in instrument.iterate("build.read_frames", iter_frames(state_code),
+                                                     rows=len, state_code=state_code)]
+    if not parts:
+        return 0, {}, {}
+    c = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+    del parts
+    keep = (c['race'] > 0) & c['rate_ok']
+    c = {k: v[keep] for k, v in c.items()}
+    race = c['race'].astype(np.int64)
+    yr = c['year_ok']
+    year = np.where(yr, c['year'], 0).astype(np.uint16)
+    sp = c['spread_ok']
+    spread = c['spread']
+    lt = sp & (c['lt'] > 0)
+    inc = sp & c['income_ok']
+    bracket = np.searchsorted([50, 100, 150], c['income'], side='right')
+    # Compound keys: race * 8 + loan type / bracket, race * 65536 + year
+    by_race = lambda k: RACES[k - 1]
+    by_lt = lambda k: (RACES[k // 8 - 1], LT_CODES[k % 8 - 1])
+    by_bracket = lambda k: (RACES[k // 8 - 1], BRACKETS[k % 8])
+    by_year = lambda k: (RACES[(k >> 16) - 1], k & 0xFFFF)
+    lt_key = race[lt] * 8 + c['lt'][lt]
+    inc_key = race[inc] * 8 + bracket[inc]
+    year_key = (race << 16) + year
+    tables = {
+        "rate_by_race": grouped(race, c['rate'], by_race),
+        "spread_by_race": grouped(race[sp], spread[sp], by_race),
+        "income_by_race": grouped(race[c['income_ok']], c['income'][c['income_ok']], by_race, integer=True),
+        "loan_amount_by_race": grouped(race[c['loan_ok']], c['loan'][c['loan_ok']], by_race),
+        "spread_by_race_lt": grouped(lt_key, spread[lt], by_lt),
+        "spread_by_race_income": grouped(inc_key, spread[inc], by_bracket),
+        "rate_by_race_year": grouped(year_key[yr], c['rate'][yr], by_year),
+        "spread_by_race_year": grouped(year_key[yr & sp], spread[yr & sp], by_year),
+    }
+    quantiles = {
+        "rate_by_race": grouped_sketches(race, c['rate'], by_race),
+        "spread_by_race": grouped_sketches(race[sp], spread[sp], by_race),
+        "spread_by_race_lt": grouped_sketches(lt_key, spread[lt], by_lt),
+        "spread_by_race_income": grouped_sketches(inc_key, spread[inc], by_bracket),
+        "spread_by_race_year": grouped_sketches(year_key[yr & sp], spread[yr & sp], by_year),
+    }
+    return len(race), tables, quantiles
+
+@instrument.traced("build.process_state", fields=("state_code", "engine"))
+def process_state(state_code, engine=DEFAULT_ENGINE):
+    total, tables, quantiles = (tally_columns if engine == 'numpy' else tally_rows)(state_code)
     if total < 100:
         return None
-    
-    def avg(lst):
-        return round(sum(lst) / len(lst), 3) if lst else None
+    rates_by_race = tables["rate_by_race"]
+    spreads_by_race = tables["spread_by_race"]
+    income_by_race = tables["income_by_race"]
+    loan_amt_by_race = tables["loan_amount_by_race"]
+    spreads_by_race_lt = tables["spread_by_race_lt"]
+    spreads_by_race_income = tables["spread_by_race_income"]
+    spreads_by_race_year = tables["spread_by_race_year"]
+    spread_q_by_race = quantiles["spread_by_race"]
     
     # Average rates
     avg_rates = {}
     for race in ['white', 'black', 'hispanic', 'asian']:
         if rates_by_race[race]:
-            avg_rates[race] = avg(rates_by_race[race])
+            avg_rates[race] = rates_by_race[race].avg()
     
-    # Average spreads
+    # Average spreads, with their spread and precision
     avg_spreads = {}
+    spread_sd = {}
+    spread_se = {}
     for race in ['white', 'black', 'hispanic', 'asian']:
-        if spreads_by_race[race]:
-            avg_spreads[race] = avg(spreads_by_race[race])
+        acc = spreads_by_race[race]
+        if acc:
+            avg_spreads[race] = acc.avg()
+            if acc.n > 1:
+                spread_sd[race] = acc.sd()
+                spread_se[race] = acc.se()
+    
+    # Spread medians and p90 (means are dominated by FHA/high-cost tails)
+    spread_quantiles = {race: spread_q_by_race[race].quantiles()
+                        for race in ['white', 'black', 'hispanic', 'asian'] if spread_q_by_race[race].n}
     
     # Rate gaps
     w_spread = avg_spreads.get('white', 0)
@@ -148,17 +404,17 @@ def process_state(state_code):
     rate_gap_hw = round(avg_spreads.get('hispanic', 0) - w_spread, 3) if 'hispanic' in avg_spreads else 0
     
     # Average income and loan amount
-    avg_income = {r: avg(v) for r, v in income_by_race.items() if v}
-    avg_loan = {r: avg(v) for r, v in loan_amt_by_race.items() if v}
+    avg_income = {r: v.avg() for r, v in income_by_race.items() if v}
+    avg_loan = {r: v.avg() for r, v in loan_amt_by_race.items() if v}
     
     # By loan type (spreads)
     loan_type_spreads = {}
     for lt_code, lt_name in LT_NAMES.items():
         lt_data = {}
         for race in ['white', 'black', 'hispanic']:
-            vals = spreads_by_race_lt.get((race, lt_code), [])
-            if len(vals) > 50:
-                lt_data[race] = avg(vals)
+            acc = spreads_by_race_lt.get((race, lt_code))
+            if acc and acc.n > 50:
+                lt_data[race] = acc.avg()
         if lt_data:
             loan_type_spreads[lt_name] = lt_data
     
@@ -168,26 +424,29 @@ def process_state(state_code):
         row_data = {"bracket": bracket}
         has_data = False
         for race in ['white', 'black', 'hispanic']:
-            vals = spreads_by_race_income.get((race, bracket), [])
-            if len(vals) > 30:
-                row_data[race] = avg(vals)
+            acc = spreads_by_race_income.get((race, bracket))
+            if acc and acc.n > 30:
+                row_data[race] = acc.avg()
                 has_data = True
         if has_data:
             income_brackets.append(row_data)
     
     # Yearly spread averages
     yearly_spreads = {}
-    for (race, year), vals in spreads_by_race_year.items():
-        if len(vals) > 30:
-            yearly_spreads.setdefault(str(year), {})[race] = avg(vals)
+    for (race, year), acc in spreads_by_race_year.items():
+        if acc.n > 30:
+            yearly_spreads.setdefault(str(year), {})[race] = acc.avg()
     
     # Counts by race
-    counts = {r: len(v) for r, v in rates_by_race.items() if v}
+    counts = {r: v.n for r, v in rates_by_race.items() if v}
     
     return {
         "total_loans": total,
         "avg_rates": avg_rates,
         "avg_spreads": avg_spreads,
+        "spread_sd": spread_sd,
+        "spread_se": spread_se,
+        "spread_quantiles": spread_quantiles,
         "rate_gap_bw": rate_gap_bw,
         "rate_gap_hw": rate_gap_hw,
         "avg_income": avg_income,
@@ -196,89 +455,354 @@ def process_state(state_code):
         "income_brackets": income_brackets,
         "counts": counts,
         "yearly_spreads": yearly_spreads,
+        # Mergeable [n, sum, M2] per group; popped before writing the site data
+        "partials": {name: pack(table) for name, table in tables.items()},
+        # Serialized KLL sketches for the same groups; popped like partials
+        "sketches": {name: pack_sketches(table) for name, table in quantiles.items()},
     }
 
 
-all_stats = {}
-total_loans = 0
-all_rates = defaultdict(list)
-all_spreads = defaultdict(list)
+def summarize_quantiles(merged):
+    """Medians/p90 from rolled-up sketches (see aggregate.rollup_sketches)."""
+    races = ['white', 'black', 'hispanic', 'asian']
+    spreads = {r: merged['spread_by_race'][r].quantiles() for r in races if r in merged['spread_by_race']}
+    rates = {r: merged['rate_by_race'][r].quantiles() for r in races if r in merged['rate_by_race']}
+    yearly = {}
+    for key, sk in sorted(merged['spread_by_race_year'].items(), key=lambda kv: kv[0].split('|')[::-1]):
+        race, year = key.split('|')
+        if sk.n > 30:
+            yearly.setdefault(year, {})[race] = sk.quantiles()
+    return {
+        "spread_quantiles": spreads,
+        "rate_quantiles": rates,
+        "yearly_spread_quantiles": dict(sorted(yearly.items())),
+    }
 
-for f in sorted(os.listdir(DATA_DIR)):
-    # Prefer merged files (6 years), fall back to original slims (2 years)
-    if f.endswith('_slim_merged.csv'):
-        sc = f.replace('_slim_merged.csv', '')
-    elif f.endswith('_slim.csv') and not os.path.exists(os.path.join(DATA_DIR, f.replace('_slim.csv', '_slim_merged.csv'))):
-        sc = f.replace('_slim.csv', '')
+
+@instrument.traced("build.summarize")
+def summarize(merged):
+    """Headline figures from rolled-up partials (see aggregate.rollup)."""
+    races = ['white', 'black', 'hispanic', 'asian']
+    rates = {r: merged['rate_by_race'][r].avg() for r in races if merged['rate_by_race'].get(r)}
+    spreads = {r: merged['spread_by_race'][r].avg() for r in races if merged['spread_by_race'].get(r)}
+    yearly = {}
+    for key, acc in sorted(merged['spread_by_race_year'].items(), key=lambda kv: kv[0].split('|')[::-1]):
+        race, year = key.split('|')
+        if acc.n > 30:
+            yearly.setdefault(year, {})[race] = acc.avg()
+    w = spreads.get('white', 0)
+    return {
+        "total_loans": sum(acc.n for acc in merged['rate_by_race'].values()),
+        "avg_rates": rates,
+        "avg_spreads": spreads,
+        "rate_gap_bw": round(spreads['black'] - w, 3) if 'black' in spreads else 0,
+        "rate_gap_hw": round(spreads['hispanic'] - w, 3) if 'hispanic' in spreads else 0,
+        "yearly_spreads": dict(sorted(yearly.items())),
+    }
+
+
+@instrument.traced("build.collect_stats")
+def collect_stats(codes, jobs=1, use_cache=True, engine=DEFAULT_ENGINE):
+    """state_code -> process_state result, in `codes` order.
+
+    States whose manifest fingerprint matches the cache are reused; the rest run
+    serially or, with jobs > 1, in a process pool. Results are keyed by state and
+    reassembled in `codes` order, so the output doesn't depend on `jobs`.
+    """
+    manifest = store.load_manifest() if USE_STORE else None
+    cache = {}
+    if use_cache and manifest and os.path.exists(STATS_CACHE):
+        with open(STATS_CACHE) as f:
+            cache = json.load(f)
+
+    keys = {}
+    for sc in codes:
+        fp = store.state_fingerprint(manifest, sc) if manifest else None
+        keys[sc] = f"{fp}:{CODE_VERSION}" if fp else None
+    results = {sc: cache[sc]['stats'] for sc in codes
+               if keys[sc] and cache.get(sc, {}).get('key') == keys[sc]}
+    todo = [sc for sc in codes if sc not in results]
+
+    if jobs > 1 and len(todo) > 1:
+        print(f"Processing {len(todo)} states with {jobs} workers...")
+        # spawn: don't fork a parent that may hold pyarrow's thread pools
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=ctx) as pool:
+            results.update(zip(todo, pool.map(partial(process_state, engine=engine), todo)))
     else:
-        continue
-    name = STATE_NAMES.get(sc, sc)
-    
-    print(f"Processing {sc} ({name})...")
-    stats = process_state(sc)
-    gc.collect()
-    
-    if stats and stats['total_loans'] > 100:
-        all_stats[name] = stats
-        total_loans += stats['total_loans']
+        for sc in todo:
+            print(f"Processing {sc} ({STATE_NAMES.get(sc, sc)})...")
+            results[sc] = process_state(sc, engine)
+            gc.collect()
+
+    if manifest:
+        for sc in todo:
+            if keys[sc]:
+                cache[sc] = {'key': keys[sc], 'stats': results[sc]}
+        with open(STATS_CACHE, "w") as f:
+            json.dump(cache, f)
+        print(f"Reused cached stats for {len(codes) - len(todo)} unchanged states")
+    return {sc: results[sc] for sc in codes}
+
+
+def check(rows=20000):
+    """Tally a synthetic state (synth.py) with both engines, read as a slim CSV and
+    from the store, with values the two sources type differently mixed in. All
+    four must agree: counts exactly, sums and M2 to rounding, and sketches exactly
+    for the same source (the store reorders rows by year)."""
+    global USE_STORE
+    import synth
+    df = pd.concat(synth.frames(rows, states=['VT'], years=[2021, 2022], columns=ROW_COLS),
+                   ignore_index=True)
+    odd = {'income': ['75', '75.0', '80.5', 'Exempt', '', 'NaN', '-inf'],
+           'interest_rate': ['NaN', 'inf', ' 6.5', '7'], 'rate_spread': ['NaN', 'Exempt', '-0.5'],
+           'loan_amount': ['inf', '1e5', 'NA'], 'activity_year': ['0']}
+    rng = np.random.default_rng(0)
+    for c, values in odd.items():
+        at = rng.choice(len(df), len(df) // 50, replace=False)
+        df.loc[at, c] = rng.choice(values, len(at))
+
+    here, use_store, out = os.getcwd(), USE_STORE, {}
+    tmp = tempfile.mkdtemp()
+    try:
+        os.chdir(tmp)
+        os.makedirs(DATA_DIR)
+        df.to_csv(os.path.join(DATA_DIR, "VT_slim.csv"), index=False)
+        for source in ['csv'] + (['store'] if store is not None else []):
+            if source == 'store':
+                store.convert_state('VT')
+            USE_STORE = source == 'store'
+            for engine, tally in (('rows', tally_rows), ('numpy', tally_columns)):
+                total, tables, quantiles = tally('VT')
+                out[source, engine] = (total, {n: pack(t) for n, t in tables.items()},
+                                       {n: pack_sketches(q) for n, q in quantiles.items()})
+    finally:
+        os.chdir(here)
+        USE_STORE = use_store
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    (ref_total, ref_tables, ref_sketches), ok = out['csv', 'rows'], True
+    for (source, engine), (total, tables, sks) in out.items():
+        bad = [] if total == ref_total else ["total"]
+        for name, table in ref_tables.items():
+            other = tables.get(name, {})
+            if set(other) != set(table):
+                bad.append(f"{name} keys")
+                continue
+            for k, (n, tot, m2) in table.items():
+                n2, tot2, m22 = other[k]
+                if n != n2 or not (math.isclose(tot, tot2, rel_tol=1e-9, abs_tol=1e-9)
+                                   and math.isclose(m2, m22, rel_tol=1e-9, abs_tol=1e-9)):
+                    bad.append(f"{name}[{k}]")
+        for name, table in ref_sketches.items():
+            same = out[source, 'rows'][2][name]
+            if sks[name] != same or {k: v[1] for k, v in table.items()} != {k: v[1] for k, v in sks[name].items()}:
+                bad.append(f"{name} sketches")
+        ok &= not bad
+        print(f"  {source:5s} {engine:5s} {total:,} rows: {'ok' if not bad else 'DIFFERS: ' + ', '.join(bad[:5])}")
+    return ok
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--jobs", type=int, default=1, help="worker processes for per-state stats")
+    ap.add_argument("--no-cache", action="store_true", help="recompute every state")
+    ap.add_argument("--engine", choices=["numpy", "rows"], default=DEFAULT_ENGINE,
+                    help="per-state aggregation: typed NumPy columns or one dict per row")
+    ap.add_argument("--site-only", action="store_true",
+                    help="only re-split data/precomputed.json (plus the current regression gaps) "
+                         "into the site module and shards")
+    ap.add_argument("--no-site", action="store_true",
+                    help="only write data/*.json: no regression merge, no site files (pipeline.py "
+                         "runs --site-only once the grouped regression is done)")
+    ap.add_argument("--check", action="store_true",
+                    help="check that both engines tally a synthetic fixture identically, from CSV and store")
+    instrument.add_arguments(ap)
+    args = ap.parse_args()
+    instrument.from_args(args)
+    if args.check:
+        raise SystemExit(0 if check() else 1)
+    if args.site_only:
+        with open(os.path.join(DATA_DIR, "precomputed.json")) as f:
+            precomputed = json.load(f)
+        merge_regression(precomputed)
+        return report_site(write_site(precomputed))
+
+    all_stats = {}
+    total_loans = 0
+    all_rates = defaultdict(list)
+    all_spreads = defaultdict(list)
+
+    partials = {}
+    state_sketches = {}
+
+    results = collect_stats(state_codes(), jobs=args.jobs, use_cache=not args.no_cache,
+                            engine=args.engine)
+    for sc, stats in results.items():
+        name = STATE_NAMES.get(sc, sc)
         
-        # Aggregate
-        for race in ['white', 'black', 'hispanic', 'asian']:
-            if race in stats['avg_rates']:
-                all_rates[race].append(stats['avg_rates'][race])
-            if race in stats['avg_spreads']:
-                all_spreads[race].append(stats['avg_spreads'][race])
+        if stats and stats['total_loans'] > 100:
+            partials[sc] = stats.pop('partials')
+            state_sketches[sc] = stats.pop('sketches')
+            all_stats[name] = stats
+            total_loans += stats['total_loans']
         
-        gap = stats.get('rate_gap_bw', 0)
-        print(f"  ✓ {name}: {stats['total_loans']:,} loans, B/W spread gap: {gap:+.3f}pp")
-    else:
-        print(f"  ✗ {name}: insufficient data")
-
-# National averages
-nat_rates = {r: round(sum(v)/len(v), 3) for r, v in all_rates.items() if v}
-nat_spreads = {r: round(sum(v)/len(v), 3) for r, v in all_spreads.items() if v}
-
-# National yearly trends (aggregate weighted by count)
-nat_yearly_spreads_sum = defaultdict(lambda: defaultdict(lambda: [0.0, 0]))
-for state_name, stats in all_stats.items():
-    for year_str, race_data in stats.get('yearly_spreads', {}).items():
-        for race, val in race_data.items():
-            # Use count-weighted average approximation: just average state averages
-            nat_yearly_spreads_sum[year_str][race][0] += val
-            nat_yearly_spreads_sum[year_str][race][1] += 1
-
-nat_yearly = {}
-for year_str in sorted(nat_yearly_spreads_sum.keys()):
-    nat_yearly[year_str] = {}
-    for race, (s, c) in nat_yearly_spreads_sum[year_str].items():
-        nat_yearly[year_str][race] = round(s / c, 3)
-
-states_list = sorted(all_stats.keys())
-
-precomputed = {
-    "summary": {
-        "total_loans": total_loans,
-        "num_states": len(states_list),
-        "states": states_list,
-        "years": "2018-2023",
-    },
-    "avg_rates": nat_rates,
-    "avg_spreads": nat_spreads,
-    "yearly_spreads": nat_yearly,
-    "by_state": all_stats,
-}
+            # Aggregate
+            for race in ['white', 'black', 'hispanic', 'asian']:
+                if race in stats['avg_rates']:
+                    all_rates[race].append(stats['avg_rates'][race])
+                if race in stats['avg_spreads']:
+                    all_spreads[race].append(stats['avg_spreads'][race])
+        
+            gap = stats.get('rate_gap_bw', 0)
+            print(f"  ✓ {name}: {stats['total_loans']:,} loans, B/W spread gap: {gap:+.3f}pp")
+        else:
+            print(f"  ✗ {name}: insufficient data")
+
+    # National figures: exact, count-weighted merge of the state partials
+    national = summarize(rollup(partials.values()))
+    nat_rates = national['avg_rates']
+    nat_spreads = national['avg_spreads']
+    nat_yearly = national['yearly_spreads']
+    nat_quantiles = summarize_quantiles(rollup_sketches(state_sketches.values()))
+
+    by_region = {}
+    for region, members in REGIONS.items():
+        parts = [partials[sc] for sc in members if sc in partials]
+        if parts:
+            summary = summarize(rollup(parts))
+            summary['num_states'] = len(parts)
+            summary['spread_quantiles'] = summarize_quantiles(rollup_sketches(
+                state_sketches[sc] for sc in members if sc in state_sketches))['spread_quantiles']
+            by_region[region] = summary
+
+    # Compatibility: the old unweighted means of state means
+    unw_rates = {r: round(sum(v)/len(v), 3) for r, v in all_rates.items() if v}
+    unw_spreads = {r: round(sum(v)/len(v), 3) for r, v in all_spreads.items() if v}
+    nat_yearly_spreads_sum = defaultdict(lambda: defaultdict(lambda: [0.0, 0]))
+    for state_name, stats in all_stats.items():
+        for year_str, race_data in stats.get('yearly_spreads', {}).items():
+            for race, val in race_data.items():
+                nat_yearly_spreads_sum[year_str][race][0] += val
+                nat_yearly_spreads_sum[year_str][race][1] += 1
+
+    unw_yearly = {}
+    for year_str in sorted(nat_yearly_spreads_sum.keys()):
+        unw_yearly[year_str] = {}
+        for race, (s, c) in nat_yearly_spreads_sum[year_str].items():
+            unw_yearly[year_str][race] = round(s / c, 3)
+
+    manifest = store.load_manifest() if USE_STORE else None
+    years = store.manifest_years(manifest) if manifest else []
+    years_label = f"{years[0]}-{years[-1]}" if years else "2018-2023"
+
+    states_list = sorted(all_stats.keys())
+
+    precomputed = {
+        "summary": {
+            "total_loans": total_loans,
+            "num_states": len(states_list),
+            "states": states_list,
+            "years": years_label,
+        },
+        "avg_rates": nat_rates,
+        "avg_spreads": nat_spreads,
+        "yearly_spreads": nat_yearly,
+        # KLL sketch estimates, rank error < ~1.7% (see aggregate.KLL)
+        "spread_quantiles": nat_quantiles['spread_quantiles'],
+        "rate_quantiles": nat_quantiles['rate_quantiles'],
+        "yearly_spread_quantiles": nat_quantiles['yearly_spread_quantiles'],
+        "unweighted": {
+            "avg_rates": unw_rates,
+            "avg_spreads": unw_spreads,
+            "yearly_spreads": unw_yearly,
+        },
+        "by_region": by_region,
+        "by_state": all_stats,
+    }
+
+    if not args.no_site:
+        merge_regression(precomputed)
+
+    with open(PARTIALS_PATH, "w") as f:
+        json.dump(partials, f)
+    with open(SKETCHES_PATH, "w") as f:
+        json.dump(state_sketches, f)
+
+    # Save JSON
+    with open(os.path.join(DATA_DIR, "precomputed.json"), "w") as f:
+        json.dump(precomputed, f, indent=2)
+
+    print(f"\n=== {len(all_stats)} states, {total_loans:,} total loans ===")
+    print(f"National avg spreads: {nat_spreads}")
+    if not args.no_site:
+        report_site(write_site(precomputed))
+
+
+def merge_regression(precomputed):
+    """Add the per-state/per-year gaps from `regression.py --grouped`, when present."""
+    if not os.path.exists(REGRESSION_BY_GROUP):
+        return
+    with open(REGRESSION_BY_GROUP) as f:
+        grouped = json.load(f)
+    precomputed["regression"] = {
+        "national": grouped["national"],
+        "by_state": {STATE_NAMES.get(sc, sc): v for sc, v in grouped["by_state"].items()},
+        "by_year": grouped["by_year"],
+    }
+    print(f"Merged regression gaps for {len(grouped['by_state'])} states, "
+          f"{len(grouped['by_year'])} years")
+
+
+@instrument.traced("build.write_site")
+def write_site(precomputed, web_dir="web"):
+    """Split precomputed into the site's national module and per-state shards.
+
+    The module keeps everything but by_state (and the per-state regression),
+    with a state_summary of SUMMARY_FIELDS and each state's shard URL; the
+    shard holds the state's full stats. Shards no longer referenced are
+    removed. Returns {"module": bytes, "shards": {state: bytes}}.
+    """
+    shard_dir = os.path.join(web_dir, SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+    codes = {name: sc for sc, name in STATE_NAMES.items()}
+    regression = precomputed.get("regression", {})
+    state_regression = regression.get("by_state", {})
+
+    summary, sizes = {}, {}
+    for name, stats in precomputed["by_state"].items():
+        shard = dict(stats)
+        if name in state_regression:
+            shard["regression"] = state_regression[name]
+        body = json.dumps(shard, separators=(",", ":")).encode()
+        fname = f"{codes.get(name, name)}.{hashlib.sha256(body).hexdigest()[:10]}.json"
+        path = os.path.join(shard_dir, fname)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(body)
+        sizes[name] = len(body)
+        summary[name] = {k: stats[k] for k in SUMMARY_FIELDS if k in stats}
+        summary[name]["has_income_brackets"] = bool(stats.get("income_brackets"))
+        summary[name]["shard"] = f"{SHARD_URL}/{fname}"
+    current = {s["shard"].rsplit("/", 1)[1] for s in summary.values()}
+    for fname in os.listdir(shard_dir):
+        if fname.endswith(".json") and fname not in current:
+            os.remove(os.path.join(shard_dir, fname))
+
+    national = {k: v for k, v in precomputed.items() if k not in ("by_state", "regression")}
+    if regression:
+        national["regression"] = {k: v for k, v in regression.items() if k != "by_state"}
+    national["state_summary"] = summary
+    module = ("const data = " + json.dumps(national) + " as const;\n\nexport default data;\n").encode()
+    with open(os.path.join(web_dir, SITE_MODULE), "wb") as f:
+        f.write(module)
+    return {"module": len(module), "shards": sizes}
 
-# Save JSON
-with open(os.path.join(DATA_DIR, "precomputed.json"), "w") as f:
-    json.dump(precomputed, f, indent=2)
 
-# Save TS
-ts_path = os.path.join("web", "src", "data", "precomputed.ts")
-with open(ts_path, "w") as f:
-    f.write("const data = ")
-    json.dump(precomputed, f)
-    f.write(" as const;\n\nexport default data;\n")
+def report_site(sizes):
+    shards = sorted(sizes["shards"].values())
+    print(f"precomputed.ts: {sizes['module']/1024:.0f}KB; {len(shards)} state shards, "
+          f"{shards[len(shards) // 2]/1024:.1f}KB median, {shards[-1]/1024:.1f}KB max"
+          if shards else f"precomputed.ts: {sizes['module']/1024:.0f}KB")
 
-print(f"\n=== {len(all_stats)} states, {total_loans:,} total loans ===")
-print(f"National avg spreads: {nat_spreads}")
-print(f"precomputed.ts: {os.path.getsize(ts_path)/1024:.0f}KB")
+if __name__ == "__main__":
+    main()
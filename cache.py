@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Content-addressed on-disk cache: entries are named by a hash of their inputs.
+
+Array entries are directories of .npy files plus meta.json, written to a
+private temp directory and renamed into place, and read back with np.load(mmap_mode='r'), so
+a hit costs a few page faults rather than a parse. JSON entries hold small
+results. Nothing is ever invalidated in place: changed inputs hash to a new
+name, and `prune` drops the superseded siblings. Concurrent writers of the same
+entry (two processes preparing the same design) each write their own temp
+directory; the first rename wins and the others are discarded.
+"""
+import hashlib, json, os, shutil, tempfile
+
+import numpy as np
+
+
+def digest(*parts):
+    """Stable hash of JSON-able parts."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def file_digest(paths, memo=None):
+    """Hash of the contents of `paths`, in order.
+
+    With `memo` (a JSON file), each file's own hash is remembered by (path, size,
+    mtime_ns) and the result is a hash of those, so unchanged files are not re-read.
+    """
+    h = hashlib.sha256()
+    if memo is not None:
+        known = load_json(memo) or {}
+        changed = False
+        for path in paths:
+            st = os.stat(path)
+            key, stamp = os.path.abspath(path), [st.st_size, st.st_mtime_ns]
+            got = known.get(key)
+            if not got or got[:2] != stamp:
+                got = known[key] = stamp + [file_digest([path])]
+                changed = True
+            h.update(got[2].encode())
+        if changed:
+            save_json(memo, known)
+        return h.hexdigest()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for buf in iter(lambda: f.read(1 << 20), b''):
+                h.update(buf)
+    return h.hexdigest()
+
+
+def exists(path):
+    return os.path.exists(os.path.join(path, "meta.json"))
+
+
+def _tmp_name(path):
+    """Temp name beside `path`, unique to this writer; the leading dot keeps it
+    out of prune() and directory listings of entries."""
+    parent, name = os.path.split(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    return parent, f".{name}.", ".tmp"
+
+
+def save_arrays(path, arrays, meta, replace=False):
+    """Atomically write {name: ndarray} and `meta` as the entry at `path`.
+
+    An entry already at `path` is kept, since a content-addressed name means
+    the same contents; replace=True swaps it out instead, for entries rewritten
+    in place under a fixed name (cube partitions). Readers see the old entry or
+    the new one, never a partial directory.
+    """
+    parent, prefix, suffix = _tmp_name(path)
+    tmp = tempfile.mkdtemp(prefix=prefix, suffix=suffix, dir=parent)
+    try:
+        for name, a in arrays.items():
+            np.save(os.path.join(tmp, f"{name}.npy"), np.ascontiguousarray(a))
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump({"arrays": list(arrays), **meta}, f)
+        if os.path.exists(path) and (replace or not exists(path)):
+            # Move the old entry aside rather than deleting it first: open
+            # memmaps of its files stay valid, and the swap leaves no gap of
+            # a missing meta.json beyond the two renames
+            old = tmp + ".old"
+            try:
+                os.replace(path, old)
+            except FileNotFoundError:
+                pass
+            shutil.rmtree(old, ignore_errors=True)
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            if not exists(path):  # not a concurrent writer winning the race
+                raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_arrays(path):
+    """({name: read-only memmap}, meta) for an entry written by save_arrays."""
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+              for name in meta.pop("arrays")}
+    return arrays, meta
+
+
+def load_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_json(path, obj):
+    parent, prefix, suffix = _tmp_name(path)
+    fd, tmp = tempfile.mkstemp(prefix=prefix, suffix=suffix, dir=parent)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(obj, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def prune(directory, prefix, keep):
+    """Remove entries in `directory` starting with `prefix` other than `keep`."""
+    if not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name != keep:
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""Aggregate cube over the slimmed HMDA rows, for ad-hoc group-by queries (serve.py).
+
+One partition per state (data/cube/XX/, a cache.save_arrays entry) holds every
+non-empty cell of race x year x loan type x LTV band x DTI bucket x income
+bracket x occupancy x purpose, with a mergeable [n, sum, M2] per measure: the
+same partial aggregates as aggregate.Acc. A query filters cells and merges them
+up to the requested dimensions (Chan et al.), so any slice costs O(cells)
+rather than O(loans) and gives the count, mean and variance a scan would.
+
+Each partition's meta records its input fingerprint (the store manifest's, or
+a hash of the slim CSV), so `build` only redoes states whose data changed.
+
+Usage:
+  python cube.py build
+  python cube.py query --by race ltv year --where state=CA
+  python cube.py query --by race dti --measure interest_rate
+"""
+import argparse, functools, os, shutil, time
+
+import numpy as np
+import pandas as pd
+
+import cache
+from aggregate import Acc
+
+try:
+    import store
+except ImportError:  # no pyarrow: slim CSVs only
+    store = None
+
+DATA_DIR = "data"
+CUBE_DIR = os.path.join(DATA_DIR, "cube")
+
+MEASURES = ['rate_spread', 'interest_rate']
+READ_COLS = MEASURES + ['derived_race', 'derived_ethnicity', 'activity_year', 'loan_type',
+                        'loan_to_value_ratio', 'debt_to_income_ratio', 'income',
+                        'occupancy_type', 'loan_purpose']
+
+# Dimension -> labels, in display order; cells store each as an index into its
+# labels, with 'NA' last. 'year' is stored as the year and 'state' is the partition.
+DIMS = {
+    'race': ['white', 'black', 'hispanic', 'asian', 'aian', 'nhpi', 'other'],
+    'year': None,
+    'loan_type': ['conventional', 'fha', 'va', 'usda', 'NA'],
+    'ltv': ['<60', '60-80', '80-90', '90-95', '95-100', '100+', 'NA'],
+    'dti': ['<20', '20-30', '30-36', '36-40', '40-45', '45-50', '50-60', '>60', 'NA'],
+    'income': ['<50K', '50-100K', '100-150K', '150K+', 'NA'],
+    'occupancy': ['principal', 'second', 'investment', 'NA'],
+    'purpose': ['purchase', 'refinance', 'cash-out refinance', 'NA'],
+}
+CELL_DIMS = list(DIMS)
+QUERY_DIMS = ['state'] + CELL_DIMS
+
+# Raw HMDA value -> label. Hispanic ethnicity overrides race, as in build_precomputed;
+# other derived_race values (joint, 2+ races, not available) are 'other'.
+RACE_LABELS = {
+    'White': 'white', 'Black or African American': 'black', 'Asian': 'asian',
+    'American Indian or Alaska Native': 'aian',
+    'Native Hawaiian or Other Pacific Islander': 'nhpi',
+}
+LOAN_TYPES = {'1': 'conventional', '2': 'fha', '3': 'va', '4': 'usda'}
+# HMDA reports DTI in ranges outside 36-49%, whole percents inside it
+DTI_LABELS = {'<20%': '<20', '20%-<30%': '20-30', '30%-<36%': '30-36', '50%-60%': '50-60', '>60%': '>60'}
+DTI_LABELS.update({str(v): '36-40' if v < 40 else '40-45' if v < 45 else '45-50' for v in range(36, 50)})
+OCCUPANCY = {'1': 'principal', '2': 'second', '3': 'investment'}
+PURPOSES = {'1': 'purchase', '31': 'refinance', '32': 'cash-out refinance'}
+LTV_EDGES = [60, 80, 90, 95, 100]
+INCOME_EDGES = [50, 100, 150]  # $K, build_precomputed's brackets
+
+CODE_VERSION = cache.file_digest([__file__])[:16]
+
+
+def lookup(values, table, labels):
+    """Index into `labels` of table[value] per row (missing/unknown -> last label),
+    looked up once per distinct value."""
+    codes, uniques = pd.factorize(values)
+    fallback = len(labels) - 1
+    index = [labels.index(table[u]) if u in table else fallback for u in uniques]
+    return np.array(index + [fallback], dtype=np.uint16)[codes]
+
+
+def band(values, edges, labels):
+    """Index of the band each value falls in (edges are lower bounds); NaN -> 'NA'."""
+    v = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    out = np.searchsorted(edges, v, side='right').astype(np.uint16)
+    out[np.isnan(v)] = len(labels) - 1
+    return out
+
+
+def encode(df):
+    """Raw slim rows -> (cell coordinates, rows x CELL_DIMS uint16; {measure: float64})."""
+    col = lambda c: df[c] if c in df else pd.Series([None] * len(df), dtype=object)
+    race = lookup(col('derived_race'), RACE_LABELS, DIMS['race'])
+    race[np.asarray(col('derived_ethnicity') == 'Hispanic or Latino')] = DIMS['race'].index('hispanic')
+    year = pd.to_numeric(col('activity_year'), errors='coerce').fillna(0).to_numpy(dtype=np.uint16)
+    coords = np.column_stack([
+        race, year,
+        lookup(col('loan_type'), LOAN_TYPES, DIMS['loan_type']),
+        band(col('loan_to_value_ratio'), LTV_EDGES, DIMS['ltv']),
+        lookup(col('debt_to_income_ratio'), DTI_LABELS, DIMS['dti']),
+        band(col('income'), INCOME_EDGES, DIMS['income']),
+        lookup(col('occupancy_type'), OCCUPANCY, DIMS['occupancy']),
+        lookup(col('loan_purpose'), PURPOSES, DIMS['purpose']),
+    ])
+    values = {m: pd.to_numeric(col(m), errors='coerce').to_numpy(dtype=float) for m in MEASURES}
+    return coords, values
+
+
+def cell_ids(coords):
+    """Row -> index of its distinct coordinate tuple, and those tuples."""
+    key = np.zeros(len(coords), dtype=np.int64)
+    for j in range(coords.shape[1]):  # mixed radix; the product of radices is ~1e8
+        key = key * (int(coords[:, j].max(initial=0)) + 1) + coords[:, j]
+    ids, _ = pd.factorize(key)
+    first = np.zeros(ids.max(initial=-1) + 1, dtype=np.int64)
+    first[ids[::-1]] = np.arange(len(ids))[::-1]
+    return ids, coords[first]
+
+
+def moments(ids, x, size):
+    """Per-group count, sum and M2 (two-pass) of x."""
+    n = np.bincount(ids, minlength=size)
+    total = np.bincount(ids, weights=x, minlength=size)
+    mean = np.divide(total, n, out=np.zeros(size), where=n > 0)
+    m2 = np.bincount(ids, weights=(x - mean[ids]) ** 2, minlength=size)
+    return n, total, m2
+
+
+def aggregate(coords, values):
+    """Rows -> partition arrays: 'cells' plus '<measure>_n/_sum/_m2' per cell."""
+    ids, cells = cell_ids(coords)
+    out = {'cells': cells}
+    for m, x in values.items():
+        ok = ~np.isnan(x)
+        out[f"{m}_n"], out[f"{m}_sum"], out[f"{m}_m2"] = moments(ids[ok], x[ok], len(cells))
+    return out
+
+
+# --- build ---
+
+def sources():
+    """[(state, fingerprint, read)] from the store when present, else slim CSVs."""
+    if store is not None and store.exists():
+        manifest = store.load_manifest()
+        return [(st, store.state_fingerprint(manifest, st),
+                 functools.partial(store.read_pandas, columns=READ_COLS, states=[st]))
+                for st in store.states()]
+    out = []
+    for f in sorted(os.listdir(DATA_DIR)):
+        st = f.split('_')[0]
+        merged = os.path.join(DATA_DIR, f"{st}_slim_merged.csv")
+        if not (f.endswith('_slim_merged.csv') or f.endswith('_slim.csv') and not os.path.exists(merged)):
+            continue
+        path = os.path.join(DATA_DIR, f)
+        read = functools.partial(pd.read_csv, path, usecols=lambda c: c in READ_COLS, dtype=str,
+                                 keep_default_na=False)
+        out.append((st, cache.file_digest([path]), read))
+    return out
+
+
+def partition_path(state, root=CUBE_DIR):
+    return os.path.join(root, state)
+
+
+def build(root=CUBE_DIR, force=False):
+    os.makedirs(root, exist_ok=True)
+    found = sources()
+    reused = built = 0
+    for st, fingerprint, read in found:
+        path = partition_path(st, root)
+        key = cache.digest(fingerprint, CODE_VERSION)
+        if not force and cache.exists(path) and cache.load_arrays(path)[1].get('key') == key:
+            reused += 1
+            continue
+        t0 = time.time()
+        df = read()
+        arrays = aggregate(*encode(df))
+        cache.save_arrays(path, arrays, {'key': key, 'state': st, 'rows': len(df)}, replace=True)
+        built += 1
+        print(f"  {st}: {len(df):,} rows -> {len(arrays['cells']):,} cells ({time.time() - t0:.2f}s)")
+    keep = {st for st, _, _ in found}
+    for name in os.listdir(root):
+        if name not in keep:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    print(f"cube: {built} states built, {reused} unchanged -> {root}")
+
+
+# --- query ---
+
+_loaded = {}  # path -> (mtime, arrays, meta): one entry per partition, replaced on rebuild
+
+
+def _partition(path, mtime):
+    got = _loaded.get(path)
+    if got is None or got[0] != mtime:
+        arrays, meta = cache.load_arrays(path)
+        got = _loaded[path] = (mtime, {k: np.asarray(v) for k, v in arrays.items()}, meta)
+    return got[1], got[2]
+
+
+def partition_states(root=CUBE_DIR):
+    """States with a complete partition (not the hidden temp directories of a build)."""
+    return [st for st in sorted(os.listdir(root)) if not st.startswith('.')
+            and cache.exists(partition_path(st, root))] if os.path.isdir(root) else []
+
+
+def partitions(root=CUBE_DIR):
+    """{state: arrays}, re-read only for partitions rebuilt since the last call."""
+    out = {}
+    for st in partition_states(root):
+        path = partition_path(st, root)
+        out[st] = _partition(path, os.path.getmtime(os.path.join(path, "meta.json")))[0]
+    gone = [p for p in list(_loaded) if os.path.dirname(p) == root and os.path.basename(p) not in out]
+    for path in gone:
+        _loaded.pop(path, None)
+    return out
+
+
+def version(root=CUBE_DIR):
+    """Changes whenever a partition is rebuilt; part of serve.py's result-cache key."""
+    return tuple((st, os.path.getmtime(os.path.join(partition_path(st, root), "meta.json")))
+                 for st in partition_states(root))
+
+
+def dims(root=CUBE_DIR):
+    """Queryable dimensions and their labels (years and states as present)."""
+    parts = partitions(root)
+    years = sorted({int(y) for p in parts.values() for y in np.unique(p['cells'][:, 1])} - {0})
+    return {'state': list(parts), **{d: labels if labels is not None else years for d, labels in DIMS.items()},
+            'measure': MEASURES}
+
+
+def _codes(dim, wanted, states):
+    """Filter labels -> stored codes for `dim`; ValueError on an unknown label."""
+    wanted = [str(w) for w in wanted]
+    if dim == 'state':
+        known = states
+    elif dim == 'year':
+        if not all(w.isdigit() for w in wanted):
+            raise ValueError(f"year must be numeric: {','.join(wanted)}")
+        return [int(w) for w in wanted]
+    else:
+        known = DIMS[dim]
+    bad = [w for w in wanted if w not in known]
+    if bad:
+        raise ValueError(f"unknown {dim} {','.join(bad)}; one of {','.join(map(str, known))}")
+    return [known.index(w) for w in wanted]
+
+
+def _label(dim, code, states):
+    if dim == 'state':
+        return states[code]
+    return int(code) if dim == 'year' else DIMS[dim][code]
+
+
+def query(by, where=None, measure='rate_spread', min_n=1, root=CUBE_DIR):
+    """Group `measure` by the dimensions in `by`, over cells matching `where`
+    ({dim: [labels]}). Returns {'rows': [{dim: label, ..., n, mean, sd, se}]},
+    rows ordered by label (years ascending); groups under min_n are dropped."""
+    where = {d: v for d, v in (where or {}).items() if v}
+    for d in list(by) + list(where):
+        if d not in QUERY_DIMS:
+            raise ValueError(f"unknown dimension {d}; one of {','.join(QUERY_DIMS)}")
+    if len(set(by)) != len(by):
+        raise ValueError("repeated dimension in by")
+    if measure not in MEASURES:
+        raise ValueError(f"unknown measure {measure}; one of {','.join(MEASURES)}")
+    parts = partitions(root)
+    states = list(parts)
+    want = {d: _codes(d, v, states) for d, v in where.items()}
+    selected = [i for i, st in enumerate(states) if 'state' not in want or i in want['state']]
+
+    cells = np.concatenate([parts[states[i]]['cells'] for i in selected]) if selected \
+        else np.zeros((0, len(CELL_DIMS)), dtype=np.uint16)
+    state = np.repeat(np.array(selected, dtype=np.int64),
+                      [len(parts[states[i]]['cells']) for i in selected])
+    n, total, m2 = (np.concatenate([parts[states[i]][f"{measure}_{s}"] for i in selected])
+                    if selected else np.zeros(0) for s in ('n', 'sum', 'm2'))
+    column = lambda d: state if d == 'state' else cells[:, CELL_DIMS.index(d)].astype(np.int64)
+
+    keep = n > 0
+    for d, codes in want.items():
+        if d != 'state':
+            keep &= np.isin(column(d), codes)
+    key = np.zeros(int(keep.sum()), dtype=np.int64)
+    cols = [column(d)[keep] for d in by]
+    for c in cols:
+        key = key * (int(c.max(initial=0)) + 1) + c
+    n, total, m2 = n[keep], total[keep], m2[keep]
+
+    # Chan et al.: M2 = sum of cell M2s + sum n_i (mean_i - group mean)^2
+    g, uniq = pd.factorize(key, sort=True)
+    size = len(uniq)
+    gn = np.bincount(g, weights=n, minlength=size)
+    gsum = np.bincount(g, weights=total, minlength=size)
+    gmean = np.divide(gsum, gn, out=np.zeros(size), where=gn > 0)
+    gm2 = np.bincount(g, weights=m2 + n * (total / n - gmean[g]) ** 2, minlength=size)
+    first = np.zeros(size, dtype=np.int64)
+    first[g[::-1]] = np.arange(len(g))[::-1]
+
+    rows = []
+    for i in range(size):
+        count = int(gn[i])
+        if count < min_n:
+            continue
+        acc = Acc(count, float(gsum[i]), float(gmean[i]), float(gm2[i]))
+        row = {d: _label(d, c[first[i]], states) for d, c in zip(by, cols)}
+        row.update(n=count, mean=acc.avg(), sd=acc.sd(), se=acc.se())
+        rows.append(row)
+    return {'by': list(by), 'where': {d: list(map(str, v)) for d, v in where.items()},
+            'measure': measure, 'rows': rows}
+
+
+def parse_where(items):
+    """['state=CA,NY', 'year=2021'] -> {'state': ['CA', 'NY'], 'year': ['2021']}."""
+    out = {}
+    for item in items or []:
+        d, sep, v = item.partition('=')
+        if not sep:
+            raise ValueError(f"expected dim=value[,value], got {item}")
+        out.setdefault(d, []).extend(x for x in v.split(',') if x)
+    return out
+
+
+def print_rows(result):
+    by = result['by']
+    widths = [max([len(d)] + [len(str(r[d])) for r in result['rows']]) for d in by]
+    print("  ".join(d.ljust(w) for d, w in zip(by, widths)) + f"  {'n':>9} {'mean':>8} {'sd':>7} {'se':>7}")
+    for r in result['rows']:
+        fmt = lambda v, w: f"{'' if v is None else v:>{w}}"
+        print("  ".join(str(r[d]).ljust(w) for d, w in zip(by, widths))
+              + f"  {r['n']:>9,} {fmt(r['mean'], 8)} {fmt(r['sd'], 7)} {fmt(r['se'], 7)}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--root", default=CUBE_DIR)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="build or refresh the per-state partitions")
+    b.add_argument("--force", action="store_true", help="rebuild unchanged states too")
+    q = sub.add_parser("query", help="group a measure by some dimensions")
+    q.add_argument("--by", nargs="+", required=True, choices=QUERY_DIMS)
+    q.add_argument("--where", nargs="*", metavar="DIM=V[,V]")
+    q.add_argument("--measure", default="rate_spread", choices=MEASURES)
+    q.add_argument("--min-n", type=int, default=1)
+    sub.add_parser("dims", help="list dimensions and labels")
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        build(args.root, args.force)
+    elif args.cmd == "dims":
+        for d, labels in dims(args.root).items():
+            print(f"  {d:10s} {', '.join(map(str, labels))}")
+    else:
+        t0 = time.time()
+        try:
+            result = query(args.by, parse_where(args.where), args.measure, args.min_n, args.root)
+        except ValueError as e:
+            ap.error(str(e))
+        print_rows(result)
+        print(f"{len(result['rows'])} groups in {(time.time() - t0) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,13 @@
 #!/usr/bin/env python3
-"""Download HMDA 2018-2021 data and merge with existing 2022-2023 slims."""
-import subprocess, os, csv, gc, random
+"""Download HMDA 2018-2021 data and merge with existing 2022-2023 slims.
+
+Legacy CSV path: new years now go straight into the Parquet store via ingest.py.
+"""
+import argparse, os
+
+import instrument
+from fetch import Downloader, hmda_url
+from slim import DEFAULT_ENGINE, SlimSample
 
 DATA_DIR = "data"
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -12,133 +19,87 @@ STATES = [
     "VA","VT","WA","WV","WI","WY"
 ]
 
-KEEP_COLS = [
-    'activity_year','state_code','derived_race','derived_sex','derived_ethnicity',
-    'interest_rate','rate_spread','income','loan_amount','loan_to_value_ratio',
-    'debt_to_income_ratio','loan_type','loan_purpose','occupancy_type',
-    'property_value','applicant_age','applicant_credit_score_type',
-    'lien_status','conforming_loan_limit','total_units'
-]
-
 NEW_YEARS = [2018, 2019, 2020, 2021]
 
-def download_state_year(state, year):
-    url = f"https://ffiec.cfpb.gov/v2/data-browser-api/view/csv?years={year}&states={state}&actions_taken=1"
-    outpath = os.path.join(DATA_DIR, f"{state}_{year}_raw.csv")
-    
-    if os.path.exists(outpath) and os.path.getsize(outpath) > 1000:
-        return outpath
-    
-    result = subprocess.run(
-        ["curl", "-sL", "-o", outpath, url],
-        timeout=600, capture_output=True
-    )
-    
-    if os.path.exists(outpath) and os.path.getsize(outpath) > 500:
-        return outpath
-    return None
-
-def process_raw(path):
-    """Read raw CSV, filter, return rows."""
-    rows = []
-    header = None
-    with open(path, 'r') as f:
-        reader = csv.DictReader(f)
-        if header is None:
-            header = [c for c in KEEP_COLS if c in reader.fieldnames]
-        
-        for row in reader:
-            if row.get('loan_purpose') not in ('1', '31', '32'):
-                continue
-            if row.get('occupancy_type') != '1':
-                continue
-            
-            race = row.get('derived_race', '')
-            ethnicity = row.get('derived_ethnicity', '')
-            if race not in ('White', 'Black or African American', 'Asian', 'Joint', 'Race Not Available') \
-               and ethnicity not in ('Hispanic or Latino', 'Not Hispanic or Latino'):
-                continue
-            
-            rate = row.get('interest_rate', 'Exempt')
-            if rate in ('Exempt', 'NA', '', 'N/A'):
-                continue
-            try:
-                float(rate)
-            except:
-                continue
-            
-            slim_row = {c: row.get(c, '') for c in header}
-            rows.append(slim_row)
-    
-    return rows, header
+def raw_path(state, year):
+    return os.path.join(DATA_DIR, f"{state}_{year}_raw.csv")
 
-def process_state(state):
-    """Download new years, merge with existing slim."""
-    existing_slim = os.path.join(DATA_DIR, f"{state}_slim.csv")
+def merged_done(state):
     merged_path = os.path.join(DATA_DIR, f"{state}_slim_merged.csv")
-    
-    # Check if already merged
     if os.path.exists(merged_path) and os.path.getsize(merged_path) > 1000:
         lines = sum(1 for _ in open(merged_path)) - 1
         print(f"  {state}: already merged ({lines} rows)")
         return True
+    return False
+
+@instrument.traced("download_extra_years.process_state", fields=("state",))
+def process_state(state, paths, engine=DEFAULT_ENGINE):
+    """Merge downloaded new years with existing slim. `paths` maps year -> raw path (None if failed)."""
+    existing_slim = os.path.join(DATA_DIR, f"{state}_slim.csv")
+    merged_path = os.path.join(DATA_DIR, f"{state}_slim_merged.csv")
+    
+    sample = SlimSample(merged_path, cap=500000, seed=42, engine=engine)
     
     # Read existing 2022-2023 data
-    existing_rows = []
-    header = None
     if os.path.exists(existing_slim):
-        with open(existing_slim, 'r') as f:
-            reader = csv.DictReader(f)
-            header = reader.fieldnames
-            for row in reader:
-                existing_rows.append(row)
-        print(f"  {state}: {len(existing_rows)} existing rows from 2022-2023")
+        n = sample.add_slim(existing_slim)
+        print(f"  {state}: {n} existing rows from 2022-2023")
     
-    # Download new years
-    new_rows = []
+    # Filter new years
     for year in NEW_YEARS:
-        print(f"  {state} {year}: downloading...")
-        path = download_state_year(state, year)
+        path = paths.get(year)
         if not path:
             print(f"  {state} {year}: download failed")
             continue
         
-        rows, hdr = process_raw(path)
-        if header is None:
-            header = hdr
-        new_rows.extend(rows)
-        print(f"  {state} {year}: {len(rows)} rows")
+        n = sample.add_raw(path)
+        print(f"  {state} {year}: {n} rows")
         
         # Clean up raw
         os.remove(path)
     
-    all_rows = existing_rows + new_rows
-    if not all_rows:
+    # Sample if too large (more generous: 500K for 6 years), then write merged
+    total = sample.total
+    merged = sample.finish()
+    if not merged:
         print(f"  {state}: no data")
         return False
     
-    total = len(all_rows)
-    # Sample if too large (more generous: 500K for 6 years)
-    if total > 500000:
-        random.seed(42)
-        all_rows = random.sample(all_rows, 500000)
-    
-    # Write merged
-    with open(merged_path, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=header)
-        writer.writeheader()
-        writer.writerows(all_rows)
-    
-    print(f"  {state}: {total} total -> {len(all_rows)} merged")
-    del all_rows, existing_rows, new_rows
-    gc.collect()
+    print(f"  {state}: {total} total -> {merged} merged")
     return True
 
-print("=== Downloading HMDA 2018-2021 and merging ===")
-for state in sorted(STATES):
-    print(f"\n--- {state} ---")
-    process_state(state)
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--concurrency", type=int, default=8, help="parallel downloads")
+    ap.add_argument("--rate", type=float, default=4.0, help="max requests/sec per host")
+    ap.add_argument("--retries", type=int, default=4)
+    ap.add_argument("--timeout", type=float, default=600, help="per-file timeout (s)")
+    ap.add_argument("--base-url", default=None, help="override HMDA API base (e.g. local stand-in)")
+    ap.add_argument("--engine", choices=["rows", "arrow"], default=DEFAULT_ENGINE,
+                    help="raw CSV filter: row-by-row or columnar (pyarrow)")
+    instrument.add_arguments(ap)
+    args = ap.parse_args()
+    instrument.from_args(args)
+
+    print("=== Downloading HMDA 2018-2021 and merging ===")
+    pending = [s for s in sorted(STATES) if not merged_done(s)]
+    downloader = Downloader(concurrency=args.concurrency, rate=args.rate,
+                            retries=args.retries, timeout=args.timeout)
+    jobs = [((s, y), hmda_url(s, y, args.base_url), raw_path(s, y)) for s in pending for y in NEW_YEARS]
+    results = downloader.fetch_many(jobs)
+    for state in pending:
+        print(f"\n--- {state} ---")
+        paths = {}
+        for _ in NEW_YEARS:
+            with instrument.span("download.wait", state=state):
+                (_, year), path = next(results)
+            paths[year] = path
+        process_state(state, paths, args.engine)
+    print(f"\nDownloads: {downloader.stats.report()}")
+
+    print("\n=== Done ===")
+    merged = [f for f in os.listdir(DATA_DIR) if f.endswith('_slim_merged.csv')]
+    print(f"States with merged data: {len(merged)}")
 
-print("\n=== Done ===")
-merged = [f for f in os.listdir(DATA_DIR) if f.endswith('_slim_merged.csv')]
-print(f"States with merged data: {len(merged)}")
+if __name__ == "__main__":
+    main()
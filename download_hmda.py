@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 """Download HMDA data for all states, 2018-2023, and process into analysis-ready format."""
-import subprocess, os, csv, json, gc
-import random
+import argparse, os
+
+import instrument
+from fetch import Downloader, hmda_url
+from slim import DEFAULT_ENGINE, SlimSample
 
 DATA_DIR = "data"
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -28,121 +31,87 @@ STATE_NAMES = {
     "WY":"Wyoming"
 }
 
-KEEP_COLS = [
-    'activity_year','state_code','derived_race','derived_sex','derived_ethnicity',
-    'interest_rate','rate_spread','income','loan_amount','loan_to_value_ratio',
-    'debt_to_income_ratio','loan_type','loan_purpose','occupancy_type',
-    'property_value','applicant_age','applicant_credit_score_type',
-    'lien_status','conforming_loan_limit','total_units'
-]
-
 # Download years 2018-2023 (6 years spanning pre-COVID through post-COVID rate environment)
 YEARS = [2018, 2019, 2020, 2021, 2022, 2023]
 
-def download_state_year(state, year):
-    """Download HMDA data for a state and year."""
-    url = f"https://ffiec.cfpb.gov/v2/data-browser-api/view/csv?years={year}&states={state}&actions_taken=1"
-    outpath = os.path.join(DATA_DIR, f"{state}_{year}_raw.csv")
-    
-    if os.path.exists(outpath) and os.path.getsize(outpath) > 1000:
-        return outpath
-    
-    result = subprocess.run(
-        ["curl", "-sL", "-o", outpath, url],
-        timeout=120, capture_output=True
-    )
-    
-    if os.path.exists(outpath) and os.path.getsize(outpath) > 500:
-        return outpath
-    return None
+def raw_path(state, year):
+    return os.path.join(DATA_DIR, f"{state}_{year}_raw.csv")
 
-def process_state(state):
-    """Download, combine years, slim, sample."""
+def slim_done(state):
     slim_path = os.path.join(DATA_DIR, f"{state}_slim.csv")
     if os.path.exists(slim_path) and os.path.getsize(slim_path) > 1000:
         lines = sum(1 for _ in open(slim_path)) - 1
         print(f"  {state}: already done ({lines} rows)")
         return True
-    
-    all_rows = []
-    header = None
+    return False
+
+@instrument.traced("download_hmda.process_state", fields=("state",))
+def process_state(state, paths, engine=DEFAULT_ENGINE):
+    """Combine downloaded years, slim, sample. `paths` maps year -> raw path (None if failed)."""
+    slim_path = os.path.join(DATA_DIR, f"{state}_slim.csv")
+    sample = SlimSample(slim_path, cap=200000, seed=42, engine=engine)
     
     for year in YEARS:
-        print(f"  {state} {year}: downloading...")
-        path = download_state_year(state, year)
+        path = paths.get(year)
         if not path:
             print(f"  {state} {year}: download failed")
             continue
         
-        with open(path, 'r') as f:
-            reader = csv.DictReader(f)
-            if header is None:
-                header = [c for c in KEEP_COLS if c in reader.fieldnames]
-            
-            for row in reader:
-                # Filter: only conventional and FHA loans, primary residence, 1-unit
-                # This gives us the cleanest comparison
-                if row.get('loan_purpose') not in ('1', '31', '32'):  # home purchase or refi
-                    continue
-                if row.get('occupancy_type') != '1':  # primary residence
-                    continue
-                    
-                # Keep all races — Hispanic is in derived_ethnicity, not derived_race
-                race = row.get('derived_race', '')
-                ethnicity = row.get('derived_ethnicity', '')
-                if race not in ('White', 'Black or African American', 'Asian', 'Joint', 'Race Not Available') \
-                   and ethnicity not in ('Hispanic or Latino', 'Not Hispanic or Latino'):
-                    continue
-                
-                # Must have interest rate
-                rate = row.get('interest_rate', 'Exempt')
-                if rate in ('Exempt', 'NA', '', 'N/A'):
-                    continue
-                
-                try:
-                    float(rate)
-                except:
-                    continue
-                
-                slim_row = {c: row.get(c, '') for c in header}
-                all_rows.append(slim_row)
+        # Filter: purchase/refi, primary residence, usable race and rate (see slim.keep_row)
+        sample.add_raw(path)
         
         # Clean up raw file
         if os.path.exists(path):
             os.remove(path)
     
-    if not all_rows:
+    # Sample if too large, then write slim
+    total = sample.total
+    saved = sample.finish()
+    if not saved:
         print(f"  {state}: no valid rows")
         return False
     
-    # Sample if too large
-    total = len(all_rows)
-    if total > 200000:
-        random.seed(42)
-        all_rows = random.sample(all_rows, 200000)
-    
-    # Write slim
-    with open(slim_path, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=header)
-        writer.writeheader()
-        writer.writerows(all_rows)
-    
-    print(f"  {state}: {total} total -> {len(all_rows)} saved")
-    del all_rows
-    gc.collect()
+    print(f"  {state}: {total} total -> {saved} saved")
     return True
 
-print("=== Downloading HMDA data ===")
-for state in sorted(STATES):
-    name = STATE_NAMES.get(state, state)
-    print(f"\n--- {state} ({name}) ---")
-    process_state(state)
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--concurrency", type=int, default=8, help="parallel downloads")
+    ap.add_argument("--rate", type=float, default=4.0, help="max requests/sec per host")
+    ap.add_argument("--retries", type=int, default=4)
+    ap.add_argument("--timeout", type=float, default=120, help="per-file timeout (s)")
+    ap.add_argument("--base-url", default=None, help="override HMDA API base (e.g. local stand-in)")
+    ap.add_argument("--engine", choices=["rows", "arrow"], default=DEFAULT_ENGINE,
+                    help="raw CSV filter: row-by-row or columnar (pyarrow)")
+    instrument.add_arguments(ap)
+    args = ap.parse_args()
+    instrument.from_args(args)
+
+    print("=== Downloading HMDA data ===")
+    pending = [s for s in sorted(STATES) if not slim_done(s)]
+    downloader = Downloader(concurrency=args.concurrency, rate=args.rate,
+                            retries=args.retries, timeout=args.timeout)
+    jobs = [((s, y), hmda_url(s, y, args.base_url), raw_path(s, y)) for s in pending for y in YEARS]
+    results = downloader.fetch_many(jobs)
+    for state in pending:
+        name = STATE_NAMES.get(state, state)
+        print(f"\n--- {state} ({name}) ---")
+        paths = {}
+        for _ in YEARS:
+            with instrument.span("download.wait", state=state):
+                (_, year), path = next(results)
+            paths[year] = path
+        process_state(state, paths, args.engine)
+    print(f"\nDownloads: {downloader.stats.report()}")
+
+    # Clean up test file
+    test_file = os.path.join(DATA_DIR, "test_vt.csv")
+    if os.path.exists(test_file):
+        os.remove(test_file)
 
-# Clean up test file
-test_file = os.path.join(DATA_DIR, "test_vt.csv")
-if os.path.exists(test_file):
-    os.remove(test_file)
+    print("\n=== Done ===")
+    slims = [f for f in os.listdir(DATA_DIR) if f.endswith('_slim.csv')]
+    print(f"States with data: {len(slims)}")
 
-print("\n=== Done ===")
-slims = [f for f in os.listdir(DATA_DIR) if f.endswith('_slim.csv')]
-print(f"States with data: {len(slims)}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+"""Concurrent HMDA downloader: bounded worker pool, per-host rate limit, retry with backoff.
+
+Downloads are resumable and verified. Bytes go to `<out>.part`; an interrupted
+transfer continues from where it stopped with an HTTP Range request (If-Range
+on the ETag / Last-Modified seen when it started, so a changed file restarts
+from zero). A finished file must match the advertised length, pass the CSV
+check (an HMDA header, whole last row, at least one data row, and a first row
+of the state-year that was asked for) and, when the
+ETag is a plain MD5 as S3 serves it, that checksum; only then is it renamed
+into place. Every start, failure and completion is appended to a journal
+(data/_downloads.jsonl), so a crashed run resumes its partial files and
+trusts only files it verified.
+
+`stream` / `stream_many` skip the file: the body (gzip if the server offers
+it) is handed to a parser as a ResponseStream, resumed in place over dropped
+connections and checked the same way as it is read.
+
+Test offline against standin.py, which can drop connections mid-stream.
+"""
+import csv, hashlib, io, json, os, re, time, random, threading, zlib
+import http.client, urllib.request, urllib.error
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import instrument
+from slim import FILTER_COLS
+
+# Point at a local stand-in (standin.py) with HMDA_API_BASE=http://127.0.0.1:8000
+API_BASE = os.environ.get("HMDA_API_BASE", "https://ffiec.cfpb.gov/v2/data-browser-api")
+
+CHUNK = 1 << 20
+JOURNAL = os.path.join("data", "_downloads.jsonl")
+# A state-year extract without these is an error page or the wrong file
+REQUIRED_COLUMNS = ['activity_year', 'state_code'] + FILTER_COLS
+
+# Worth another attempt; other 4xx mean the request itself is wrong
+RETRY_STATUS = {408, 425, 429, 500, 502, 503, 504}
+MD5_ETAG = re.compile(r'^(?:W/)?"?([0-9a-f]{32})"?$')
+
+
+def hmda_url(state, year, base=None):
+    return f"{base or API_BASE}/view/csv?years={year}&states={state}&actions_taken=1"
+
+
+def expected(url):
+    """{"state_code", "activity_year"} an hmda_url's rows must have, or None
+    for URLs that don't ask for a single state-year."""
+    q = parse_qs(urlsplit(url).query)
+    states, years = q.get("states", [""])[0].split(","), q.get("years", [""])[0].split(",")
+    if len(states) != 1 or len(years) != 1 or not states[0] or not years[0]:
+        return None
+    return {"state_code": states[0], "activity_year": years[0]}
+
+
+class FetchError(Exception):
+    def __init__(self, msg, retryable=True, discard=False):
+        super().__init__(msg)
+        self.retryable = retryable
+        self.discard = discard  # the partial file is bad; don't resume from it
+
+
+class CSVCheck:
+    """check_csv one buffer at a time, for bytes that never reach a file. The
+    header and first row are checked as soon as their lines have arrived."""
+
+    def __init__(self, required=REQUIRED_COLUMNS, expect=None):
+        self.required = required
+        self.expect = expect
+        self.sha, self.md5 = hashlib.sha256(), hashlib.md5()
+        self.head, self.tail, self.newlines, self.size = b"", b"", 0, 0
+        self.header = None
+        self.first = expect is None  # first data row checked (or nothing to check)
+
+    def feed(self, buf):
+        if self.header is None or not self.first:
+            self.head = (self.head + buf[:131072])[:131072]
+            if self.header is None and (b"\n" in self.head or len(self.head) >= 65536):
+                self.header = self._header()
+            if not self.first and self.header is not None and \
+                    (self.head.count(b"\n") >= 2 or len(self.head) >= 131072):
+                self._first_row()
+        self.tail = (self.tail + buf)[-65536:]
+        self.sha.update(buf)
+        self.md5.update(buf)
+        self.newlines += buf.count(b"\n")
+        self.size += len(buf)
+
+    def _header(self):
+        first = self.head.split(b"\n", 1)[0].decode("utf-8", "replace").strip()
+        if first.lstrip().startswith("<"):
+            raise FetchError("got an HTML page, not CSV", discard=True)
+        header = next(csv.reader([first]), [])
+        missing = [c for c in self.required if c not in header]
+        if missing:
+            raise FetchError(f"header lacks {', '.join(missing)}", discard=True)
+        return header
+
+    def _first_row(self):
+        """The first data row must be the state-year asked for: anything else is
+        some other file (or another server answering on the port)."""
+        self.first = True
+        line = self.head.split(b"\n", 2)[1].strip() if self.head.count(b"\n") else b""
+        if not line:
+            return  # no data rows: finish() says so
+        row = dict(zip(self.header, next(csv.reader([line.decode("utf-8", "replace")]), [])))
+        got = {k: row.get(k, "") for k in self.expect}
+        if got != self.expect:
+            raise FetchError(f"rows are for {' '.join(got.values())}, not "
+                             f"{' '.join(self.expect.values())}", discard=True)
+
+    def finish(self):
+        """Whole-file checks; returns {"size", "rows", "sha256", "md5"}."""
+        if self.header is None:
+            self.header = self._header()
+        header = self.header
+        if not self.first:
+            self._first_row()
+        rows = self.newlines - 1 if self.tail.endswith(b"\n") else self.newlines
+        if rows < 1:
+            raise FetchError("no data rows", discard=True)
+        last = self.tail.rstrip(b"\r\n").rsplit(b"\n", 1)[-1].decode("utf-8", "replace")
+        fields = next(csv.reader([last]), [])
+        if len(fields) != len(header):
+            raise FetchError(f"last row has {len(fields)} of {len(header)} fields (truncated)",
+                             discard=True)
+        return {"size": self.size, "rows": rows, "sha256": self.sha.hexdigest(),
+                "md5": self.md5.hexdigest()}
+
+
+def check_csv(path, required=REQUIRED_COLUMNS, expect=None):
+    """Verify a downloaded extract in one pass: CSV header with the required
+    columns, first row's values as in `expect` (see expected()), last row
+    complete (as many fields as the header). Returns {"size", "rows",
+    "sha256", "md5"}; raises FetchError."""
+    check = CSVCheck(required, expect)
+    with open(path, "rb") as f:
+        for buf in iter(lambda: f.read(CHUNK), b""):
+            check.feed(buf)
+    return check.finish()
+
+
+class ResponseStream(io.RawIOBase):
+    """The body of a GET as a readable binary stream, so it can be parsed as it
+    arrives instead of being saved first.
+
+    Asks for gzip and inflates it when the server sends it. A dropped connection
+    is reopened with a Range from the bytes already received (If-Range on the
+    ETag / Last-Modified), so the reader never sees the seam. The body gets the
+    same checks as a downloaded file (length, CSVCheck, MD5 ETag), and a failure
+    is raised from read(), so a reader can't finish on a bad body. Once the
+    body has been read to the end, `info` holds CSVCheck's fields for the
+    decoded bytes plus "wire", the bytes transferred.
+    """
+
+    def __init__(self, url, downloader, check=CSVCheck):
+        self.url = url
+        self.dl = downloader
+        self.check = check(expect=expected(url)) if check else None
+        self.received = 0  # body bytes off the wire, compressed if gzip
+        self.total = self.etag = self.validator = None
+        self.inflate = None
+        self.resumes = 0
+        self.info = None
+        self.deadline = time.monotonic() + downloader.timeout
+        self._wire_md5 = hashlib.md5()
+        self._buf, self._pos = b"", 0
+        self._resp = self._open()
+
+    def readable(self):
+        return True
+
+    def _open(self):
+        headers = {"User-Agent": "same-loan/1.0", "Accept-Encoding": "gzip"}
+        if self.received:
+            headers["Range"] = f"bytes={self.received}-"
+            if self.validator:
+                headers["If-Range"] = self.validator
+        self.dl.limiter.wait(self.url)
+        try:
+            resp = urllib.request.urlopen(urllib.request.Request(self.url, headers=headers),
+                                          timeout=min(self.dl.timeout, 120))
+        except urllib.error.HTTPError as e:
+            raise FetchError(f"HTTP {e.code}", retryable=e.code in RETRY_STATUS)
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+            raise FetchError(str(getattr(e, "reason", e)) or type(e).__name__)
+        if self.received:
+            m = re.match(r"bytes (\d+)-\d+/(\d+|\*)", resp.headers.get("Content-Range", ""))
+            if resp.status != 206 or not m or int(m.group(1)) != self.received or \
+                    (m.group(2) != "*" and int(m.group(2)) != self.total):
+                resp.close()
+                raise FetchError("server would not resume the stream")
+            self.dl.stats.resume(self.received)
+            return resp
+        length = resp.headers.get("Content-Length")
+        self.total = int(length) if length else None
+        self.etag = resp.headers.get("ETag")
+        self.validator = self.etag or resp.headers.get("Last-Modified")
+        encoding = resp.headers.get("Content-Encoding", "identity").lower()
+        if encoding == "gzip":
+            self.inflate = zlib.decompressobj(32 + zlib.MAX_WBITS)
+        elif encoding != "identity":
+            resp.close()
+            raise FetchError(f"unsupported Content-Encoding {encoding}", retryable=False)
+        return resp
+
+    def _wire(self):
+        """The next chunk off the wire, reopening after a drop; b"" at the end."""
+        while True:
+            if time.monotonic() > self.deadline:
+                raise FetchError(f"timed out after {self.dl.timeout}s")
+            try:
+                buf = self._resp.read(CHUNK)
+                if buf or self.total is None or self.received == self.total:
+                    break
+                error = f"closed at {self.received:,} of {self.total:,} bytes"
+            except (http.client.HTTPException, OSError) as e:
+                error = str(e) or type(e).__name__
+            self._resp.close()
+            if self.total is None or self.resumes >= self.dl.retries:
+                raise FetchError(f"stream broke: {error}")
+            self.resumes += 1
+            time.sleep(self.dl.backoff * random.uniform(0.05, 0.15))
+            self._resp = self._open()
+        self.received += len(buf)
+        self._wire_md5.update(buf)
+        return buf
+
+    def _decode(self, wire):
+        out = []
+        while wire:
+            if self.inflate.eof:  # concatenated gzip members
+                self.inflate = zlib.decompressobj(32 + zlib.MAX_WBITS)
+            out.append(self.inflate.decompress(wire))
+            wire = self.inflate.unused_data
+        return b"".join(out)
+
+    def _fill(self):
+        wire = self._wire()
+        data = self._decode(wire) if self.inflate and wire else wire
+        if not wire and self.inflate:
+            data = self.inflate.flush()
+            if not self.inflate.eof:
+                raise FetchError("gzip body ends early", discard=True)
+        if self.check and data:
+            self.check.feed(data)
+        if not wire:
+            self.info = self.check.finish() if self.check else {}
+            m = MD5_ETAG.match(self.etag or "")
+            # S3 hashes the stored bytes; a server compressing on the fly keeps the plain ETag
+            if m and m.group(1) not in (self._wire_md5.hexdigest(), self.info.get("md5")):
+                raise FetchError("MD5 does not match the ETag", discard=True)
+            self.info["wire"] = self.received
+        return data
+
+    def readinto(self, b):
+        while self._pos >= len(self._buf):
+            if self.info is not None:
+                return 0
+            self._buf, self._pos = self._fill(), 0
+        n = min(len(b), len(self._buf) - self._pos)
+        b[:n] = self._buf[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def drain(self):
+        """Read (and check) whatever the reader left unread."""
+        while self.info is None:
+            self._buf, self._pos = self._fill(), 0
+
+    def close(self):
+        if self._resp is not None:
+            self._resp.close()
+        super().close()
+
+
+class Journal:
+    """Append-only JSONL log of download events. A path's state is its last
+    'started' event with any later events' fields merged in."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        lines = 0
+        try:
+            with open(path) as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:  # torn last line from a crash
+                        continue
+                    lines += 1
+                    self._apply(event)
+        except FileNotFoundError:
+            pass
+        if lines > 2 * len(self.entries) + 100:
+            self._compact()
+
+    def _apply(self, event):
+        if event["event"] == "started" or event["path"] not in self.entries:
+            self.entries[event["path"]] = dict(event)
+        else:
+            self.entries[event["path"]].update(event)
+
+    def _compact(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp, self.path)
+
+    def get(self, path):
+        with self.lock:
+            entry = self.entries.get(path)
+            return dict(entry) if entry else None
+
+    def record(self, path, event, **fields):
+        entry = {"path": path, "event": event, "at": round(time.time(), 3), **fields}
+        with self.lock:
+            self._apply(entry)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+
+class HostRateLimiter:
+    """Space out request starts so no host sees more than `rate` requests per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = {}
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class FetchStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.files = 0
+        self.bytes = 0
+        self.failed = 0
+        self.retries = 0
+        self.resumed = 0
+        self.resumed_bytes = 0
+        self.rejected = 0
+        self.started = time.monotonic()
+
+    def add(self, nbytes=0, ok=True, retries=0):
+        with self.lock:
+            if ok:
+                self.files += 1
+                self.bytes += nbytes
+            else:
+                self.failed += 1
+            self.retries += retries
+
+    def resume(self, nbytes):
+        with self.lock:
+            self.resumed += 1
+            self.resumed_bytes += nbytes
+
+    def reject(self):
+        with self.lock:
+            self.rejected += 1
+
+    def report(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        mb = self.bytes / 1e6
+        return (f"{self.files} files, {mb:,.1f} MB in {elapsed:.1f}s "
+                f"({mb / elapsed:.2f} MB/s, {self.files / elapsed:.2f} files/s), "
+                f"{self.failed} failed, {self.retries} retries, {self.resumed} resumed "
+                f"({self.resumed_bytes / 1e6:,.1f} MB not re-fetched), {self.rejected} rejected")
+
+
+class Downloader:
+    """Thread-pool downloader.
+
+    `fetch_many` keeps at most `concurrency + lookahead` files in flight and yields
+    results in submission order, so callers can consume one state at a time while
+    later state-years are already downloading.
+    """
+
+    def __init__(self, concurrency=8, rate=4.0, retries=4, backoff=2.0, timeout=600,
+                 journal=JOURNAL, check=check_csv):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(rate)
+        self.stats = FetchStats()
+        self.journal = Journal(journal)
+        self.check = check
+
+    def _request(self, url, part, outpath):
+        """Open url, resuming `part` if the journal says how. Returns (response,
+        bytes already in part that the response continues from, total size or None)."""
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        prev = self.journal.get(outpath) if offset else None
+        headers = {"User-Agent": "same-loan/1.0"}
+        resumable = prev and prev.get("url") == url and prev.get("total")
+        if resumable:
+            headers["Range"] = f"bytes={offset}-"
+            if prev.get("etag") or prev.get("last_modified"):
+                headers["If-Range"] = prev.get("etag") or prev["last_modified"]
+        try:
+            resp = urllib.request.urlopen(urllib.request.Request(url, headers=headers),
+                                          timeout=min(self.timeout, 120))
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and resumable and offset == prev["total"]:
+                return None, offset, offset  # already have every byte
+            raise FetchError(f"HTTP {e.code}", retryable=e.code in RETRY_STATUS, discard=e.code == 416)
+        if resp.status == 206:
+            m = re.match(r"bytes (\d+)-\d+/(\d+|\*)", resp.headers.get("Content-Range", ""))
+            if not m or int(m.group(1)) != offset or (m.group(2) != "*" and int(m.group(2)) != prev["total"]):
+                resp.close()
+                raise FetchError("server resumed at the wrong place", discard=True)
+            return resp, offset, prev["total"]
+        length = resp.headers.get("Content-Length")
+        return resp, 0, int(length) if length else None
+
+    def _get(self, url, outpath):
+        """One attempt. Returns bytes transferred; raises FetchError."""
+        deadline = time.monotonic() + self.timeout
+        part = outpath + ".part"
+        self.limiter.wait(url)
+        try:
+            resp, offset, total = self._request(url, part, outpath)
+            n = 0
+            if resp is not None:
+                with resp:
+                    if offset:
+                        self.stats.resume(offset)
+                    else:
+                        self.journal.record(outpath, "started", url=url, total=total,
+                                            etag=resp.headers.get("ETag"),
+                                            last_modified=resp.headers.get("Last-Modified"))
+                    with open(part, "ab" if offset else "wb") as out:
+                        while True:
+                            buf = resp.read(CHUNK)
+                            if not buf:
+                                break
+                            out.write(buf)
+                            n += len(buf)
+                            if time.monotonic() > deadline:
+                                raise FetchError(f"timed out after {self.timeout}s")
+        except urllib.error.HTTPError as e:
+            raise FetchError(f"HTTP {e.code}", retryable=e.code in RETRY_STATUS)
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+            raise FetchError(str(getattr(e, "reason", e)) or type(e).__name__)
+
+        size = os.path.getsize(part)
+        if total is not None and size != total:
+            raise FetchError(f"got {size:,} of {total:,} bytes", discard=size > total)
+        try:
+            info = self.check(part, expect=expected(url))
+        except FetchError as e:
+            e.discard = True
+            raise
+        etag = self.journal.get(outpath).get("etag") or ""
+        m = MD5_ETAG.match(etag)
+        if m and "md5" in info and m.group(1) != info["md5"]:
+            raise FetchError("MD5 does not match the ETag", discard=True)
+        os.replace(part, outpath)
+        self.journal.record(outpath, "complete", size=size, rows=info.get("rows"),
+                            sha256=info.get("sha256"))
+        return n
+
+    def verified(self, outpath, url=None):
+        """True if outpath is a file this journal recorded as complete, or an
+        unrecorded one (from before the journal) that passes the check."""
+        if not os.path.exists(outpath):
+            return False
+        entry = self.journal.get(outpath)
+        if entry and entry["event"] == "complete":
+            return entry.get("size") == os.path.getsize(outpath)
+        try:
+            info = self.check(outpath, expect=url and expected(url))
+        except FetchError as e:
+            print(f"  {os.path.basename(outpath)}: existing file rejected ({e})")
+            return False
+        self.journal.record(outpath, "complete", size=info["size"], rows=info["rows"],
+                            sha256=info["sha256"])
+        return True
+
+    @instrument.traced("fetch.fetch", fields=("outpath",))
+    def fetch(self, url, outpath):
+        """Download url to outpath with retries. Returns outpath, or None on failure."""
+        if self.verified(outpath, url):
+            return outpath
+        if os.path.exists(outpath):
+            os.remove(outpath)
+        for attempt in range(self.retries + 1):
+            try:
+                n = self._get(url, outpath)
+                self.stats.add(n, retries=attempt)
+                return outpath
+            except FetchError as e:
+                part = outpath + ".part"
+                if e.discard:
+                    self.stats.reject()
+                    if os.path.exists(part):
+                        os.remove(part)
+                self.journal.record(outpath, "failed", error=str(e),
+                                    partial=os.path.getsize(part) if os.path.exists(part) else 0)
+                if not e.retryable or attempt == self.retries:
+                    print(f"  {os.path.basename(outpath)}: {e}")
+                    self.stats.add(ok=False, retries=attempt)
+                    return None
+                time.sleep(self.backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+
+    @instrument.traced("fetch.stream", fields=("url",))
+    def stream(self, url, consume):
+        """Feed url's body to consume(binary stream) without saving it. The body
+        resumes over dropped connections; when it can't, or fails its checks,
+        consume runs again on a fresh one. Returns (consume's result,
+        ResponseStream.info), or None on failure."""
+        for attempt in range(self.retries + 1):
+            body = None
+            try:
+                body = ResponseStream(url, self, self.check and CSVCheck)
+                result = consume(io.BufferedReader(body, CHUNK))
+                body.drain()
+                self.stats.add(body.received, retries=attempt)
+                return result, body.info
+            except FetchError as e:
+                if e.discard:
+                    self.stats.reject()
+                if not e.retryable or attempt == self.retries:
+                    print(f"  {url}: {e}")
+                    self.stats.add(ok=False, retries=attempt)
+                    return None
+            finally:
+                if body is not None:
+                    body.close()
+            time.sleep(self.backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+
+    def _in_order(self, calls, lookahead):
+        """calls: iterable of (key, fn, *args), run on the pool with at most
+        `concurrency + lookahead` in flight. Yields (key, result) in order."""
+        lookahead = self.concurrency if lookahead is None else lookahead
+        calls = iter(calls)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            def submit():
+                for key, fn, *args in calls:
+                    pending.append((key, pool.submit(fn, *args)))
+                    return True
+                return False
+
+            while len(pending) < self.concurrency + lookahead and submit():
+                pass
+            while pending:
+                key, fut = pending.popleft()
+                submit()
+                yield key, fut.result()
+
+    def fetch_many(self, jobs, lookahead=None):
+        """jobs: iterable of (key, url, outpath). Yields (key, path or None) in order."""
+        return self._in_order(((key, self.fetch, url, outpath) for key, url, outpath in jobs),
+                              lookahead)
+
+    def stream_many(self, jobs, consume=None, lookahead=None):
+        """jobs: iterable of (key, url) or (key, url, consume), the latter overriding
+        `consume` for that job. Yields (key, stream(url, consume)) in order."""
+        return self._in_order(((job[0], self.stream, job[1], job[2] if len(job) > 2 else consume)
+                               for job in jobs), lookahead)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Ingest HMDA state-years straight into the Parquet store, one partition at a time.
+
+Each (state, year) is downloaded, filtered, sampled to --cap rows and written as
+its own store partition; the store manifest records the raw file's checksum and
+row count (0 for a state-year with no usable rows, so it is not fetched again).
+Each partition's reservoir is seeded from its (state, year). Nothing else in the store is read or rewritten, so adding a year or
+refreshing one re-published state-year only touches those partitions.
+
+  python ingest.py --years 2024                        # add a new year
+  python ingest.py --states CA --years 2021 --force    # re-check a re-published file
+
+--stream parses each response as it arrives (fetch.ResponseStream), so the
+multi-GB raw file is never written and read back; the manifest checksum is of
+the same decoded bytes, so streamed and downloaded partitions compare equal.
+bench_stream.py times the two paths against each other.
+"""
+import argparse, io, os, shutil
+
+import cache, instrument, store
+from download_hmda import STATES, YEARS
+from fetch import Downloader, hmda_url
+from slim import DEFAULT_ENGINE, SlimSample
+
+DATA_DIR = "data"
+PARTITION_CAP = 100000  # ~ the old 500K-per-6-years merged cap, per state-year
+
+
+def raw_path(state, year):
+    return os.path.join(DATA_DIR, f"{state}_{year}_raw.csv")
+
+
+def partition_seed(state, year):
+    """Reservoir seed for one partition: stable across runs, distinct across partitions."""
+    return int(cache.digest(42, state, year)[:8], 16)
+
+
+@instrument.traced("ingest.partition", fields=("state", "year"))
+def ingest_partition(state, year, path, manifest, cap=PARTITION_CAP, engine=DEFAULT_ENGINE):
+    """Filter/sample one raw file into its partition. Returns 'unchanged', 'empty' or 'written'."""
+    digest = store.sha256_file(path)
+    entry = store.partition_entry(manifest, state, year)
+    if entry and entry["source_sha256"] == digest:
+        return "unchanged"
+
+    sample = SlimSample(None, cap=cap, seed=partition_seed(state, year), engine=engine)
+    sample.add_raw(path)
+    return store_sample(state, year, sample, manifest, digest)
+
+
+@instrument.traced("ingest.store_sample", fields=("state", "year"))
+def store_sample(state, year, sample, manifest, digest):
+    """Write a filtered sample as the (state, year) partition. Returns 'empty' or 'written'.
+
+    An empty sample is recorded with rows=0 (and any old partition removed) so the
+    next run skips it like any other ingested state-year."""
+    if not len(sample.reservoir):
+        shutil.rmtree(store.partition_dir(state, year), ignore_errors=True)
+        store.record_partition(manifest, state, year, 0,
+                               os.path.basename(raw_path(state, year)), digest)
+        store.save_manifest(manifest)
+        return "empty"
+    table = store.typed_table(store.read_slim_csv(
+        io.BytesIO(sample.text().encode()), header=sample.header))
+    store.write_partition(table, state, year)
+    store.record_partition(manifest, state, year, table.num_rows,
+                           os.path.basename(raw_path(state, year)), digest)
+    store.save_manifest(manifest)
+    print(f"  {state} {year}: {sample.total} kept -> {table.num_rows} in store")
+    return "written"
+
+
+def sampler(state, year, cap=PARTITION_CAP, engine=DEFAULT_ENGINE):
+    """Downloader.stream consumer: filter a (state, year) raw body into a fresh SlimSample."""
+    def consume(body):
+        sample = SlimSample(None, cap=cap, seed=partition_seed(state, year), engine=engine)
+        sample.add_raw(body)
+        return sample
+    return consume
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--states", nargs="+", default=STATES)
+    ap.add_argument("--years", nargs="+", type=int, default=YEARS)
+    ap.add_argument("--force", action="store_true",
+                    help="re-download partitions already in the manifest (rewritten only if changed)")
+    ap.add_argument("--cap", type=int, default=PARTITION_CAP, help="max rows per state-year")
+    ap.add_argument("--engine", choices=["rows", "arrow"], default=DEFAULT_ENGINE)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--rate", type=float, default=4.0)
+    ap.add_argument("--timeout", type=float, default=600)
+    ap.add_argument("--base-url", default=None)
+    ap.add_argument("--stream", action="store_true",
+                    help="filter each response as it arrives instead of saving the raw file first")
+    instrument.add_arguments(ap)
+    args = ap.parse_args()
+    instrument.from_args(args)
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    manifest = store.load_manifest()
+    todo = [(s, y) for s in sorted(args.states) for y in args.years
+            if args.force or not store.partition_entry(manifest, s, y)]
+    print(f"=== Ingesting {len(todo)} state-years ===")
+
+    downloader = Downloader(concurrency=args.concurrency, rate=args.rate, timeout=args.timeout)
+    outcome = {}
+    if args.stream:
+        # One SlimSample per worker, so no read-ahead beyond the workers
+        jobs = [((s, y), hmda_url(s, y, args.base_url), sampler(s, y, args.cap, args.engine))
+                for s, y in todo]
+        raw_bytes = 0
+        for (state, year), got in downloader.stream_many(jobs, lookahead=0):
+            if not got:
+                print(f"  {state} {year}: download failed")
+                outcome[(state, year)] = "failed"
+                continue
+            sample, info = got
+            raw_bytes += info["size"]
+            entry = store.partition_entry(manifest, state, year)
+            if entry and entry["source_sha256"] == info["sha256"]:
+                outcome[(state, year)] = "unchanged"
+            else:
+                outcome[(state, year)] = store_sample(state, year, sample, manifest, info["sha256"])
+        print(f"\nStreamed {raw_bytes / 1e6:,.1f} MB of raw CSV without writing it to disk "
+              f"(or reading it back): {2 * raw_bytes / 1e6:,.1f} MB of disk I/O saved")
+    else:
+        jobs = [((s, y), hmda_url(s, y, args.base_url), raw_path(s, y)) for s, y in todo]
+        for (state, year), path in downloader.fetch_many(jobs):
+            if not path:
+                print(f"  {state} {year}: download failed")
+                outcome[(state, year)] = "failed"
+                continue
+            outcome[(state, year)] = ingest_partition(state, year, path, manifest, args.cap, args.engine)
+            os.remove(path)
+
+    print(f"\nDownloads: {downloader.stats.report()}")
+    for status in ("written", "unchanged", "empty", "failed"):
+        keys = [f"{s}/{y}" for (s, y), o in outcome.items() if o == status]
+        if keys:
+            more = " ..." if len(keys) > 10 else ""
+            print(f"  {status}: {len(keys)} ({', '.join(keys[:10])}{more})")
+    changed = sorted({s for (s, _), o in outcome.items() if o == "written"})
+    if changed:
+        print(f"States to rebuild: {' '.join(changed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""Opt-in tracing of the hot stages: wall and CPU time, rows/s and memory.
+
+Off by default, when `span`, `traced`, `iterate` and `count` cost a flag
+check. Switched on by HMDA_TRACE or a script's --trace flag:
+
+  HMDA_TRACE=1 python build_precomputed.py      # JSON trace
+  HMDA_TRACE=chrome python regression.py        # plus chrome://tracing / ui.perfetto.dev format
+  HMDA_TRACE_MEMORY=1 ...                       # tracemalloc peak per span (slows Python-heavy code)
+
+A span records wall and CPU seconds, rows and rows/s where the code knows
+them, RSS at its end and the change across it, and the process's peak RSS so
+far. Spans nest per thread; tracemalloc peaks are process-wide. Spans in
+worker processes (--jobs) go to part files that the main process folds into
+its own trace. At exit the trace goes to data/traces/<script>-<time>.json
+(HMDA_TRACE_DIR to change), with a per-name summary that is also printed.
+
+    @instrument.traced("regression.load_data", rows=len)
+    def load_data(): ...
+
+    with instrument.span("design.dummies", rows=len(df)):
+        ...
+"""
+import atexit, functools, glob, inspect, json, os, sys, threading, time, tracemalloc
+import multiprocessing.util
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
+ENV, ENV_MEMORY, ENV_DIR, ENV_RUN = "HMDA_TRACE", "HMDA_TRACE_MEMORY", "HMDA_TRACE_DIR", "HMDA_TRACE_RUN"
+PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+_on = False
+_memory = _chrome = False
+_dir = _run = None
+_started = 0.0
+_events = []
+_local = threading.local()
+
+
+def _rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE / 2 ** 20
+    except OSError:
+        return _peak_mb()
+
+
+def _peak_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+def _record(name, ts, seconds, cpu, rss0, parent, rows, fields, **extra):
+    rss = _rss_mb()
+    event = {"name": name, "ts": ts, "seconds": round(seconds, 6), "cpu_s": round(cpu, 6),
+             "depth": len(_stack()), "parent": parent.name if parent else None,
+             "pid": os.getpid(), "tid": threading.get_ident(), "thread": threading.current_thread().name,
+             "rss_mb": round(rss, 1), "rss_delta_mb": round(rss - rss0, 1)}
+    peak = _peak_mb()
+    if peak is not None:
+        event["peak_rss_mb"] = round(peak, 1)
+    if rows is not None:
+        event["rows"] = rows
+        event["rows_per_s"] = round(rows / seconds) if seconds else None
+    if fields:
+        event["fields"] = fields
+    event.update(extra)
+    _events.append(event)
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class Span:
+    """One timed region; use through span() or traced()."""
+
+    def __init__(self, name, rows=None, fields=None):
+        self.name, self.rows, self.fields = name, rows, fields or {}
+        self.peak = 0
+
+    def add(self, rows):
+        """Count rows processed inside the span (for rows/s)."""
+        self.rows = (self.rows or 0) + rows
+
+    def __enter__(self):
+        stack = _stack()
+        self.parent = stack[-1] if stack else None
+        stack.append(self)
+        if _memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.parent:
+                self.parent.peak = max(self.parent.peak, peak)
+            tracemalloc.reset_peak()
+            self.peak = current
+        self.rss = _rss_mb()
+        self.ts = time.time()
+        self.cpu = time.thread_time()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, kind, exc, tb):
+        seconds = time.perf_counter() - self.t0
+        cpu = time.thread_time() - self.cpu
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        extra = {}
+        if _memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            if self.parent:
+                self.parent.peak = max(self.parent.peak, self.peak)
+            tracemalloc.reset_peak()
+            extra["traced_peak_mb"] = round(self.peak / 2 ** 20, 1)
+        if kind is not None:
+            extra["error"] = kind.__name__
+        _record(self.name, self.ts, seconds, cpu, self.rss, self.parent, self.rows, self.fields, **extra)
+        return False
+
+
+class _Off:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add(self, rows):
+        pass
+
+
+OFF = _Off()
+
+
+def enabled():
+    return _on
+
+
+def span(name, rows=None, **fields):
+    """Context manager timing a region (a no-op object when tracing is off)."""
+    return Span(name, rows, fields) if _on else OFF
+
+
+def count(rows):
+    """Add rows to this thread's innermost open span."""
+    if _on:
+        stack = _stack()
+        if stack:
+            stack[-1].add(rows)
+
+
+def traced(name=None, rows=None, fields=()):
+    """Decorator: each call runs in a span. `rows(result)` gives its row count;
+    `fields` names arguments recorded with it (e.g. the state)."""
+    def wrap(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+        sig = inspect.signature(fn) if fields else None
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not _on:
+                return fn(*args, **kwargs)
+            extra = {}
+            if sig:
+                bound = sig.bind_partial(*args, **kwargs).arguments
+                extra = {k: bound[k] for k in fields if k in bound}
+            with Span(label, None, extra) as s:
+                result = fn(*args, **kwargs)
+                if rows is not None and result is not None:
+                    s.rows = rows(result)
+            return result
+        return inner
+    return wrap
+
+
+def iterate(name, iterable, rows=None, **fields):
+    """Yield from `iterable`, timing only the time spent producing items (e.g.
+    reading CSV chunks), as one span; `rows(item)` counts rows per item."""
+    if not _on:
+        return iterable
+    return _iterate(name, iterable, rows, fields)
+
+
+def _iterate(name, iterable, rows, fields):
+    it = iter(iterable)
+    n = 0 if rows else None
+    seconds = cpu = 0.0
+    ts, rss0 = time.time(), _rss_mb()
+    try:
+        while True:
+            t0, c0 = time.perf_counter(), time.thread_time()
+            try:
+                item = next(it)
+            except StopIteration:
+                break
+            finally:
+                seconds += time.perf_counter() - t0
+                cpu += time.thread_time() - c0
+            if rows:
+                n += rows(item)
+            yield item
+    finally:
+        stack = _stack()
+        _record(name, ts, seconds, cpu, rss0, stack[-1] if stack else None, n, fields, iterator=True)
+
+
+def enable(chrome=False, memory=False, out_dir=None):
+    """Start tracing this process, and (through the environment) the worker
+    processes it spawns. The trace is written at exit."""
+    global _on, _memory, _chrome, _dir, _run, _started
+    if _on:
+        return
+    _on, _memory, _chrome = True, memory, chrome
+    _dir = os.path.abspath(out_dir or os.environ.get(ENV_DIR) or os.path.join("data", "traces"))
+    _started = time.time()
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if os.environ.get(ENV_RUN):
+        # A worker (or child script) of a traced run: spawn imports modules before
+        # parent_process() is set, so the inherited run name is what tells. Pool
+        # workers leave through os._exit, which skips plain atexit handlers.
+        _run = os.environ[ENV_RUN]
+        multiprocessing.util.Finalize(None, _dump_part, exitpriority=100)
+        return
+    script = os.path.splitext(os.path.basename(sys.argv[0]))[0].strip("-") or "python"
+    _run = f"{script}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    os.environ.update({ENV: "chrome" if chrome else "1", ENV_DIR: _dir, ENV_RUN: _run})
+    if memory:
+        os.environ[ENV_MEMORY] = "1"
+    atexit.register(_dump)
+
+
+def add_arguments(ap):
+    ap.add_argument("--trace", nargs="?", const="json", choices=["json", "chrome"],
+                    help=f"write a timing/memory trace to data/traces/ (or {ENV}=1|chrome); "
+                         "'chrome' adds a chrome://tracing file")
+    ap.add_argument("--trace-memory", action="store_true",
+                    help="trace with tracemalloc peaks per span (slower)")
+
+
+def from_args(args):
+    if args.trace or args.trace_memory:
+        enable(chrome=args.trace == "chrome", memory=args.trace_memory)
+
+
+def _dump_part():
+    if not _events or not _run:
+        return
+    os.makedirs(_dir, exist_ok=True)
+    with open(os.path.join(_dir, f"{_run}.{os.getpid()}-{time.time_ns()}.part.json"), "w") as f:
+        json.dump(_events, f)
+
+
+def summarize(events):
+    """Per span name: calls, total and CPU seconds, rows, rows/s, largest peaks."""
+    out = {}
+    for e in events:
+        s = out.setdefault(e["name"], {"calls": 0, "seconds": 0.0, "cpu_s": 0.0})
+        s["calls"] += 1
+        s["seconds"] += e["seconds"]
+        s["cpu_s"] += e["cpu_s"]
+        if "rows" in e:
+            s["rows"] = s.get("rows", 0) + e["rows"]
+        for k in ("peak_rss_mb", "traced_peak_mb"):
+            if e.get(k) is not None:
+                s[k] = max(s.get(k, 0), e[k])
+    for s in out.values():
+        s["seconds"], s["cpu_s"] = round(s["seconds"], 4), round(s["cpu_s"], 4)
+        if "rows" in s:
+            s["rows_per_s"] = round(s["rows"] / s["seconds"]) if s["seconds"] else None
+    return out
+
+
+def chrome_trace(events, started, script):
+    """Events as Chrome trace-event JSON: complete ('X') events plus an RSS counter."""
+    out = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"{script} ({pid})"}}
+           for pid in sorted({e["pid"] for e in events})]
+    for e in events:
+        ts = (e["ts"] - started) * 1e6
+        args = {k: e[k] for k in ("rows", "rows_per_s", "cpu_s", "rss_mb", "rss_delta_mb",
+                                  "peak_rss_mb", "traced_peak_mb") if e.get(k) is not None}
+        args.update(e.get("fields", {}))
+        out.append({"name": e["name"], "cat": "iterator" if e.get("iterator") else "span", "ph": "X",
+                    "ts": round(ts, 1), "dur": round(e["seconds"] * 1e6, 1),
+                    "pid": e["pid"], "tid": e["tid"], "args": args})
+        out.append({"name": "rss_mb", "ph": "C", "pid": e["pid"], "ts": round(ts + e["seconds"] * 1e6, 1),
+                    "args": {"rss_mb": e["rss_mb"]}})
+    return {"traceEvents": out, "displayTimeUnit": "ms"}
+
+
+def _dump():
+    events = list(_events)
+    for part in glob.glob(os.path.join(_dir, f"{glob.escape(_run)}.*.part.json")):
+        with open(part) as f:
+            events += json.load(f)
+        os.remove(part)
+    if not events:
+        return
+    events.sort(key=lambda e: e["ts"])
+    script = _run.rsplit("-", 3)[0]
+    summary = summarize(events)
+    for e in events:
+        e["start_s"] = round(e["ts"] - _started, 6)
+    trace = {"script": script, "argv": sys.argv, "pid": os.getpid(),
+             "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(_started)),
+             "wall_s": round(time.time() - _started, 3), "peak_rss_mb": _peak_mb(),
+             "memory_tracing": _memory, "summary": summary,
+             "spans": [{k: v for k, v in e.items() if k not in ("ts", "tid")} for e in events]}
+    os.makedirs(_dir, exist_ok=True)
+    path = os.path.join(_dir, _run + ".json")
+    with open(path, "w") as f:
+        json.dump(trace, f, indent=1, default=str)
+    written = [path]
+    if _chrome:
+        written.append(os.path.join(_dir, _run + ".trace.json"))
+        with open(written[-1], "w") as f:
+            json.dump(chrome_trace(events, _started, script), f, default=str)
+
+    err = sys.stderr
+    print(f"\nTrace ({len(events)} spans, {trace['wall_s']:.1f}s): {', '.join(written)}", file=err)
+    for name, s in sorted(summary.items(), key=lambda kv: -kv[1]["seconds"])[:15]:
+        rate = f"{s['rows_per_s']:>12,}/s" if s.get("rows_per_s") else " " * 14
+        mem = f"  traced {s['traced_peak_mb']:,.0f} MB" if "traced_peak_mb" in s else ""
+        print(f"  {name:34s} {s['calls']:5d}x {s['seconds']:9.3f}s  cpu {s['cpu_s']:9.3f}s {rate}"
+              f"  rss {s.get('peak_rss_mb') or 0:,.0f} MB{mem}", file=err)
+
+
+if os.environ.get(ENV, "").lower() not in ("", "0", "off", "false"):
+    enable(chrome=os.environ[ENV].lower() == "chrome", memory=os.environ.get(ENV_MEMORY) == "1")
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""One entry point for a data refresh: ingest -> aggregate / regressions / cube -> site.
+
+Stages form a DAG and run as subprocesses from this directory, up to --jobs at
+a time as their upstream stages finish. A stage's fingerprint hashes its
+command, the code it runs and the contents of its inputs (upstream outputs
+included); a stage whose fingerprint matches its last successful run, and
+whose outputs are still as that run left them, is skipped. Inputs are hashed
+by content, so a stage that reruns but writes identical outputs doesn't wake
+its dependents.
+
+  ingest           download -> slim -> store partitions (ingest.py)
+  aggregate        per-state stats -> data/precomputed.json (build_precomputed.py --no-site)
+  prepare          per-state regression designs -> data/cache/design (regression.py --prepare)
+  regress          pooled regression -> regression_results.json
+  regress-grouped  per-state / per-year gaps -> data/regression_by_group.json
+  cube             query cube partitions -> data/cube (serve.py)
+  emit-ts          site module + state shards (build_precomputed.py --site-only)
+
+ingest has no local inputs: it reruns when its arguments or code change, or
+with --refresh (re-download; only changed partitions are rewritten). Offline,
+--offline takes the store (or slim CSVs) as they are.
+
+Fingerprints and a file-hash memo (keyed on size and mtime) are kept in
+data/_pipeline.json; each stage's output goes to data/logs/<stage>.log.
+
+Usage:
+  python pipeline.py                        # run whatever is stale
+  python pipeline.py --offline --dry-run    # what would run, and why
+  python pipeline.py emit-ts --force aggregate
+  python pipeline.py --years 2024 --refresh
+"""
+import argparse, glob, json, os, subprocess, sys, time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import cache
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = "data"
+STATE_PATH = os.path.join(DATA_DIR, "_pipeline.json")
+LOG_DIR = os.path.join(DATA_DIR, "logs")
+MANIFEST = os.path.join(DATA_DIR, "store", "_manifest.json")
+
+
+def dataset():
+    """What the analysis stages read: the store, whose manifest checksums every
+    partition's source, or else the slim CSVs themselves."""
+    if os.path.exists(MANIFEST):
+        return [MANIFEST]
+    return sorted(glob.glob(os.path.join(DATA_DIR, "*_slim*.csv")))
+
+
+class Stage:
+    def __init__(self, name, script, args=(), deps=(), inputs=(), outputs=(), code=()):
+        self.name = name
+        self.command = [script, *args]
+        self.deps = list(deps)
+        self.inputs = inputs  # paths, or a function returning them when the stage is due
+        self.outputs = list(outputs)
+        self.code = [script, *code]
+
+    def input_paths(self):
+        return sorted(self.inputs() if callable(self.inputs) else self.inputs)
+
+
+def stages(args):
+    ingest = []
+    if args.states:
+        ingest += ["--states", *args.states]
+    if args.years:
+        ingest += ["--years", *map(str, args.years)]
+    if args.base_url:
+        ingest += ["--base-url", args.base_url]
+    if args.refresh:
+        ingest += ["--force"]
+    ols = ["ols.py", "hdfe.py", "replicate.py", "sampling.py", "cache.py", "store.py"]
+    return [
+        Stage("ingest", "ingest.py", ingest, outputs=[MANIFEST],
+              code=["store.py", "fetch.py", "slim.py", "sampling.py", "download_hmda.py"]),
+        Stage("aggregate", "build_precomputed.py", ["--no-site"], ["ingest"], dataset,
+              [os.path.join(DATA_DIR, f) for f in
+               ("precomputed.json", "state_partials.json", "state_sketches.json")],
+              ["aggregate.py", "store.py"]),
+        # Both regressions read the same prepared designs: build them once, first
+        Stage("prepare", "regression.py", ["--prepare"], ["ingest"], dataset,
+              [os.path.join(DATA_DIR, "cache", "design")], ols),
+        Stage("regress", "regression.py", [], ["prepare"], dataset, ["regression_results.json"], ols),
+        Stage("regress-grouped", "regression.py", ["--grouped"], ["prepare"], dataset,
+              [os.path.join(DATA_DIR, "regression_by_group.json")], ols),
+        Stage("cube", "cube.py", ["build"], ["ingest"], dataset, [os.path.join(DATA_DIR, "cube")],
+              ["cache.py", "aggregate.py", "store.py"]),
+        Stage("emit-ts", "build_precomputed.py", ["--site-only"], ["aggregate", "regress-grouped"],
+              [os.path.join(DATA_DIR, "precomputed.json"), os.path.join(DATA_DIR, "regression_by_group.json")],
+              [os.path.join("web", "src", "data", "precomputed.ts"),
+               os.path.join("web", "public", "data", "states")]),
+    ]
+
+
+class Hasher:
+    """sha256 of files, memoized on (size, mtime_ns) so unchanged files aren't reread."""
+
+    def __init__(self, memo):
+        self.memo = memo
+
+    def file(self, path):
+        st = os.stat(path)
+        hit = self.memo.get(path)
+        if hit and hit[:2] == [st.st_size, st.st_mtime_ns]:
+            return hit[2]
+        digest = cache.file_digest([path])
+        self.memo[path] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def tree(self, paths):
+        """{file: sha256} for paths and every file under directories; missing paths map to None."""
+        out = {}
+        for path in paths:
+            if os.path.isdir(path):
+                for d, _, files in os.walk(path):
+                    for f in files:
+                        out[os.path.join(d, f)] = self.file(os.path.join(d, f))
+            else:
+                out[path] = self.file(path) if os.path.exists(path) else None
+        return out
+
+
+def fingerprint(stage, hasher):
+    return {"command": stage.command,
+            "code": cache.digest(hasher.tree(stage.code))[:16],
+            "inputs": hasher.tree(stage.input_paths())}
+
+
+def outputs_digest(stage, hasher):
+    files = hasher.tree(stage.outputs)
+    return None if None in files.values() else cache.digest(files)[:16]
+
+
+def why(stage, fp, record, hasher, forced):
+    """Reason the stage must run, or None if its last run still holds."""
+    if forced:
+        return "forced"
+    if not record:
+        return "never run"
+    last = record["fingerprint"]
+    if fp["command"] != last["command"]:
+        return "arguments changed"
+    if fp["code"] != last["code"]:
+        return "code changed"
+    if fp["inputs"] != last["inputs"]:
+        changed = sorted(p for p in set(fp["inputs"]) | set(last["inputs"])
+                         if fp["inputs"].get(p) != last["inputs"].get(p))
+        more = f" (+{len(changed) - 3})" if len(changed) > 3 else ""
+        return f"inputs changed: {', '.join(changed[:3])}{more}"
+    current = outputs_digest(stage, hasher)
+    if current is None:
+        return "outputs missing"
+    if current != record["outputs"]:
+        return "outputs modified since last run"
+    return None
+
+
+def execute(stage):
+    """Run the stage's script; (exit code, seconds). Output goes to its log."""
+    t0 = time.perf_counter()
+    with open(os.path.join(LOG_DIR, f"{stage.name}.log"), "w") as log:
+        code = subprocess.call([sys.executable, *stage.command], stdout=log, stderr=subprocess.STDOUT)
+    return code, time.perf_counter() - t0
+
+
+def load_state():
+    state = cache.load_json(STATE_PATH) or {}
+    return {"stages": state.get("stages", {}), "files": state.get("files", {})}
+
+
+def save_state(state):
+    tmp = STATE_PATH + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, STATE_PATH)
+
+
+def closure(all_stages, targets):
+    """targets and everything upstream of them."""
+    by_name = {s.name: s for s in all_stages}
+    keep, todo = set(), list(targets)
+    while todo:
+        name = todo.pop()
+        if name not in keep:
+            keep.add(name)
+            todo.extend(by_name[name].deps)
+    return [s for s in all_stages if s.name in keep]
+
+
+def run(plan, jobs, force, dry_run, skip):
+    """Run `plan` (in dependency order) and return {stage: (status, seconds, note)}."""
+    state = load_state()
+    hasher = Hasher(state["files"])
+    result = {name: ("skipped", None, note) for name, note in skip.items()}
+    pending = [s for s in plan if s.name not in skip]
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            progressed = True
+            while progressed:
+                progressed = False
+                for stage in list(pending):
+                    if any(d not in result for d in stage.deps):
+                        continue
+                    upstream = [result[d][0] for d in stage.deps]
+                    pending.remove(stage)
+                    progressed = True
+                    if any(u in ("failed", "blocked") for u in upstream):
+                        result[stage.name] = ("blocked", None, "upstream failed")
+                        continue
+                    record = state["stages"].get(stage.name)
+                    if dry_run and any(u == "would run" for u in upstream):
+                        result[stage.name] = ("would run", None,
+                                              "if upstream outputs change" if record else "never run")
+                        continue
+                    fp = fingerprint(stage, hasher)
+                    reason = why(stage, fp, record, hasher, stage.name in force)
+                    if reason is None:
+                        result[stage.name] = ("cached", record["seconds"], "")
+                    elif dry_run:
+                        result[stage.name] = ("would run", None, reason)
+                    else:
+                        print(f"> {stage.name}: {reason}")
+                        running[pool.submit(execute, stage)] = (stage, fp, reason)
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                stage, fp, reason = running.pop(fut)
+                code, seconds = fut.result()
+                if code:
+                    result[stage.name] = ("failed", seconds, f"exit {code}; see {LOG_DIR}/{stage.name}.log")
+                    print(f"x {stage.name} failed after {seconds:.1f}s:")
+                    with open(os.path.join(LOG_DIR, f"{stage.name}.log")) as f:
+                        for line in f.readlines()[-15:]:
+                            print(f"    {line.rstrip()}")
+                    continue
+                result[stage.name] = ("ran", seconds, reason)
+                state["stages"][stage.name] = {
+                    "fingerprint": fp, "outputs": outputs_digest(stage, hasher),
+                    "seconds": round(seconds, 2), "finished": time.strftime("%Y-%m-%d %H:%M:%S")}
+                save_state(state)
+                print(f"  {stage.name} done in {seconds:.1f}s")
+    if not dry_run:
+        save_state(state)
+    return result
+
+
+def report(plan, result, wall):
+    print(f"\n{'stage':16s} {'status':10s} {'time':>8s}  note")
+    for stage in plan:
+        status, seconds, note = result[stage.name]
+        shown = "-" if seconds is None else f"{seconds:.1f}s"
+        if status == "cached":
+            shown, note = "-", f"saved {seconds:.1f}s (last run)"
+        print(f"{stage.name:16s} {status:10s} {shown:>8s}  {note}")
+    ran = [r[1] for r in result.values() if r[0] in ("ran", "failed")]
+    cached = [r[1] for r in result.values() if r[0] == "cached"]
+    line = f"\n{len(ran)} ran, {len(cached)} cached"
+    if cached:
+        line += f" ({sum(cached):.1f}s saved)"
+    if ran:
+        line += f"; {sum(ran):.1f}s of stage time in {wall:.1f}s wall ({sum(ran) / max(wall, 1e-9):.1f}x)"
+    print(line)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("targets", nargs="*", metavar="STAGE",
+                    help="run these and their upstream stages (default: all)")
+    ap.add_argument("--jobs", type=int, default=min(4, os.cpu_count() or 1), help="stages run at once")
+    ap.add_argument("--force", nargs="*", metavar="STAGE", help="rerun these stages (no names: all)")
+    ap.add_argument("--dry-run", action="store_true", help="report what would run, and why")
+    ap.add_argument("--offline", action="store_true", help="skip ingest; use the data already on disk")
+    ap.add_argument("--refresh", action="store_true", help="re-download ingested partitions (ingest.py --force)")
+    ap.add_argument("--states", nargs="+", help="ingest only these states")
+    ap.add_argument("--years", nargs="+", type=int, help="ingest only these years")
+    ap.add_argument("--base-url", default=None, help="HMDA API base for ingest")
+    args = ap.parse_args()
+
+    os.chdir(HERE)
+    os.makedirs(LOG_DIR, exist_ok=True)
+    all_stages = stages(args)
+    names = [s.name for s in all_stages]
+    force = set(names) if args.force == [] else set(args.force or [])
+    unknown = (set(args.targets) | force) - set(names)
+    if unknown:
+        ap.error(f"unknown stage {', '.join(sorted(unknown))}; one of {', '.join(names)}")
+    plan = closure(all_stages, args.targets or names)
+    skip = {"ingest": "--offline"} if args.offline and any(s.name == "ingest" for s in plan) else {}
+
+    t0 = time.perf_counter()
+    result = run(plan, args.jobs, force, args.dry_run, skip)
+    report(plan, result, time.perf_counter() - t0)
+    if any(r[0] in ("failed", "blocked") for r in result.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,159 @@
 #!/usr/bin/env python3
 """OLS regression on HMDA data: rate_spread ~ race + controls."""
 
+import argparse
+import csv
 import glob
 import json
+import os
 import numpy as np
 import pandas as pd
 import statsmodels.api as sm
+from pandas.api.types import union_categoricals
 from pathlib import Path
+from scipy import sparse
+
+import cache, hdfe, instrument, replicate
+from ols import ClusterMeat, GroupedSuffStats, HCMeat, RobustResult, SuffStats, select
+from sampling import StratifiedReservoir
+
+try:
+    import store
+except ImportError:  # no pyarrow: slim CSVs only
+    store = None
 
 DATA_DIR = Path(__file__).parent / "data"
 OUT_JSON = Path(__file__).parent / "regression_results.json"
+# Per-state / per-year race gaps, merged into precomputed.json by build_precomputed.py
+OUT_GROUPED = DATA_DIR / "regression_by_group.json"
+# Prepared designs (per state) and fit results, named by a hash of their inputs
+CACHE_DIR = DATA_DIR / "cache"
+HERE = Path(__file__).parent
 
 # Target ~2.5M rows: sample fraction per file
 # 18M total rows, want ~2.5M → sample ~14%
 SAMPLE_FRAC = 0.14
 RANDOM_STATE = 42
+# Minimum rows kept per (year, race) in each state, so AIAN/NHPI aren't starved
+SAMPLE_FLOOR = 200
+
+REG_COLS = ['activity_year', 'state_code', 'derived_race', 'derived_ethnicity',
+            'rate_spread', 'income', 'loan_amount', 'loan_to_value_ratio',
+            'debt_to_income_ratio', 'loan_type', 'occupancy_type', 'lei']
+
+def stratified_sample(df):
+    """Same sampler as the CSV path, fed row positions in table order."""
+    keys = list(zip(df['activity_year'], df['derived_race']))
+    sampler = StratifiedReservoir(key=keys.__getitem__, frac=SAMPLE_FRAC,
+                                  floor=SAMPLE_FLOOR, seed=RANDOM_STATE)
+    for i in range(len(df)):
+        sampler.add(i)
+    return df.iloc[sampler.items()]
+
+def store_root():
+    return str(DATA_DIR / "store")
+
+def use_store():
+    return store is not None and store.exists(store_root())
+
+def load_store_state(state, full=False):
+    """A state's rows from the store: all of them a year at a time, or one stratified sample."""
+    root = store_root()
+    if full:
+        for year in store.manifest_years(store.load_manifest(root)) or [None]:
+            df = store.read_pandas(columns=REG_COLS, states=[state],
+                                   years=[year] if year else None, categorical=False, root=root)
+            if len(df):
+                yield df
+        return
+    with instrument.span("regression.read_store", state=state) as s:
+        df = store.read_pandas(columns=REG_COLS, states=[state], categorical=False, root=root)
+        n = len(df)
+        s.add(n)
+        df = stratified_sample(df)
+    print(f"  Loaded {state} from store: {len(df)} of {n} rows (sampled)")
+    yield df
+
+def load_csv(f, full=False, chunksize=250000):
+    """A slim CSV's rows: all of them in chunks, or one stratified sample."""
+    if full:
+        yield from instrument.iterate("regression.read_csv", pd.read_csv(f, dtype=str, chunksize=chunksize),
+                                      rows=len, file=Path(f).name)
+        return
+    with instrument.span("regression.sample_csv", file=Path(f).name) as s, open(f, newline='') as fh:
+        reader = csv.reader(fh)
+        header = next(reader)
+        yr, race = header.index('activity_year'), header.index('derived_race')
+        sampler = StratifiedReservoir(key=lambda r: (r[yr], r[race]), frac=SAMPLE_FRAC,
+                                      floor=SAMPLE_FLOOR, seed=RANDOM_STATE)
+        for row in reader:
+            sampler.add(row)
+        s.add(sampler.seen)
+        df = pd.DataFrame(sampler.items(), columns=header)
+    print(f"  Loaded {Path(f).name}: {len(df)} of {sampler.seen} rows (sampled)")
+    yield df
 
+def sources(full=False):
+    """[(state, fingerprint, chunks)] per state; chunks() yields its raw DataFrames.
+
+    The fingerprint changes iff the state's input data does: the manifest
+    fingerprint (or partition file hashes) for the store, the file hash for CSVs.
+    File hashes are memoized by size and mtime, so a warm run does not re-read them.
+    """
+    memo = CACHE_DIR / "file_digests.json"
+    if use_store():
+        root = store_root()
+        manifest = store.load_manifest(root)
+        out = []
+        for state in store.states(root):
+            fp = store.state_fingerprint(manifest, state) or cache.file_digest(sorted(
+                glob.glob(os.path.join(root, f"state_code={state}", "*", "*.parquet"))), memo)
+            out.append((state, fp, lambda state=state: load_store_state(state, full)))
+        return out
+    return [(Path(f).name.split('_')[0], cache.file_digest([f], memo), lambda f=f: load_csv(f, full))
+            for f in sorted(glob.glob(str(DATA_DIR / "*_slim_merged.csv")))]
+
+@instrument.traced("regression.load_data", rows=len)
 def load_data():
-    files = sorted(glob.glob(str(DATA_DIR / "*_slim_merged.csv")))
-    chunks = []
-    for f in files:
-        df = pd.read_csv(f, dtype=str)
-        df = df.sample(frac=SAMPLE_FRAC, random_state=RANDOM_STATE)
-        chunks.append(df)
-        print(f"  Loaded {Path(f).name}: {len(df)} rows (sampled)")
-    return pd.concat(chunks, ignore_index=True)
+    return pd.concat([df for _, _, chunks in sources() for df in chunks()], ignore_index=True)
 
-def prep(df):
+KEEP_RACES = ['White', 'Black or African American', 'Asian',
+              'Native Hawaiian or Other Pacific Islander',
+              'American Indian or Alaska Native']
+
+# DTI: categorical ranges → midpoint
+DTI_MAP = {
+    '<20%': 15, '20%-<30%': 25, '30%-<36%': 33,
+    '36': 36, '37': 37, '38': 38, '39': 39, '40': 40,
+    '41': 41, '42': 42, '43': 43, '44': 44, '45': 45,
+    '46': 46, '47': 47, '48': 48, '49': 49,
+    '50%-60%': 55, '>60%': 65,
+}
+
+CONTINUOUS = ['income', 'loan_amount', 'loan_to_value_ratio', 'dti_numeric']
+# One-hot groups after race: (source column, prefix)
+FE_GROUPS = [('loan_type', 'loantype'), ('occupancy_type', 'occtype'),
+             ('activity_year', 'year'), ('state_code', 'state')]
+# Default fixed effects for --estimator hdfe (--lender adds 'lei')
+ABSORB = [col for col, _ in FE_GROUPS]
+# Pretty names
+NAME_MAP = {
+    'race_Black or African American': 'Black',
+    'race_Asian': 'Asian',
+    'race_Native Hawaiian or Other Pacific Islander': 'Native Hawaiian / Pacific Islander',
+    'race_American Indian or Alaska Native': 'American Indian / Alaska Native',
+    'hispanic': 'Hispanic',
+}
+# Smallest state or year fitted on its own by --grouped
+GROUP_MIN_N = 500
+# Per-row columns kept beside each prepared design, for grouping, clustering and absorbing
+KEY_COLS = ['state_code', 'activity_year', 'loan_type', 'occupancy_type', 'lei']
+# --robust choices -> cluster column (None: heteroskedasticity-robust HC1)
+ROBUST = {'HC1': None, 'state': 'state_code', 'lender': 'lei'}
+
+@instrument.traced("regression.clean", rows=len)
+def clean(df):
+    """Row-wise filtering and feature prep; safe to apply chunk by chunk."""
     # Convert numeric columns
     for col in ['rate_spread', 'income', 'loan_amount', 'loan_to_value_ratio']:
         df[col] = pd.to_numeric(df[col], errors='coerce')
@@ -37,76 +164,424 @@ def prep(df):
     df = df[df['income'] > 0]
 
     # Keep main race categories
-    keep_races = ['White', 'Black or African American', 'Asian',
-                  'Native Hawaiian or Other Pacific Islander',
-                  'American Indian or Alaska Native']
-    df = df[df['derived_race'].isin(keep_races)]
+    df = df[df['derived_race'].isin(KEEP_RACES)].copy()
 
     # Ethnicity: simplify to Hispanic vs not
     df['hispanic'] = (df['derived_ethnicity'] == 'Hispanic or Latino').astype(int)
 
-    # Race dummies (White = baseline)
-    race_dummies = pd.get_dummies(df['derived_race'], prefix='race', drop_first=False)
-    # Drop White as baseline
-    baseline = 'race_White'
-    race_cols = [c for c in race_dummies.columns if c != baseline]
-    df = pd.concat([df, race_dummies[race_cols]], axis=1)
-
-    # LTV: already numeric for most, coerce
-    df['loan_to_value_ratio'] = pd.to_numeric(df['loan_to_value_ratio'], errors='coerce')
-
-    # DTI: categorical ranges → midpoint
-    dti_map = {
-        '<20%': 15, '20%-<30%': 25, '30%-<36%': 33,
-        '36': 36, '37': 37, '38': 38, '39': 39, '40': 40,
-        '41': 41, '42': 42, '43': 43, '44': 44, '45': 45,
-        '46': 46, '47': 47, '48': 48, '49': 49,
-        '50%-60%': 55, '>60%': 65,
-    }
-    df['dti_numeric'] = df['debt_to_income_ratio'].map(dti_map)
+    df['dti_numeric'] = df['debt_to_income_ratio'].map(DTI_MAP)
     # Try direct numeric parse for any exact numbers
     mask = df['dti_numeric'].isna()
     df.loc[mask, 'dti_numeric'] = pd.to_numeric(df.loc[mask, 'debt_to_income_ratio'], errors='coerce')
 
-    # Loan type, occupancy type dummies
-    df['loan_type'] = df['loan_type'].astype(str)
-    df['occupancy_type'] = df['occupancy_type'].astype(str)
-    lt_dummies = pd.get_dummies(df['loan_type'], prefix='loantype', drop_first=True)
-    ot_dummies = pd.get_dummies(df['occupancy_type'], prefix='occtype', drop_first=True)
+    for col, _ in FE_GROUPS:
+        df[col] = df[col].astype(str)
+    if 'lei' in df:
+        df['lei'] = df['lei'].replace('', np.nan)
+    return df
 
-    # Year dummies
-    df['activity_year'] = df['activity_year'].astype(str)
-    yr_dummies = pd.get_dummies(df['activity_year'], prefix='year', drop_first=True)
+def design(df, drop_first=True, absorb=()):
+    """Design matrix (no constant) for cleaned rows.
 
-    # State dummies
-    st_dummies = pd.get_dummies(df['state_code'], prefix='state', drop_first=True)
+    drop_first=True is the in-memory model: White and the first level of each
+    group are baselines. drop_first=False keeps every level, for the chunked
+    estimator, which picks baselines over the full data at solve time. Groups
+    in `absorb` get no dummies (hdfe.fit demeans them away instead).
+    """
+    with instrument.span("design.get_dummies", rows=len(df)):
+        # Race dummies (White = baseline)
+        race_dummies = pd.get_dummies(df['derived_race'], prefix='race', drop_first=False)
+        race_cols = [c for c in race_dummies.columns if c != 'race_White' or not drop_first]
 
-    # Build X matrix
-    continuous = ['income', 'loan_amount', 'loan_to_value_ratio', 'dti_numeric']
-    X_parts = [df[continuous + race_cols + ['hispanic']], lt_dummies, ot_dummies, yr_dummies, st_dummies]
-    X = pd.concat(X_parts, axis=1).astype(float)
+        X_parts = [df[CONTINUOUS], race_dummies[race_cols], df[['hispanic']]]
+        for col, prefix in FE_GROUPS:
+            if col in absorb:
+                continue
+            X_parts.append(pd.get_dummies(df[col], prefix=prefix, drop_first=drop_first))
+    with instrument.span("design.concat_astype_float", rows=len(df)):
+        X = pd.concat(X_parts, axis=1).astype(float)
     y = df['rate_spread'].astype(float)
 
     # Drop rows with any NaN
     mask = X.notna().all(axis=1) & y.notna()
     X = X[mask]
     y = y[mask]
+    return X, y, [c for c in race_cols if c != 'race_White']
 
+def complete_rows(df):
+    """Rows design()/design_sparse() keep: no NaN in y or the continuous columns."""
+    return df[['rate_spread'] + CONTINUOUS].notna().all(axis=1).to_numpy()
+
+def cluster_labels(keys, col):
+    labels = keys.get(col)
+    if labels is None or pd.isna(labels).any():
+        missing = len(labels) if labels is None else int(pd.isna(labels).sum())
+        raise SystemExit(f"{missing:,} rows have no {col} to cluster on "
+                         "(re-slim or re-ingest to pick up lei)")
+    return labels
+
+@instrument.traced("regression.design_sparse", rows=lambda r: r[0].shape[0])
+def design_sparse(df, drop_first=True, absorb=()):
+    """design() plus a leading 'const', as a CSR matrix built straight from codes.
+
+    Every row has the same slots (const, continuous, race, hispanic, one per
+    dummy group), so data/indices are filled in place as rows x slots arrays
+    and handed to CSR as-is; baseline levels are explicit zeros that
+    eliminate_zeros drops. No dense dummy block or pandas copy of the design is
+    made. Returns (X, y, names, race_cols) with the same columns, in the same
+    order, as sm.add_constant(design(df)).
+    """
+    groups = [(col, prefix) for col, prefix in FE_GROUPS if col not in absorb]
+    mask = complete_rows(df)
+    y = df['rate_spread'].to_numpy(dtype=float)[mask]
+    slots = 1 + len(CONTINUOUS) + 2 + len(groups)
+    data = np.empty((len(y), slots))
+    index = np.empty((len(y), slots), dtype=np.int32)
+    names = []
+
+    def dense(k, name, values):
+        names.append(name)
+        data[:, k] = values
+        index[:, k] = len(names) - 1
+
+    def onehot(k, values, prefix, drop):
+        """Fill slot k for a dummy group; `drop` is a level name, 'first' or None."""
+        codes, levels = pd.factorize(values, sort=True)
+        col = np.full(len(levels), -1, dtype=np.int32)
+        added = []
+        for i, level in enumerate(levels):
+            name = f"{prefix}_{level}"
+            if name == drop or (drop == 'first' and i == 0):
+                continue
+            col[i] = len(names)
+            names.append(name)
+            added.append(name)
+        cols = col[codes[mask]]
+        data[:, k] = cols >= 0
+        index[:, k] = np.maximum(cols, 0)
+        return added
+
+    dense(0, 'const', 1.0)
+    for k, c in enumerate(CONTINUOUS, 1):
+        dense(k, c, df[c].to_numpy(dtype=float)[mask])
+    k = len(CONTINUOUS) + 1
+    race_cols = onehot(k, df['derived_race'], 'race', 'race_White' if drop_first else None)
+    dense(k + 1, 'hispanic', df['hispanic'].to_numpy(dtype=float)[mask])
+    for j, (col, prefix) in enumerate(groups, k + 2):
+        onehot(j, df[col], prefix, 'first' if drop_first else None)
+
+    X = sparse.csr_matrix((data.ravel(), index.ravel(), np.arange(0, data.size + 1, slots)),
+                          shape=(len(y), len(names)))
+    del data, index
+    X.eliminate_zeros()
+    return X, y, names, [c for c in race_cols if c != 'race_White']
+
+def prep(df):
+    X, y, race_cols = design(clean(df))
     X = sm.add_constant(X)
     return X, y, race_cols
 
-def run():
-    print("Loading data...")
-    df = load_data()
-    print(f"Total rows loaded: {len(df)}")
+def _version(*files):
+    return cache.file_digest([HERE / f for f in files])[:16]
+
+# Prep output depends on this file, the sampler, and how store.py / slim.py type and
+# filter the rows it reads; fits also on the estimators
+PREP_VERSION = _version("regression.py", "sampling.py", "store.py", "slim.py")
+FIT_VERSION = _version("regression.py", "sampling.py", "ols.py", "hdfe.py", "replicate.py")
+
+def prep_key(full):
+    return cache.digest(PREP_VERSION, full, SAMPLE_FRAC, SAMPLE_FLOOR, RANDOM_STATE, REG_COLS,
+                        KEEP_RACES, DTI_MAP, CONTINUOUS, FE_GROUPS, KEY_COLS)
+
+@instrument.traced("regression.prepare", rows=lambda r: r[0].shape[0])
+def prepare(chunks):
+    """Raw chunks of one state -> (X, y, names, keys): the sparse design with every
+    level kept (drop_first=False) and the rows' KEY_COLS as categoricals."""
+    parts = []
+    for df in chunks:
+        df = clean(df)
+        X, y, names, _ = design_sparse(df, drop_first=False)
+        rows = df[complete_rows(df)]
+        parts.append((X, y, names, {c: pd.Categorical(rows[c]) for c in KEY_COLS if c in rows}))
+    if len(parts) == 1:
+        return parts[0]
+    names = list(dict.fromkeys(n for _, _, nm, _ in parts for n in nm))
+    X = sparse.vstack([select(Xp, nm, names) for Xp, _, nm, _ in parts]).tocsr()
+    y = np.concatenate([yp for _, yp, _, _ in parts])
+    cols = [c for c in KEY_COLS if all(c in k for _, _, _, k in parts)]
+    keys = {c: union_categoricals([k[c] for _, _, _, k in parts]) for c in cols}
+    return X, y, names, keys
+
+def save_prepared(path, X, y, names, keys):
+    arrays = {'data': X.data, 'indices': X.indices, 'indptr': X.indptr, 'y': y}
+    arrays.update({f"key_{c}": k.codes for c, k in keys.items()})
+    cache.save_arrays(str(path), arrays, {
+        'names': names, 'shape': list(X.shape),
+        'keys': {c: list(k.categories) for c, k in keys.items()}})
+
+def load_prepared(path):
+    a, meta = cache.load_arrays(str(path))
+    X = sparse.csr_matrix((a['data'], a['indices'], a['indptr']), shape=tuple(meta['shape']), copy=False)
+    # Key columns are text; an empty category list must come back as text too
+    keys = {c: pd.Categorical.from_codes(np.asarray(a[f"key_{c}"]), pd.Index(cats, dtype=str))
+            for c, cats in meta['keys'].items()}
+    return X, a['y'], meta['names'], keys
 
-    print("Preparing features...")
-    X, y, race_cols = prep(df)
+def designs(full=False, use_cache=True):
+    """(state, X, y, names, keys) per state, prepared or memory-mapped from the cache.
+
+    A state's entry is keyed by its input fingerprint and prep_key(), so editing
+    one state's data re-prepares only that state.
+    """
+    hits = built = 0
+    mode = 'full' if full else 'sample'
+    pkey = prep_key(full)
+    for state, fp, chunks in sources(full):
+        name = f"{mode}-{state}-{cache.digest(fp, pkey)[:16]}"
+        path = CACHE_DIR / "design" / name
+        if use_cache and cache.exists(str(path)):
+            prepared = load_prepared(path)
+            hits += 1
+        else:
+            prepared = prepare(chunks())
+            built += 1
+            if use_cache:
+                save_prepared(path, *prepared)
+                cache.prune(str(CACHE_DIR / "design"), f"{mode}-{state}-", name)
+        yield (state,) + prepared
+    print(f"  prep cache: {hits} states reused, {built} prepared")
+
+def race_columns(names):
+    return sorted({c for c in names if c.startswith('race_') and c != 'race_White'})
+
+def model_columns(names, absorb=()):
+    """Pooled model columns for the levels in `names`, in sm.add_constant(design(df, absorb=absorb))
+    order: White and the first level of every other group are baselines."""
+    present = set(names)
+    levels = lambda prefix: sorted(c for c in present if c.startswith(prefix + '_'))
+    cols = ([] if absorb else ['const']) + CONTINUOUS + race_columns(present) + ['hispanic']
+    for col, prefix in FE_GROUPS:
+        if col not in absorb:
+            cols += levels(prefix)[1:]
+    return cols
+
+@instrument.traced("regression.stack", rows=lambda r: r[0].shape[0])
+def stack(ds, absorb=()):
+    """Stack prepared states into one design on model_columns: (X csr, y, keys, cols)."""
+    ds = list(ds)
+    cols = model_columns([n for d in ds for n in d[3]], absorb)
+    X = sparse.vstack([select(Xs, names, cols) for _, Xs, _, names, _ in ds]).tocsr()
+    y = np.concatenate([np.asarray(ys) for _, _, ys, _, _ in ds])
+    common = [c for c in KEY_COLS if all(c in d[4] for d in ds)]
+    keys = {c: union_categoricals([d[4][c] for d in ds]) for c in common}
+    return X, y, keys, cols
+
+@instrument.traced("regression.accumulate", rows=lambda r: r[0].n)
+def accumulate(ds):
+    """Fold prepared states into sufficient statistics. Returns (SuffStats, race_cols)."""
+    ss = SuffStats()
+    race_cols = set()
+    for state, X, y, names, keys in ds:
+        ss.add(X, y, names)
+        race_cols.update(race_columns(names))
+        print(f"  {state}: {X.shape[0]:,} rows (N={ss.n:,})")
+    return ss, sorted(race_cols)
+
+def fit_suffstats(ss):
+    cols = ss.columns(groups=['race_'] + [p + '_' for _, p in FE_GROUPS],
+                      baselines={'race_': 'race_White'})
+    with instrument.span("ols.solve", rows=ss.n, columns=len(cols)):
+        return ss.solve(cols)
+
+def robust_suffstats(model, robust, ds):
+    """Cluster or HC1 meat by a second pass over `ds` with the fitted residuals."""
+    cluster = ROBUST[robust]
+    if cluster:
+        print(f"Second pass for {cluster} cluster scores...")
+        cm = ClusterMeat(model)
+        for _, X, y, names, keys in ds:
+            cm.add(X, y, names, cluster_labels(keys, cluster))
+        meat, n_groups = cm.meat
+        return model.sandwich(meat, 'cluster', n_groups)
+    print("Second pass for HC1 meat...")
+    hc = HCMeat(model)
+    for _, X, y, names, _ in ds:
+        hc.add(X, y, names)
+    return model.sandwich(hc.meat, 'HC1')
+
+def fit_hdfe(ds, absorb, robust=None):
+    """Absorb `absorb` by alternating projections; the sparse design of the non-FE
+    columns goes to hdfe.fit as is and is demeaned a block of columns at a time."""
+    cluster = ROBUST[robust] if robust else None
+    X, y, keys, cols = stack(ds, absorb)
+    missing = [c for c in list(absorb) + ([cluster] if cluster else []) if c not in keys]
+    if missing:
+        raise SystemExit(f"no {', '.join(missing)} column (re-slim or re-ingest to pick up lei)")
+    rows = np.logical_and.reduce([~pd.isna(keys[c]) for c in absorb])
+    if not rows.any():
+        raise SystemExit(f"No rows with {', '.join(absorb)} set")
+    keys = {c: k[rows] for c, k in keys.items()}
+    X = X[rows]
+    print(f"Regression sample size: {X.shape[0]}; absorbing {', '.join(absorb)}")
+    with instrument.span("hdfe.fit", rows=X.shape[0], absorb=list(absorb)):
+        model = hdfe.fit(X, y[rows], pd.DataFrame({c: keys[c] for c in absorb}),
+                         robust=robust and ('cluster' if cluster else 'HC1'),
+                         groups=cluster_labels(keys, cluster) if cluster else None, names=cols)
+    print(f"  {model.sweeps} sweeps, {model.singletons:,} singletons dropped, levels: "
+          + ", ".join(f"{c}={n:,}" for c, n in model.absorbed.items()))
+    if model.nested:
+        print(f"  {', '.join(model.nested)} nested in {cluster} clusters: left out of the small-sample k")
+    return model, race_columns(cols), model.robust
+
+def fit(estimator='statsmodels', full=False, absorb=ABSORB, robust=None, use_cache=True):
+    """Returns (model, race_cols, robust result or None). full=True uses every
+    row (no sampling). robust is a ROBUST key."""
+    cluster = ROBUST[robust] if robust else None
+    print("Loading prepared data..." if use_cache else "Loading data...")
+    ds = lambda: designs(full, use_cache)
+    if estimator == 'hdfe':
+        return fit_hdfe(ds(), absorb, robust)
+
+    if full or estimator == 'suffstats':
+        print("Accumulating X'X / X'y...")
+        ss, race_cols = accumulate(ds())
+        model = fit_suffstats(ss)
+        return model, race_cols, robust and robust_suffstats(model, robust, ds())
+
+    X, y, keys, cols = stack(ds())
+    with instrument.span("regression.densify", rows=X.shape[0], columns=len(cols)):
+        X = pd.DataFrame(X.toarray(), columns=cols)
     print(f"Regression sample size: {len(X)}")
 
     print("Running OLS (this may take a minute)...")
-    model = sm.OLS(y, X).fit()
-    print(model.summary().tables[0])
+    with instrument.span("ols.fit", rows=len(X), columns=len(cols)):
+        model = sm.OLS(pd.Series(y), X).fit()
+    race_cols = race_columns(cols)
+    if not robust:
+        return model, race_cols, None
+    if cluster:
+        groups = pd.factorize(cluster_labels(keys, cluster))[0]
+        r = model.get_robustcov_results('cluster', groups=groups, use_t=False)
+        n_groups = int(groups.max()) + 1
+    else:
+        r = model.get_robustcov_results('HC1', use_t=False)
+        n_groups = None
+    cov = pd.DataFrame(r.cov_params(), index=X.columns, columns=X.columns)
+    return model, race_cols, RobustResult(model.params, cov, 'cluster' if cluster else 'HC1', n_groups)
+
+@instrument.traced("regression.accumulate_grouped", rows=lambda r: r[0].n)
+def accumulate_grouped(ds):
+    """One scan: pooled, per-state and per-year sufficient statistics."""
+    ss, by_state, by_year = SuffStats(), GroupedSuffStats(), GroupedSuffStats()
+    race_cols = set()
+    for state, X, y, names, keys in ds:
+        ss.add(X, y, names)
+        by_state.add(X, y, names, keys['state_code'])
+        by_year.add(X, y, names, keys['activity_year'])
+        race_cols.update(race_columns(names))
+        print(f"  {state}: {X.shape[0]:,} rows (N={ss.n:,})")
+    return ss, by_state, by_year, sorted(race_cols)
+
+def fit_key(full, *settings):
+    """Hash of every state's input fingerprint, the prep parameters, the code and `settings`."""
+    inputs = [(state, fp) for state, fp, _ in sources(full)]
+    return cache.digest(inputs, prep_key(full), FIT_VERSION, full, settings)
+
+def cached_fit(name, key, compute, use_cache=True):
+    """compute() unless a result for `key` is cached under CACHE_DIR/fits."""
+    path = CACHE_DIR / "fits" / f"{name}-{key[:24]}.json"
+    results = cache.load_json(str(path)) if use_cache else None
+    if results is not None:
+        print(f"Fit cache: inputs and settings unchanged, reusing {path.name}")
+        return results
+    results = compute()
+    if use_cache:
+        cache.save_json(str(path), results)
+    return results
+
+def group_table(fits, keys):
+    """{group: {n, r_squared, coefficients: {name: {coef, std_err, p_value}}}}, skipping NaN."""
+    out = {}
+    for g in sorted(fits):
+        m = fits[g]
+        coefs = {}
+        for var in keys:
+            if var in m.params and not np.isnan(m.params[var]):
+                coefs[NAME_MAP.get(var, var)] = {
+                    'coef': round(float(m.params[var]), 4),
+                    'std_err': round(float(m.bse[var]), 4),
+                    'p_value': round(float(m.pvalues[var]), 6),
+                }
+        out[str(g)] = {'n': int(m.nobs), 'r_squared': round(m.rsquared, 4), 'coefficients': coefs}
+    return out
+
+def run_grouped(full=False, use_cache=True):
+    """Race/Hispanic coefficients for every state and every year from one scan,
+    each group's small system solved in one batch. Writes OUT_GROUPED."""
+    def compute():
+        print("Accumulating pooled, per-state and per-year X'X / X'y...")
+        ss, by_state, by_year, race_cols = accumulate_grouped(designs(full, use_cache))
+        pooled = fit_suffstats(ss)
+        cols = list(pooled.params.index)
+        keys = race_cols + ['hispanic']
+        with instrument.span("ols.solve_groups"):
+            state_fits = by_state.solve([c for c in cols if not c.startswith('state_')], GROUP_MIN_N)
+            year_fits = by_year.solve([c for c in cols if not c.startswith('year_')], GROUP_MIN_N)
+        return {
+            'model': 'rate_spread ~ race + hispanic + controls, fitted within each group',
+            'min_n': GROUP_MIN_N,
+            'national': group_table({'all': pooled}, keys)['all'],
+            'by_state': group_table(state_fits, keys),
+            'by_year': group_table(year_fits, keys),
+        }
+
+    results = cached_fit('grouped', fit_key(full, 'grouped', GROUP_MIN_N), compute, use_cache)
+    print(f"Fitted {len(results['by_state'])} states and {len(results['by_year'])} years "
+          f"(groups under {GROUP_MIN_N:,} rows skipped)")
+    for year, row in results['by_year'].items():
+        black = row['coefficients'].get('Black', {}).get('coef')
+        print(f"  {year}: N={row['n']:,}  Black {black if black is not None else 'n/a'}")
+    with open(OUT_GROUPED, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {OUT_GROUPED}")
+    return results
+
+def replication(full=False, reps=200, method='bootstrap', frac=0.5, jobs=1, use_cache=True):
+    """Distribution of the race/Hispanic coefficients over resampled fits (replicate.py)."""
+    X, y, _, names = stack(designs(full, use_cache))
+    ss = SuffStats()
+    ss.add(X, y, names)
+    model = ss.solve(ss.columns())
+    point = {k: float(model.params[k]) for k in race_columns(names) + ['hispanic'] if k in model.params}
+    return replicate.run(X, y, names, list(model.params.index), point, reps, method, frac,
+                         jobs, RANDOM_STATE)
+
+def compare():
+    """Fit the sample both ways and report the largest coefficient / SE differences."""
+    X, y, _ = prep(load_data())
+    ref = sm.OLS(y, X).fit()
+    ss, _ = accumulate(designs())
+    model = fit_suffstats(ss)
+    common = ref.params.index
+    missing = sorted(set(common) ^ set(model.params.index))
+    dcoef = (ref.params - model.params[common]).abs().max()
+    dse = ((ref.bse - model.bse[common]).abs() / ref.bse).max()
+    print(f"N {int(ref.nobs):,} vs {model.nobs:,}; columns differing: {missing or 'none'}")
+    print(f"max |coef diff| = {dcoef:.2e}, max relative SE diff = {dse:.2e}, "
+          f"R² {ref.rsquared:.6f} vs {model.rsquared:.6f}")
+    return not missing and dcoef < 1e-6 and dse < 1e-6
+
+def estimate(estimator='statsmodels', full=False, absorb=ABSORB, robust=None,
+             replicate_args=None, use_cache=True):
+    """Fit and collect the results dict written to OUT_JSON."""
+    model, race_cols, rob = fit(estimator, full, absorb, robust, use_cache)
+    if estimator == 'hdfe':
+        print(model.summary_line("absorbed fixed effects")
+              + f", within R²={model.rsquared_within:.4f}")
+    elif hasattr(model, 'summary_line'):
+        print(model.summary_line())
+    else:
+        print(model.summary().tables[0])
 
     # Extract key coefficients
     key_vars = race_cols + ['hispanic']
@@ -128,30 +603,63 @@ def run():
                 'ci_upper': round(ci[1], 4),
                 'significant': bool(model.pvalues[var] < 0.001),
             }
+            if rob is not None:
+                ci = rob.conf_int().loc[var]
+                results['coefficients'][var]['robust'] = {
+                    'std_err': round(rob.bse[var], 4),
+                    'p_value': round(rob.pvalues[var], 6),
+                    'ci_lower': round(ci[0], 4),
+                    'ci_upper': round(ci[1], 4),
+                    'significant': bool(rob.pvalues[var] < 0.001),
+                }
+    if rob is not None:
+        results['robust_se'] = {'type': rob.kind, 'cluster': ROBUST[robust],
+                                'n_clusters': rob.n_groups}
 
-    # Pretty names
-    name_map = {
-        'race_Black or African American': 'Black',
-        'race_Asian': 'Asian',
-        'race_Native Hawaiian or Other Pacific Islander': 'Native Hawaiian / Pacific Islander',
-        'race_American Indian or Alaska Native': 'American Indian / Alaska Native',
-        'hispanic': 'Hispanic',
-    }
     results['named_coefficients'] = {}
     for k, v in results['coefficients'].items():
-        results['named_coefficients'][name_map.get(k, k)] = v
+        results['named_coefficients'][NAME_MAP.get(k, k)] = v
 
     # Controls used
     results['controls'] = [
         'income', 'loan_amount', 'loan_to_value_ratio', 'debt_to_income_ratio',
         'loan_type', 'occupancy_type', 'activity_year', 'state'
     ]
+    if estimator == 'hdfe':
+        if 'lei' in absorb:
+            results['controls'].append('lender')
+        results['fixed_effects'] = model.absorbed
+
+    if replicate_args:
+        print("Replicating...")
+        rep = replication(full, use_cache=use_cache, **replicate_args)
+        rep['coefficients'] = {NAME_MAP.get(k, k): v for k, v in rep['coefficients'].items()}
+        results['replication'] = rep
+    return results
+
+def run(estimator='statsmodels', full=False, absorb=ABSORB, robust=None, replicate_args=None,
+        use_cache=True):
+    # Replicates don't depend on the worker count, so jobs isn't part of the key
+    settings = (estimator, absorb if estimator == 'hdfe' else None, robust,
+                {k: v for k, v in (replicate_args or {}).items() if k != 'jobs'})
+    results = cached_fit('run', fit_key(full, *settings),
+                         lambda: estimate(estimator, full, absorb, robust, replicate_args, use_cache),
+                         use_cache)
 
     print("\n=== KEY RESULTS ===")
     for name, vals in results['named_coefficients'].items():
         sig = "***" if vals['p_value'] < 0.001 else "**" if vals['p_value'] < 0.01 else "*" if vals['p_value'] < 0.05 else ""
-        print(f"  {name}: {vals['coef']:+.4f} ({vals['ci_lower']:.4f}, {vals['ci_upper']:.4f}) {sig}")
+        line = f"  {name}: {vals['coef']:+.4f} ({vals['ci_lower']:.4f}, {vals['ci_upper']:.4f}) {sig}"
+        if 'robust' in vals:
+            line += f"  robust SE {vals['robust']['std_err']:.4f} p={vals['robust']['p_value']:.4g}"
+        print(line)
     print(f"  R² = {results['r_squared']}, N = {results['n']:,}")
+    if 'replication' in results:
+        rep = results['replication']
+        print(f"\n=== {rep['replicates']} {rep['method'].upper()} REPLICATES ===")
+        for name, v in rep['coefficients'].items():
+            print(f"  {name}: {v['point']:+.4f}  se {v['se']:.4f}  95% [{v['p2_5']:+.4f}, {v['p97_5']:+.4f}]  "
+                  f"same sign {v['same_sign']:.0%}")
 
     with open(OUT_JSON, 'w') as f:
         json.dump(results, f, indent=2)
@@ -159,5 +667,50 @@ def run():
 
     return results
 
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument('--estimator', choices=['statsmodels', 'suffstats', 'hdfe'], default='statsmodels',
+                    help="suffstats solves the normal equations from X'X / X'y accumulated over sparse "
+                         "design chunks; hdfe absorbs --absorb groups instead of building dummies")
+    ap.add_argument('--absorb', nargs='+', default=ABSORB, choices=ABSORB + ['lei'],
+                    help='fixed effects absorbed by --estimator hdfe')
+    ap.add_argument('--lender', action='store_true', help='also absorb lender (LEI) fixed effects')
+    ap.add_argument('--robust', choices=list(ROBUST),
+                    help='also report HC1 or state-/lender-clustered standard errors')
+    ap.add_argument('--replicate', type=int, metavar='B',
+                    help='also refit on B bootstrap (or --subsample) resamples and report the spread')
+    ap.add_argument('--subsample', type=float, metavar='FRAC',
+                    help='replicate on FRAC of the rows without replacement instead of bootstrapping')
+    ap.add_argument('--jobs', type=int, default=1, help='worker processes for --replicate')
+    ap.add_argument('--grouped', action='store_true',
+                    help=f'fit every state and every year separately in one scan (writes {OUT_GROUPED.name})')
+    ap.add_argument('--full', action='store_true',
+                    help='no sampling: use every row (suffstats unless --estimator hdfe)')
+    ap.add_argument('--no-cache', action='store_true',
+                    help=f'rebuild prepared designs and fits instead of reusing {CACHE_DIR.name}/')
+    ap.add_argument('--compare', action='store_true',
+                    help='fit the sample with both estimators and check they agree')
+    ap.add_argument('--prepare', action='store_true',
+                    help=f'only build the prepared designs in {CACHE_DIR.name}/design (pipeline.py runs this '
+                         'once before the fits)')
+    instrument.add_arguments(ap)
+    args = ap.parse_args()
+    instrument.from_args(args)
+    if args.prepare:
+        for _ in designs(args.full):
+            pass
+        return
+    if args.compare:
+        raise SystemExit(0 if compare() else 1)
+    if args.grouped:
+        return run_grouped(args.full, not args.no_cache)
+    absorb = list(dict.fromkeys(args.absorb + (['lei'] if args.lender else [])))
+    if args.lender and args.estimator != 'hdfe':
+        ap.error('--lender needs --estimator hdfe')
+    replicate_args = args.replicate and {
+        'reps': args.replicate, 'jobs': args.jobs,
+        'method': 'subsample' if args.subsample else 'bootstrap', 'frac': args.subsample or 0.5}
+    run(args.estimator, args.full, absorb, args.robust, replicate_args, not args.no_cache)
+
 if __name__ == '__main__':
-    run()
+    main()
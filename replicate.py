@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Bootstrap / subsample replication of the regression across a process pool.
+
+The design is built once as CSR and saved as .npy arrays; each worker opens
+them with np.load(mmap_mode='r'), so every process reads the same page-cached
+file instead of receiving a pickled copy. A replicate is a row resample
+(bootstrap: multinomial counts, applied as sqrt weights; subsample: `frac` of
+the rows without replacement) solved through the same SuffStats normal
+equations as the main fit. Replicate r draws from child r of one SeedSequence,
+so results don't depend on the number of workers.
+"""
+import json, multiprocessing, os, tempfile, time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import sparse
+
+from ols import SuffStats
+
+_DESIGN = None
+
+
+def save_design(X, y, names, path):
+    X = X.tocsr()
+    for part in ('data', 'indices', 'indptr'):
+        np.save(os.path.join(path, f"{part}.npy"), getattr(X, part))
+    np.save(os.path.join(path, "y.npy"), np.asarray(y, dtype=float))
+    with open(os.path.join(path, "names.json"), "w") as f:
+        json.dump({"names": list(names), "shape": list(X.shape)}, f)
+
+
+def load_design(path):
+    """(X, y, names) backed by read-only memory maps of save_design's files."""
+    load = lambda part: np.load(os.path.join(path, f"{part}.npy"), mmap_mode='r')
+    with open(os.path.join(path, "names.json")) as f:
+        meta = json.load(f)
+    X = sparse.csr_matrix((load('data'), load('indices'), load('indptr')),
+                          shape=tuple(meta["shape"]), copy=False)
+    return X, load('y'), meta["names"]
+
+
+def _init(path):
+    global _DESIGN
+    _DESIGN = load_design(path)
+
+
+def one(task):
+    """Coefficients of `keys` for one replicate: (seed, method, frac, cols, keys)."""
+    seed, method, frac, cols, keys = task
+    X, y, names = _DESIGN
+    n = X.shape[0]
+    rng = np.random.default_rng(seed)
+    if method == 'bootstrap':
+        w = np.bincount(rng.integers(0, n, n), minlength=n)
+        rows = np.flatnonzero(w)
+        root = np.sqrt(w[rows])
+        Xr = X[rows].multiply(root[:, None]).tocsr()
+        yr = y[rows] * root
+    else:
+        rows = np.sort(rng.choice(n, int(frac * n), replace=False))
+        Xr, yr = X[rows], y[rows]
+    ss = SuffStats()
+    ss.add(Xr, yr, names)
+    observed = set(ss.columns())
+    res = ss.solve([c for c in cols if c in observed])
+    return [float(res.params[k]) if k in res.params else float('nan') for k in keys]
+
+
+def summarize(draws, point, method, frac):
+    """Per-coefficient distribution. Subsample spreads are rescaled to full-sample SEs."""
+    scale = 1.0 if method == 'bootstrap' else np.sqrt(frac / (1 - frac))
+    out = {}
+    for j, key in enumerate(point):
+        v = draws[:, j][~np.isnan(draws[:, j])]
+        p2, p50, p97 = np.percentile(v, [2.5, 50, 97.5])
+        out[key] = {
+            'point': round(point[key], 4),
+            'mean': round(float(v.mean()), 4),
+            'se': round(float(v.std(ddof=1)) * scale, 4),
+            'p2_5': round(float(p2), 4), 'p50': round(float(p50), 4), 'p97_5': round(float(p97), 4),
+            'same_sign': round(float(np.mean(np.sign(v) == np.sign(point[key]))), 4),
+        }
+    return out
+
+
+def run(X, y, names, cols, point, reps=200, method='bootstrap', frac=0.5, jobs=1, seed=42):
+    """Replicate the fit `reps` times. `cols` are the fitted columns, `point`
+    {column: full-sample estimate} for the coefficients to report."""
+    keys = list(point)
+    seeds = np.random.SeedSequence(seed).spawn(reps)
+    tasks = [(s, method, frac, cols, keys) for s in seeds]
+    t0 = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="design-") as path:
+        save_design(X, y, names, path)
+        if jobs > 1:
+            # spawn, as in build_precomputed: workers map the design instead of inheriting it
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=jobs, mp_context=ctx, initializer=_init,
+                                     initargs=(path,)) as pool:
+                draws = list(pool.map(one, tasks, chunksize=max(1, reps // (4 * jobs))))
+        else:
+            _init(path)
+            draws = [one(t) for t in tasks]
+    secs = time.perf_counter() - t0
+    print(f"  {reps} {method} replicates on {X.shape[0]:,} rows with {jobs} worker(s): "
+          f"{secs:.1f}s ({reps / secs:.1f}/s)")
+    return {
+        'method': method, 'replicates': reps, 'seed': seed,
+        'subsample_frac': frac if method == 'subsample' else None,
+        'coefficients': summarize(np.array(draws), point, method, frac),
+    }
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Seeded one-pass samplers for streams of rows.
+
+Every item gets a uniform random tag u from a seeded RNG. Keeping the k smallest
+tags is a uniform sample without replacement (reservoir sampling with random
+keys); keeping every tag below `frac` is a Bernoulli(frac) sample. Both take a
+single pass and hold only the items currently selected.
+
+Stratified mode additionally keeps the `floor` smallest tags within each stratum,
+so small groups (e.g. AIAN and NHPI borrowers in one state-year) are not starved.
+Those strata are then over-represented relative to the population; that is fine
+for a regression that conditions on the stratum variables, but descriptive
+averages across strata should use `weights()`.
+"""
+import heapq, random
+
+
+class Reservoir:
+    """Uniform sample of at most `k` items from a stream, in stream order."""
+
+    def __init__(self, k, seed=42):
+        self.k = k
+        self.rng = random.Random(seed)
+        self.seen = 0
+        self._heap = []  # (-tag, seq, item): max-heap on tag
+
+    def add(self, item):
+        tag = self.rng.random()
+        entry = (-tag, self.seen, item)
+        self.seen += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif tag < -self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def items(self):
+        return [item for _, _, item in sorted(self._heap, key=lambda e: e[1])]
+
+
+class StratifiedReservoir:
+    """Sample a stream with a per-stratum minimum.
+
+    Give exactly one of `k` (fixed sample size) or `frac` (expected fraction).
+    Each stratum keeps up to `floor` items regardless of its share; the rest of
+    the sample is filled from the smallest tags overall, as in `Reservoir`.
+    `key(item)` returns the stratum, e.g. `(year, race)`.
+    """
+
+    def __init__(self, key, k=None, frac=None, floor=0, seed=42):
+        if (k is None) == (frac is None):
+            raise ValueError("give exactly one of k or frac")
+        self.key = key
+        self.k = k
+        self.frac = frac
+        self.floor = floor
+        self.rng = random.Random(seed)
+        self.seen = 0
+        self.counts = {}
+        self._global = []   # k mode: max-heap of k smallest; frac mode: list of tag < frac
+        self._strata = {}   # stratum -> max-heap of `floor` smallest
+
+    def add(self, item):
+        tag = self.rng.random()
+        entry = (-tag, self.seen, item)
+        self.seen += 1
+        s = self.key(item)
+        self.counts[s] = self.counts.get(s, 0) + 1
+
+        if self.floor:
+            heap = self._strata.setdefault(s, [])
+            if len(heap) < self.floor:
+                heapq.heappush(heap, entry)
+            elif tag < -heap[0][0]:
+                heapq.heapreplace(heap, entry)
+
+        if self.frac is not None:
+            if tag < self.frac:
+                self._global.append(entry)
+        elif len(self._global) < self.k:
+            heapq.heappush(self._global, entry)
+        elif tag < -self._global[0][0]:
+            heapq.heapreplace(self._global, entry)
+
+    def _selected(self):
+        guaranteed = {e[1]: e for heap in self._strata.values() for e in heap}
+        chosen = dict(guaranteed)
+        rest = (e for e in sorted(self._global, reverse=True) if e[1] not in guaranteed)
+        if self.frac is not None:
+            chosen.update((e[1], e) for e in rest)
+        else:
+            room = max(self.k - len(guaranteed), 0)
+            for e in rest:
+                if room == 0:
+                    break
+                chosen[e[1]] = e
+                room -= 1
+        return [chosen[seq] for seq in sorted(chosen)]
+
+    def __len__(self):
+        return len(self._selected())
+
+    def items(self):
+        """Selected items in stream order."""
+        return [item for _, _, item in self._selected()]
+
+    def weights(self):
+        """Inverse-probability weights per stratum (population count / sampled count)."""
+        sampled = {}
+        for _, _, item in self._selected():
+            s = self.key(item)
+            sampled[s] = sampled.get(s, 0) + 1
+        return {s: self.counts[s] / n for s, n in sampled.items()}
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""Local read-only HTTP API over the cube partitions (cube.py), for ad-hoc slices.
+
+  GET /dims                                     dimensions, labels and measures
+  GET /query?by=race,ltv,year&state=CA          spread by race x LTV band x year in CA
+  GET /query?by=race,dti&measure=interest_rate  rate by race x DTI bucket, nationally
+  GET /stats                                    result-cache counters
+
+`by` lists the dimensions to group by; any other dimension given as a parameter
+filters on its comma-separated labels. `measure` (rate_spread) and `min_n` (1)
+are optional. Responses are JSON; bad parameters get a 400 with the reason, and
+any other failure a 500 (the connection stays usable).
+
+The server is one asyncio event loop (HTTP/1.1 keep-alive, stdlib only).
+Encoded responses are kept in an LRU cache keyed by the normalized query and
+the cube's version, so rebuilding a partition retires stale results; misses
+(and /dims, cached per version too) run in a worker thread so hits are never
+queued behind them.
+
+`--bench N` is a load generator: N requests from --concurrency keep-alive
+clients, drawn Zipf-style from a pool of --distinct random queries (so popular
+slices repeat, as on a dashboard), reporting latency percentiles for cache
+hits and misses. It starts its own server unless given --target host:port;
+in-process, clients and server share one event loop, so at high concurrency
+the percentiles include time queued behind other clients.
+
+Usage:
+  python cube.py build && python serve.py --port 8765
+  python serve.py --bench 5000 --concurrency 16
+"""
+import argparse, asyncio, json, random, time, traceback
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+import cube
+
+MAX_BY = 4
+MAX_BODY = 64 * 1024  # request bodies up to this are read and ignored; larger ones close the connection
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+
+class ResultCache:
+    """LRU of encoded responses, with hit/miss counters."""
+
+    def __init__(self, size):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        body = self.entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return body
+
+    def put(self, key, body):
+        self.entries[key] = body
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"entries": len(self.entries), "size": self.size, "hits": self.hits,
+                "misses": self.misses, "hit_rate": round(self.hits / total, 4) if total else None}
+
+
+def parse_query(qs):
+    """Query string -> (by, where, measure, min_n), normalized so equal queries
+    share a cache key; ValueError on a bad parameter."""
+    params = {k: ",".join(v) for k, v in parse_qs(qs, keep_blank_values=True).items()}
+    by = [d for d in params.pop("by", "").split(",") if d]
+    if not by:
+        raise ValueError("by is required, e.g. by=race,ltv")
+    if len(by) > MAX_BY:
+        raise ValueError(f"at most {MAX_BY} dimensions in by")
+    measure = params.pop("measure", "rate_spread")
+    try:
+        min_n = int(params.pop("min_n", "1"))
+    except ValueError:
+        raise ValueError("min_n must be an integer")
+    where = {}
+    for d, v in sorted(params.items()):
+        if d not in cube.QUERY_DIMS:
+            raise ValueError(f"unknown parameter {d}")
+        where[d] = tuple(sorted({x for x in v.split(",") if x}))
+    return tuple(by), tuple(where.items()), measure, min_n
+
+
+def encode(obj):
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+class Server:
+    def __init__(self, root=cube.CUBE_DIR, cache_size=1024):
+        self.root = root
+        self.cache = ResultCache(cache_size)
+        self.dims = (None, None)  # (cube version, encoded /dims)
+        self.requests = 0
+
+    async def route(self, path, qs):
+        """(status, body, cache 'hit'/'miss'/None)"""
+        if path == "/dims":
+            version = cube.version(self.root)
+            if self.dims[0] != version:
+                loop = asyncio.get_running_loop()
+                self.dims = (version, encode(await loop.run_in_executor(None, cube.dims, self.root)))
+            return 200, self.dims[1], None
+        if path == "/stats":
+            return 200, encode({"requests": self.requests, "cache": self.cache.stats()}), None
+        if path != "/query":
+            return 404, encode({"error": f"no route {path}"}), None
+        try:
+            by, where, measure, min_n = parse_query(qs)
+        except ValueError as e:
+            return 400, encode({"error": str(e)}), None
+        key = (cube.version(self.root), by, where, measure, min_n)
+        body = self.cache.get(key)
+        if body is not None:
+            return 200, body, "hit"
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                None, lambda: cube.query(by, dict(where), measure, min_n, self.root))
+        except ValueError as e:
+            return 400, encode({"error": str(e)}), "miss"
+        body = encode(result)
+        self.cache.put(key, body)
+        return 200, body, "miss"
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = h.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                parts = line.decode("latin-1").split()
+                if len(parts) != 3:
+                    break
+                method, target, version = parts
+                self.requests += 1
+                # Nothing takes a body, but it must leave the stream before the next request
+                drop_body = "transfer-encoding" in headers
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length, drop_body = 0, True
+                if 0 < length <= MAX_BODY:
+                    await reader.readexactly(length)
+                elif length:
+                    drop_body = True
+                if method != "GET":
+                    status, body, hit = 405, encode({"error": "read-only: GET only"}), None
+                else:
+                    url = urlsplit(target)
+                    try:
+                        status, body, hit = await self.route(url.path, url.query)
+                    except Exception as e:
+                        traceback.print_exc()
+                        status, body, hit = 500, encode({"error": f"{type(e).__name__}: {e}"}), None
+                close = (drop_body or headers.get("connection", "").lower() == "close"
+                         or version == "HTTP/1.0")
+                head = [f"HTTP/1.1 {status} {REASONS[status]}", "Content-Type: application/json",
+                        f"Content-Length: {len(body)}", f"Connection: {'close' if close else 'keep-alive'}"]
+                if hit:
+                    head.append(f"X-Cache: {hit}")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host, port):
+        return await asyncio.start_server(self.handle, host, port)
+
+
+# --- load generator ---
+
+def random_queries(dims, count, seed=0):
+    """`count` distinct query strings: 1-3 group-by dimensions, sometimes filtered
+    to one state and/or year, on either measure."""
+    rng = random.Random(seed)
+    out = set()
+    while len(out) < count:
+        by = rng.sample(cube.QUERY_DIMS, rng.randint(1, 3))
+        params = [f"by={','.join(by)}"]
+        for d in ("state", "year"):
+            if d not in by and dims[d] and rng.random() < 0.5:
+                params.append(f"{d}={rng.choice(dims[d])}")
+        if rng.random() < 0.3:
+            params.append("measure=interest_rate")
+        out.add("&".join(params))
+    return sorted(out)
+
+
+async def request(reader, writer, target):
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b""):
+            break
+        name, _, value = h.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers["content-length"]))
+    return status, headers, body
+
+
+async def hangup(writer):
+    writer.close()
+    await writer.wait_closed()
+
+
+def percentiles(ms):
+    ms = sorted(ms)
+    at = lambda q: ms[min(len(ms) - 1, int(q * len(ms)))]
+    return f"p50 {at(0.5):7.2f}ms  p90 {at(0.9):7.2f}ms  p99 {at(0.99):7.2f}ms  max {ms[-1]:7.2f}ms"
+
+
+async def bench(args):
+    server = None
+    if args.target:
+        host, port = args.target.rsplit(":", 1)
+    else:
+        server = await Server(args.root, args.cache_size).start("127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+
+    reader, writer = await asyncio.open_connection(host, int(port))
+    dims = json.loads((await request(reader, writer, "/dims"))[2])
+    before = json.loads((await request(reader, writer, "/stats"))[2])["cache"]
+    await hangup(writer)
+    pool = random_queries(dims, args.distinct, args.seed)
+    rng = random.Random(args.seed)
+    weights = [1 / (i + 1) for i in range(len(pool))]
+    plan = rng.choices(pool, weights, k=args.bench)
+    print(f"{args.bench:,} requests, {args.concurrency} clients, {len(pool)} distinct queries "
+          f"(Zipf), {len(dims['state'])} states, server {'in-process' if server else args.target}")
+
+    latency = {"hit": [], "miss": []}
+    errors = 0
+
+    async def client(i):
+        nonlocal errors
+        r, w = await asyncio.open_connection(host, int(port))
+        for target in plan[i::args.concurrency]:
+            t0 = time.perf_counter()
+            status, headers, _ = await request(r, w, "/query?" + target)
+            ms = (time.perf_counter() - t0) * 1000
+            if status != 200:
+                errors += 1
+            latency[headers.get("x-cache", "miss")].append(ms)
+        await hangup(w)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    reader, writer = await asyncio.open_connection(host, int(port))
+    after = json.loads((await request(reader, writer, "/stats"))[2])["cache"]
+    await hangup(writer)
+    if server:
+        await asyncio.sleep(0.01)  # let handlers see EOF before the loop shuts down
+        server.close()
+        await server.wait_closed()
+
+    every = latency["hit"] + latency["miss"]
+    print(f"  all    {percentiles(every)}  ({len(every) / elapsed:,.0f} req/s, {errors} errors)")
+    for kind in ("hit", "miss"):
+        if latency[kind]:
+            print(f"  {kind:6s} {percentiles(latency[kind])}  ({len(latency[kind]):,} requests)")
+    hits, misses = after["hits"] - before["hits"], after["misses"] - before["misses"]
+    print(f"  result cache: {hits / max(1, hits + misses):.1%} hit rate, "
+          f"{after['entries']}/{after['size']} entries")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--root", default=cube.CUBE_DIR, help="cube partitions (python cube.py build)")
+    ap.add_argument("--cache-size", type=int, default=1024, help="cached query results")
+    ap.add_argument("--bench", type=int, metavar="N", help="run the load generator for N requests")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--distinct", type=int, default=500, help="distinct queries in the bench mix")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--target", metavar="HOST:PORT", help="bench a running server")
+    args = ap.parse_args()
+
+    if args.bench:
+        asyncio.run(bench(args))
+        return
+    if not cube.partitions(args.root):
+        ap.error(f"no cube partitions in {args.root}; run `python cube.py build` first")
+
+    async def serve():
+        server = await Server(args.root, args.cache_size).start(args.host, args.port)
+        print(f"serving {args.root} on http://{args.host}:{args.port}/ (/dims, /query, /stats)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Streaming filter-and-slim for raw HMDA CSVs.
+
+Rows are filtered and projected one at a time and fed to a seeded reservoir, so
+memory is bounded by the sample size, not the size of the state.
+
+Two ingest engines produce the same rows in the same order:
+  rows   csv.DictReader + keep_row, pure Python
+  arrow  pyarrow.csv record batches with the same predicates as vectorized masks
+"""
+import csv, io, re
+
+import instrument
+from sampling import Reservoir
+
+KEEP_COLS = [
+    'activity_year','state_code','derived_race','derived_sex','derived_ethnicity',
+    'interest_rate','rate_spread','income','loan_amount','loan_to_value_ratio',
+    'debt_to_income_ratio','loan_type','loan_purpose','occupancy_type',
+    'property_value','applicant_age','applicant_credit_score_type',
+    'lien_status','conforming_loan_limit','total_units',
+    'lei',  # lender, for lender fixed effects in regression.py
+]
+
+LOAN_PURPOSES = ('1', '31', '32')  # home purchase or refi
+RACES = ('White', 'Black or African American', 'Asian', 'Joint', 'Race Not Available')
+ETHNICITIES = ('Hispanic or Latino', 'Not Hispanic or Latino')
+RATE_SENTINELS = ('Exempt', 'NA', '', 'N/A')
+FILTER_COLS = ['loan_purpose', 'occupancy_type', 'derived_race', 'derived_ethnicity', 'interest_rate']
+
+# Plain decimals always parse with float(); anything else is checked with float() itself
+PLAIN_NUMBER = r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
+
+try:
+    import pyarrow  # noqa: F401
+    DEFAULT_ENGINE = 'arrow'
+except ImportError:
+    DEFAULT_ENGINE = 'rows'
+
+
+def keep_row(row):
+    """Conventional analysis filter: purchase/refi, primary residence, usable race and rate."""
+    if row.get('loan_purpose') not in LOAN_PURPOSES:
+        return False
+    if row.get('occupancy_type') != '1':  # primary residence
+        return False
+
+    # Keep all races — Hispanic is in derived_ethnicity, not derived_race
+    if row.get('derived_race', '') not in RACES \
+       and row.get('derived_ethnicity', '') not in ETHNICITIES:
+        return False
+
+    # Must have interest rate
+    rate = row.get('interest_rate', 'Exempt')
+    if rate in RATE_SENTINELS:
+        return False
+    try:
+        float(rate)
+    except ValueError:
+        return False
+    return True
+
+
+def parse_floats(col, where=None):
+    """float64 array of a string column: the value float() gives, or null where it raises.
+
+    Plain decimals are cast in bulk; the rare other spellings float() may still
+    accept (' 6.5', '1_0', 'nan') are parsed one by one. Rows outside `where`
+    (a boolean mask) are not inspected and come back null.
+    """
+    import pyarrow as pa, pyarrow.compute as pc
+
+    plain = pc.fill_null(pc.match_substring_regex(col, PLAIN_NUMBER), False)
+    odd = pc.and_(pc.invert(plain), pc.is_valid(col))
+    if where is not None:
+        plain = pc.and_(plain, where)
+        odd = pc.fill_null(pc.and_(odd, where), False)
+    out = pc.if_else(plain, col, pa.scalar(None, pa.string())).cast(pa.float64())
+    if not pc.any(odd).as_py():
+        return out
+    values = out.to_pylist()
+    idx = pc.indices_nonzero(odd)
+    for i, v in zip(idx.to_pylist(), col.take(idx).to_pylist()):
+        try:
+            values[i] = float(v)
+        except ValueError:
+            pass
+    return pa.array(values, pa.float64())
+
+
+def iter_arrow_batches(path, header, block_size=16 << 20, column_names=None):
+    """Yield lists of formatted slim CSV lines for the rows of `path` that pass keep_row.
+
+    `path` may be a binary stream; pass `column_names` if its header line has
+    already been read off it.
+
+    Semantics match keep_row on csv.DictReader rows: missing filter columns never
+    match, interest_rate sentinels ('Exempt', 'NA', 'N/A', '') are dropped, and any
+    other rate is kept iff float() accepts it. Missing projected columns become ''.
+    Files must be well-formed (every row has the header's field count).
+    """
+    import pyarrow as pa, pyarrow.csv as pacsv, pyarrow.compute as pc
+
+    cols = list(dict.fromkeys(FILTER_COLS + header))
+    reader = pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(block_size=block_size, column_names=column_names),
+        convert_options=pacsv.ConvertOptions(
+            column_types={c: pa.string() for c in cols},
+            include_columns=cols, include_missing_columns=True,
+            strings_can_be_null=False, quoted_strings_can_be_null=False),
+    )
+    fmt = csv.writer(_Line()).writerow
+    for batch in reader:
+        if not batch.num_rows:
+            continue
+        col = {c: batch.column(c) for c in cols}
+        rate = col['interest_rate']
+        mask = pc.and_(
+            pc.and_(pc.is_in(col['loan_purpose'], value_set=pa.array(LOAN_PURPOSES)),
+                    pc.fill_null(pc.equal(col['occupancy_type'], '1'), False)),
+            pc.or_(pc.is_in(col['derived_race'], value_set=pa.array(RACES)),
+                   pc.is_in(col['derived_ethnicity'], value_set=pa.array(ETHNICITIES))))
+        mask = pc.and_(mask, pc.invert(pc.fill_null(
+            pc.is_in(rate, value_set=pa.array(RATE_SENTINELS)), True)))
+        mask = pc.and_(mask, pc.is_valid(parse_floats(rate, mask)))
+
+        kept = batch.filter(mask)
+        if not kept.num_rows:
+            continue
+        out = [pc.fill_null(kept.column(c), '') for c in header]
+        lines = pc.binary_join_element_wise(*out, ',').to_pylist()
+        needs_quote = None
+        for c in out:
+            q = pc.match_substring_regex(c, '[,"\r\n]')
+            needs_quote = q if needs_quote is None else pc.or_(needs_quote, q)
+        if pc.any(needs_quote).as_py():
+            values = [c.to_pylist() for c in out]
+            for i in pc.indices_nonzero(needs_quote).to_pylist():
+                lines[i] = fmt([v[i] for v in values])[:-2]
+        yield [line + '\r\n' for line in lines]
+
+
+class _Line:
+    """File stand-in so csv.writer(...).writerow returns the formatted line."""
+
+    def write(self, s):
+        return s
+
+
+class SlimSample:
+    """Filter rows into a fixed-size seeded reservoir, then write the slim CSV.
+
+    Each kept row is held as its formatted CSV line, and only while it is in the
+    reservoir, so memory is bounded by `cap` no matter how big the state is.
+    """
+
+    def __init__(self, out_path, cap, seed=42, header=None, engine=DEFAULT_ENGINE):
+        if engine not in ('rows', 'arrow'):
+            raise ValueError(f"unknown engine {engine!r}")
+        self.out_path = out_path
+        self.header = header
+        self.engine = engine
+        self.reservoir = Reservoir(cap, seed)
+        self._fmt = csv.writer(_Line()).writerow
+
+    @property
+    def total(self):
+        return self.reservoir.seen
+
+    @instrument.traced("slim.add_raw", rows=lambda kept: kept)
+    def add_raw(self, source):
+        """Filter a raw HMDA CSV into the sample. `source` is a path or a binary
+        stream (e.g. a fetch.ResponseStream). Returns rows kept."""
+        before = self.total
+        stream = source if hasattr(source, 'read') else None
+        if self.engine == 'arrow':
+            if stream is not None:
+                fieldnames = next(csv.reader([stream.readline().decode('utf-8')]))
+            else:
+                with open(source, 'r', newline='') as f:
+                    fieldnames = next(csv.reader(f))
+            if self.header is None:
+                self.header = [c for c in KEEP_COLS if c in fieldnames]
+            add = self.reservoir.add
+            batches = iter_arrow_batches(stream, self.header, column_names=fieldnames) \
+                if stream is not None else iter_arrow_batches(source, self.header)
+            for lines in batches:
+                for line in lines:
+                    add(line)
+            return self.total - before
+        f = io.TextIOWrapper(stream, encoding='utf-8', newline='') if stream is not None \
+            else open(source, 'r')
+        try:
+            reader = csv.DictReader(f)
+            if self.header is None:
+                self.header = [c for c in KEEP_COLS if c in reader.fieldnames]
+            header, fmt, add = self.header, self._fmt, self.reservoir.add
+            for row in reader:
+                if keep_row(row):
+                    add(fmt([row.get(c, '') for c in header]))
+        finally:
+            if stream is None:
+                f.close()
+            else:
+                f.detach()
+        return self.total - before
+
+    def add_slim(self, path):
+        """Add rows of an existing slim CSV as-is. Returns rows added."""
+        before = self.total
+        with open(path, 'r') as f:
+            reader = csv.DictReader(f)
+            if self.header is None:
+                self.header = reader.fieldnames
+            header, fmt, add = self.header, self._fmt, self.reservoir.add
+            for row in reader:
+                add(fmt([row.get(c, '') for c in header]))
+        return self.total - before
+
+    def text(self):
+        """The sampled slim CSV (header + rows, input order) as a string."""
+        return self._fmt(self.header) + ''.join(self.reservoir.items())
+
+    def finish(self):
+        """Write the sampled rows (in input order). Returns rows written."""
+        if not len(self.reservoir):
+            return 0
+        with open(self.out_path, 'w', newline='') as f:
+            f.write(self._fmt(self.header))
+            f.writelines(self.reservoir.items())
+        return len(self.reservoir)
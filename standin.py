@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Local stand-in for the HMDA data-browser API, for testing downloads offline.
+
+Serves <dir>/<ST>_<YEAR>_raw.csv for /view/csv?states=ST&years=YEAR, like the
+real endpoint, with Content-Length, an MD5 ETag (as S3 does), Last-Modified,
+and Range / If-Range support. Faults can be injected per response:
+
+  --drop P   cut the body off at a random byte and close the connection
+  --fail P   answer 503
+  --html P   answer 200 with an HTML error page instead of the CSV
+  --kbps N   throttle the body, so a run can be interrupted part way
+
+With --gzip, clients that send Accept-Encoding: gzip get the file gzipped
+(Content-Encoding: gzip, as a pre-compressed S3 object would be: the ETag and
+ranges are over the compressed bytes).
+
+`--check` writes a few synthetic extracts (synth.py), serves them with faults, downloads
+them with fetch.Downloader, streams them again (Downloader.stream) and verifies
+every byte; with --drop 0.5 most files only arrive over several resumed requests.
+
+Usage:
+  python standin.py data/raw --port 8000 --drop 0.3
+  HMDA_API_BASE=http://127.0.0.1:8000 python ingest.py --states VT --years 2022
+  python standin.py --check
+"""
+import argparse, email.utils, gzip, hashlib, io, os, random, re, shutil, tempfile, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import fetch
+
+ERROR_PAGE = b"<html><body><h1>Service temporarily unavailable</h1></body></html>\n" * 20
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    root = "."
+    drop = fail = html = 0.0
+    kbps = 0
+    gzip = False
+    rng = random.Random(0)
+    served = {"requests": 0, "drops": 0, "fails": 0, "html": 0, "ranges": 0, "gzip": 0}
+    _etags = {}
+    _gzipped = {}
+    _lock = threading.Lock()
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _chance(self, p):
+        with self._lock:
+            return self.rng.random() < p
+
+    def _count(self, what):
+        with self._lock:
+            self.served[what] += 1
+
+    def _path(self):
+        url = urlsplit(self.path)
+        q = parse_qs(url.query)
+        if url.path.endswith("/view/csv") and "states" in q and "years" in q:
+            name = f"{q['states'][0]}_{q['years'][0]}_raw.csv"
+        else:
+            name = url.path.lstrip("/")
+        root = os.path.realpath(self.root)
+        path = os.path.realpath(os.path.join(root, name))
+        return path if path.startswith(root + os.sep) else None
+
+    def _etag(self, path):
+        st = os.stat(path)
+        key = (path, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            if key not in self._etags:
+                with open(path, "rb") as f:
+                    self._etags[key] = f'"{hashlib.md5(f.read()).hexdigest()}"'
+            return self._etags[key]
+
+    def _gzip(self, path):
+        """(compressed bytes, their MD5 ETag)"""
+        st = os.stat(path)
+        key = (path, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            if key not in self._gzipped:
+                with open(path, "rb") as f:
+                    body = gzip.compress(f.read(), compresslevel=6, mtime=0)
+                self._gzipped[key] = body, f'"{hashlib.md5(body).hexdigest()}"'
+            return self._gzipped[key]
+
+    def _send(self, status, body, headers=()):
+        self.send_response(status)
+        for k, v in headers:
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._count("requests")
+        path = self._path()
+        if not path or not os.path.isfile(path):
+            return self._send(404, b"not found\n")
+        if self._chance(self.fail):
+            self._count("fails")
+            return self._send(503, b"busy\n")
+        if self._chance(self.html):
+            self._count("html")
+            return self._send(200, ERROR_PAGE, [("Content-Type", "text/html")])
+
+        gz = None
+        if self.gzip and "gzip" in self.headers.get("Accept-Encoding", ""):
+            gz, etag = self._gzip(path)
+            size = len(gz)
+            self._count("gzip")
+        else:
+            size = os.path.getsize(path)
+            etag = self._etag(path)
+        modified = email.utils.formatdate(os.path.getmtime(path), usegmt=True)
+        start, status = 0, 200
+        m = re.match(r"bytes=(\d+)-$", self.headers.get("Range", ""))
+        if m and self.headers.get("If-Range", etag) in (etag, modified):
+            start = int(m.group(1))
+            if start >= size:
+                return self._send(416, b"", [("Content-Range", f"bytes */{size}")])
+            status = 206
+            self._count("ranges")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(size - start))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", modified)
+        self.send_header("Accept-Ranges", "bytes")
+        if gz is not None:
+            self.send_header("Content-Encoding", "gzip")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+        self.end_headers()
+
+        cut = None
+        if self._chance(self.drop):
+            self._count("drops")
+            with self._lock:
+                cut = start + self.rng.randrange(size - start)
+        with (io.BytesIO(gz) if gz is not None else open(path, "rb")) as f:
+            f.seek(start)
+            pos = start
+            step = 64 << 10
+            while pos < size:
+                n = min(step, size - pos, (cut - pos) if cut is not None else size)
+                if n <= 0:
+                    self.close_connection = True
+                    return
+                self.wfile.write(f.read(n))
+                pos += n
+                if self.kbps:
+                    time.sleep(n / (self.kbps * 1024))
+
+
+def serve(root, port, host="127.0.0.1", **faults):
+    """Start a stand-in server in a background thread; returns the server."""
+    handler = type("StandinHandler", (Handler,), {"root": root, **faults})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def check(args):
+    import synth  # numpy + pyarrow, which serving doesn't need
+    tmp = tempfile.mkdtemp()
+    try:
+        src, dst = os.path.join(tmp, "src"), os.path.join(tmp, "dst")
+        os.makedirs(src)
+        os.makedirs(dst)
+        states = ["VT", "WY", "RI", "DC", "DE", "ND"]
+        synth.generate(src, args.rows * len(states), states, [2022], quiet=True)
+        server = serve(src, 0, drop=args.drop, fail=args.fail, html=args.html, gzip=args.gzip)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        dl = fetch.Downloader(concurrency=3, rate=0, retries=args.retries, backoff=0.01,
+                              journal=os.path.join(dst, "_downloads.jsonl"))
+        jobs = [(st, fetch.hmda_url(st, 2022, base), os.path.join(dst, f"{st}_2022_raw.csv")) for st in states]
+        t0 = time.time()
+        ok = 0
+        for st, path in dl.fetch_many(jobs):
+            same = path is not None and fetch.check_csv(path)["sha256"] == \
+                fetch.check_csv(os.path.join(src, os.path.basename(path)))["sha256"]
+            ok += same
+            print(f"  {st}: {'identical' if same else 'FAILED'}")
+        digest = lambda body: hashlib.sha256(body.read()).hexdigest()
+        for st, got in dl.stream_many([(st, url) for st, url, _ in jobs], digest):
+            with open(os.path.join(src, f"{st}_2022_raw.csv"), "rb") as f:
+                same = got is not None and got[0] == got[1]["sha256"] == hashlib.sha256(f.read()).hexdigest()
+            ok += same
+            print(f"  {st} streamed: {'identical' if same else 'FAILED'}")
+        server.shutdown()
+        print(f"{ok}/{2 * len(states)} verified in {time.time() - t0:.1f}s; server: {Handler.served}")
+        print(f"Downloads: {dl.stats.report()}")
+        leftovers = [f for f in os.listdir(dst) if f.endswith(".part")]
+        if leftovers:
+            print(f"leftover partial files: {leftovers}")
+        return ok == 2 * len(states) and not leftovers
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("root", nargs="?", default=".", help="directory of <ST>_<YEAR>_raw.csv files")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--drop", type=float, default=0.0, help="probability a body is cut off")
+    ap.add_argument("--fail", type=float, default=0.0, help="probability of a 503")
+    ap.add_argument("--html", type=float, default=0.0, help="probability of an HTML error page")
+    ap.add_argument("--kbps", type=int, default=0, help="throttle bodies to N KB/s")
+    ap.add_argument("--gzip", action="store_true", help="gzip bodies for clients that accept it")
+    ap.add_argument("--check", action="store_true", help="download synthetic files through faults and verify")
+    ap.add_argument("--rows", type=int, default=20000, help="rows per synthetic file, on average (--check)")
+    ap.add_argument("--retries", type=int, default=12, help="Downloader retries (--check)")
+    args = ap.parse_args()
+
+    if args.check:
+        if not any((args.drop, args.fail, args.html)):
+            args.drop, args.fail, args.html = 0.5, 0.1, 0.1
+        raise SystemExit(0 if check(args) else 1)
+    server = serve(args.root, args.port, drop=args.drop, fail=args.fail, html=args.html,
+                   kbps=args.kbps, gzip=args.gzip)
+    print(f"serving {os.path.abspath(args.root)} on http://127.0.0.1:{args.port} "
+          f"(drop {args.drop}, fail {args.fail}, html {args.html}, gzip {args.gzip}); Ctrl-C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
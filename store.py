@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Typed, partitioned Parquet store for slimmed HMDA rows.
+
+Layout: data/store/state_code=XX/activity_year=YYYY/part-0.parquet (hive style).
+Numeric columns are float64, null wherever float() would fail ('NA', 'Exempt',
+''); low-cardinality text columns are dictionary-encoded. Readers get column projection and predicate
+pushdown (partition pruning plus row-group statistics) through pyarrow.dataset.
+
+_manifest.json records every partition's row count and source checksum, so a
+single (state, year) can be re-ingested without touching the others (ingest.py)
+and downstream builds can tell which states changed.
+
+Usage:
+  python store.py convert        # one-time: data/*_slim[_merged].csv -> data/store
+  python store.py info
+"""
+import argparse, hashlib, json, os, shutil, sys, time
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from slim import KEEP_COLS, parse_floats
+
+DATA_DIR = "data"
+STORE_DIR = os.path.join(DATA_DIR, "store")
+
+NUMERIC_COLS = [
+    'interest_rate', 'rate_spread', 'income', 'loan_amount',
+    'loan_to_value_ratio', 'property_value',
+]
+PARTITION_COLS = ['state_code', 'activity_year']
+CATEGORICAL_COLS = [c for c in KEEP_COLS if c not in NUMERIC_COLS + PARTITION_COLS]
+# Too many levels per partition for an int8 dictionary index
+WIDE_CATEGORICAL_COLS = ['lei']
+
+PARTITIONING = ds.partitioning(
+    pa.schema([('state_code', pa.string()), ('activity_year', pa.int16())]), flavor='hive')
+
+# Schema of the data files (partition columns live in the directory names)
+FILE_SCHEMA = pa.schema(
+    [(c, pa.float64()) if c in NUMERIC_COLS
+     else (c, pa.dictionary(pa.int32() if c in WIDE_CATEGORICAL_COLS else pa.int8(), pa.string()))
+     for c in KEEP_COLS if c not in PARTITION_COLS])
+# Files written before a column was added read it back as nulls
+DATASET_SCHEMA = pa.schema(list(FILE_SCHEMA) + [
+    ('state_code', pa.string()), ('activity_year', pa.int16())])
+
+
+def slim_csv_path(state, data_dir=DATA_DIR):
+    """Prefer the merged 6-year file, fall back to the original slim."""
+    for suffix in ('_slim_merged.csv', '_slim.csv'):
+        path = os.path.join(data_dir, f"{state}{suffix}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def slim_csv_states(data_dir=DATA_DIR):
+    out = set()
+    for f in os.listdir(data_dir):
+        for suffix in ('_slim_merged.csv', '_slim.csv'):
+            if f.endswith(suffix):
+                out.add(f[:-len(suffix)])
+    return sorted(out)
+
+
+def partition_dir(state, year, root=STORE_DIR):
+    return os.path.join(root, f"state_code={state}", f"activity_year={year}")
+
+
+def typed_table(table):
+    """Cast an all-string slim table to FILE_SCHEMA (+ activity_year as int16)."""
+    cols = {}
+    for field in FILE_SCHEMA:
+        c = field.name
+        if c not in table.column_names:
+            cols[c] = pa.nulls(table.num_rows, field.type)
+            continue
+        col = table.column(c)
+        if c in NUMERIC_COLS:
+            col = parse_floats(col)
+        else:
+            col = col.cast(pa.string()).dictionary_encode().cast(field.type)
+        cols[c] = col
+    cols['activity_year'] = table.column('activity_year').cast(pa.int16())
+    return pa.table(cols)
+
+
+def write_partition(table, state, year, root=STORE_DIR):
+    """Atomically replace one (state, year) partition with `table` (FILE_SCHEMA columns)."""
+    final = partition_dir(state, year, root)
+    tmp = final + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    pq.write_table(table.select(FILE_SCHEMA.names), os.path.join(tmp, "part-0.parquet"),
+                   compression='zstd', row_group_size=128 * 1024)
+    shutil.rmtree(final, ignore_errors=True)
+    os.replace(tmp, final)
+    return final
+
+
+def read_slim_csv(source, header=None, columns=None):
+    """Read a slim CSV (path or file-like) with every column (or `columns`) as a string."""
+    if header is None:
+        with open(source, newline='') as f:
+            header = f.readline().strip().split(',')
+    return pacsv.read_csv(source, convert_options=pacsv.ConvertOptions(
+        column_types={c: pa.string() for c in header},
+        include_columns=[c for c in columns if c in header] if columns else None,
+        strings_can_be_null=False, quoted_strings_can_be_null=False))
+
+
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for buf in iter(lambda: f.read(1 << 20), b''):
+            h.update(buf)
+    return h.hexdigest()
+
+
+def manifest_path(root=STORE_DIR):
+    return os.path.join(root, "_manifest.json")
+
+
+def load_manifest(root=STORE_DIR):
+    """{"partitions": {"VT/2022": {"rows", "source", "source_sha256", ...}}}"""
+    try:
+        with open(manifest_path(root)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"partitions": {}}
+
+
+def save_manifest(manifest, root=STORE_DIR):
+    os.makedirs(root, exist_ok=True)
+    tmp = manifest_path(root) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, manifest_path(root))
+
+
+def record_partition(manifest, state, year, rows, source, source_sha256):
+    manifest["partitions"][f"{state}/{year}"] = {
+        "rows": rows,
+        "source": source,
+        "source_sha256": source_sha256,
+        "ingested_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def partition_entry(manifest, state, year):
+    return manifest["partitions"].get(f"{state}/{year}")
+
+
+def manifest_years(manifest):
+    """Years with at least one non-empty partition."""
+    return sorted({int(k.split("/")[1]) for k, v in manifest["partitions"].items() if v["rows"]})
+
+
+def state_fingerprint(manifest, state):
+    """Hash of a state's partition entries: changes iff one of its partitions changed."""
+    entries = sorted((k, v["source_sha256"], v["rows"]) for k, v in manifest["partitions"].items()
+                     if k.split("/")[0] == state)
+    return hashlib.sha256(json.dumps(entries).encode()).hexdigest()[:16] if entries else None
+
+
+def convert_state(state, data_dir=DATA_DIR, root=STORE_DIR, manifest=None):
+    """Split one state's slim CSV into typed per-year partitions. Returns {year: rows}."""
+    path = slim_csv_path(state, data_dir)
+    if not path:
+        return {}
+    table = typed_table(read_slim_csv(path))
+    digest = sha256_file(path) if manifest is not None else None
+    years = table.column('activity_year')
+    out = {}
+    for year in sorted(pc.unique(years).drop_null().to_pylist()):
+        part = table.filter(pc.equal(years, year))
+        write_partition(part, state, year, root)
+        out[year] = part.num_rows
+        if manifest is not None:
+            record_partition(manifest, state, year, part.num_rows, os.path.basename(path), digest)
+    return out
+
+
+def exists(root=STORE_DIR):
+    return os.path.isdir(root) and any(d.startswith("state_code=") for d in os.listdir(root))
+
+
+def states(root=STORE_DIR):
+    return sorted(d.split("=", 1)[1] for d in os.listdir(root) if d.startswith("state_code="))
+
+
+def dataset(root=STORE_DIR):
+    return ds.dataset(root, schema=DATASET_SCHEMA, format="parquet", partitioning=PARTITIONING)
+
+
+def _filter(states=None, years=None, where=None):
+    expr = None
+    for e in (ds.field('state_code').isin(list(states)) if states else None,
+              ds.field('activity_year').isin(list(years)) if years else None,
+              where):
+        if e is not None:
+            expr = e if expr is None else expr & e
+    return expr
+
+
+def read(columns=None, states=None, years=None, where=None, root=STORE_DIR):
+    """Read a pyarrow Table.
+
+    `columns` projects; `states`/`years` prune partitions; `where` is any
+    pyarrow.dataset expression, e.g. `ds.field('rate_spread') > 0`, pushed down
+    to Parquet row-group statistics.
+    """
+    return dataset(root).to_table(columns=columns, filter=_filter(states, years, where))
+
+
+def iter_batches(columns=None, states=None, years=None, where=None, batch_size=256 * 1024,
+                 root=STORE_DIR):
+    """Stream record batches with the same projection/pushdown as `read`."""
+    scanner = dataset(root).scanner(columns=columns, filter=_filter(states, years, where),
+                                    batch_size=batch_size)
+    yield from scanner.to_batches()
+
+
+def read_pandas(columns=None, states=None, years=None, where=None, categorical=True,
+                root=STORE_DIR):
+    """`read` as a DataFrame. With categorical=False, text columns come back as plain str."""
+    table = read(columns, states, years, where, root)
+    if not categorical:
+        table = pa.table({
+            c: (col.cast(pa.string()) if pa.types.is_dictionary(col.type) else col)
+            for c, col in zip(table.column_names, table.columns)})
+    return table.to_pandas()
+
+
+def du(path):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(path) for f in fs)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("command", choices=["convert", "info"])
+    args = ap.parse_args()
+
+    if args.command == "convert":
+        csv_bytes = 0
+        manifest = load_manifest()
+        for state in slim_csv_states():
+            counts = convert_state(state, manifest=manifest)
+            save_manifest(manifest)
+            csv_bytes += os.path.getsize(slim_csv_path(state))
+            print(f"  {state}: {sum(counts.values()):,} rows in {len(counts)} partitions")
+        print(f"CSV {csv_bytes / 1e6:,.1f} MB -> Parquet {du(STORE_DIR) / 1e6:,.1f} MB")
+    else:
+        if not exists():
+            sys.exit(f"no store at {STORE_DIR}")
+        t = read(columns=['activity_year'])
+        print(f"{len(states())} states, {t.num_rows:,} rows, {du(STORE_DIR) / 1e6:,.1f} MB")
+        manifest = load_manifest()
+        years = manifest_years(manifest)
+        if years:
+            print(f"manifest: {len(manifest['partitions'])} partitions, years {years[0]}-{years[-1]}")
+
+
+if __name__ == "__main__":
+    main()
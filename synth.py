@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Synthetic HMDA extracts at any scale, for benchmarks and offline runs.
+
+Writes <out>/<ST>_<YEAR>_raw.csv files shaped like the data-browser CSVs:
+KEEP_COLS plus the raw-only columns the filter skips, in LAR order. Rows are
+split over states by population and over years by origination volume (the
+2020-21 refinance boom). Values follow the public LAR's rough marginals,
+including what the scripts have to cope with:
+
+  - 'NA' and 'Exempt' in the rate, spread, LTV, DTI, income and property
+    value columns ('Exempt' together, as small lenders report it)
+  - DTI as the LAR mix of bands and single percentages (regression.DTI_MAP)
+  - races, ethnicities, purposes and occupancies that the filter drops
+  - a few malformed rates ('N/A', blank, padded, not a number) that the two
+    filter engines must treat alike
+  - rates that move with the year, loan type, LTV, DTI and race, so the
+    regressions and gaps have something to find
+
+Generation is vectorized (pyarrow), a chunk of rows at a time, so 50M rows
+take minutes and bounded memory. Output is deterministic for a seed.
+A synth.json next to the files records the parameters. `frames` yields the
+same rows as DataFrames, for benchmarks that start from loaded rows.
+
+This is the one source of HMDA-shaped test data: the benchmarks and
+standin.py --check all draw from it.
+
+  python synth.py --rows 5000000 --out data/synth
+  python synth.py --rows 1000000 --states VT WY --years 2022 --out data/raw
+  python standin.py data/raw    # serve them to ingest.py
+"""
+import argparse, json, os, time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+from slim import KEEP_COLS
+
+# 2020 population, millions: LAR volume roughly follows it
+STATE_WEIGHTS = {
+    "AL": 5.0, "AK": 0.73, "AZ": 7.2, "AR": 3.0, "CA": 39.5, "CO": 5.8, "CT": 3.6, "DC": 0.69,
+    "DE": 1.0, "FL": 21.5, "GA": 10.7, "HI": 1.5, "ID": 1.8, "IL": 12.8, "IN": 6.8, "IA": 3.2,
+    "KS": 2.9, "KY": 4.5, "LA": 4.7, "ME": 1.4, "MD": 6.2, "MA": 7.0, "MI": 10.1, "MN": 5.7,
+    "MS": 3.0, "MO": 6.2, "MT": 1.1, "NE": 2.0, "NV": 3.1, "NH": 1.4, "NJ": 9.3, "NM": 2.1,
+    "NY": 20.2, "NC": 10.4, "ND": 0.78, "OH": 11.8, "OK": 4.0, "OR": 4.2, "PA": 13.0, "RI": 1.1,
+    "SC": 5.1, "SD": 0.89, "TN": 6.9, "TX": 29.1, "UT": 3.3, "VA": 8.6, "VT": 0.64, "WA": 7.7,
+    "WV": 1.8, "WI": 5.9, "WY": 0.58,
+}
+# Originations by year, relative; average rate and APOR
+YEARS = {2018: (1.0, 4.75, 4.55), 2019: (1.15, 4.15, 3.95), 2020: (1.9, 3.15, 2.95),
+         2021: (1.9, 3.05, 2.85), 2022: (1.0, 5.10, 4.90), 2023: (0.7, 6.85, 6.60)}
+
+# (value, weight); rate shift in points where it matters
+RACE = [('White', 0.62, 0.0), ('Race Not Available', 0.17, 0.02),
+        ('Black or African American', 0.07, 0.12), ('Asian', 0.06, -0.05),
+        ('Joint', 0.04, 0.0), ('American Indian or Alaska Native', 0.006, 0.15),
+        ('Native Hawaiian or Other Pacific Islander', 0.002, 0.08),
+        ('2 or more minority races', 0.002, 0.05), ('Free Form Text Only', 0.0005, 0.0)]
+ETHNICITY = [('Not Hispanic or Latino', 0.74), ('Ethnicity Not Available', 0.14),
+             ('Hispanic or Latino', 0.09), ('Joint', 0.03), ('Free Form Text Only', 0.001)]
+SEX = [('Male', 0.38), ('Joint', 0.28), ('Female', 0.22), ('Sex Not Available', 0.12)]
+PURPOSE = [('1', 0.45), ('31', 0.25), ('32', 0.12), ('4', 0.09), ('2', 0.08), ('5', 0.01)]
+OCCUPANCY = [('1', 0.90), ('3', 0.07), ('2', 0.03)]
+# loan type: share, rate shift, typical LTV
+LOAN_TYPE = [('1', 0.72, 0.0, 80.0), ('2', 0.16, -0.10, 96.5), ('3', 0.10, -0.25, 100.0),
+             ('4', 0.02, -0.15, 100.0)]
+DTI = [('<20%', 0.05, -0.05), ('20%-<30%', 0.15, -0.03), ('30%-<36%', 0.17, 0.0)] + \
+      [(str(d), 0.025, 0.002 * (d - 36)) for d in range(36, 50)] + \
+      [('50%-60%', 0.08, 0.06), ('>60%', 0.01, 0.1), ('NA', 0.13, 0.0)]
+AGE = [('<25', 0.05), ('25-34', 0.24), ('35-44', 0.23), ('45-54', 0.18), ('55-64', 0.14),
+       ('65-74', 0.08), ('>74', 0.03), ('8888', 0.05)]
+CREDIT_SCORE = [('1', 0.35), ('2', 0.25), ('3', 0.2), ('9', 0.12), ('8', 0.05), ('1111', 0.03)]
+UNITS = [('1', 0.97), ('2', 0.015), ('3', 0.006), ('4', 0.006), ('5-24', 0.003)]
+CONFORMING = [('C', 0.93), ('NC', 0.05), ('U', 0.01), ('NA', 0.01)]
+LOAN_TERM = [('360', 0.78), ('180', 0.1), ('240', 0.04), ('120', 0.03), ('300', 0.02), ('NA', 0.03)]
+LENDERS = 4000
+EXEMPT = 0.02
+# Share of rates garbled in ways float() accepts or rejects
+ODD_RATE = 0.002
+ODD_RATES = ['N/A', '', ' 6.5', '6.5 ', 'abc', '1_0']
+
+# Raw columns around KEEP_COLS, in data-browser order
+RAW_COLS = ['activity_year', 'lei', 'derived_msa-md', 'state_code', 'county_code', 'census_tract',
+            'conforming_loan_limit', 'derived_loan_product_type', 'derived_dwelling_category',
+            'derived_ethnicity', 'derived_race', 'derived_sex', 'action_taken', 'purchaser_type',
+            'preapproval', 'loan_type', 'loan_purpose', 'lien_status', 'reverse_mortgage',
+            'open-end_line_of_credit', 'business_or_commercial_purpose', 'loan_amount',
+            'loan_to_value_ratio', 'interest_rate', 'rate_spread', 'hoepa_status',
+            'total_loan_costs', 'origination_charges', 'loan_term', 'property_value',
+            'construction_method', 'occupancy_type', 'total_units', 'income',
+            'debt_to_income_ratio', 'applicant_credit_score_type', 'applicant_ethnicity-1',
+            'applicant_race-1', 'applicant_sex', 'applicant_age', 'submission_of_application',
+            'aus-1', 'tract_population', 'tract_minority_population_percent',
+            'ffiec_msa_md_median_family_income', 'tract_owner_occupied_units']
+assert set(KEEP_COLS) <= set(RAW_COLS)
+CHUNK = 250000
+# Bump when the rows change, so generate() doesn't reuse files from an older version
+VERSION = 2
+
+
+def allocate(rows, states, years):
+    """rows split over (state, year) by STATE_WEIGHTS x year volume; at least 1 each."""
+    keys = [(s, y) for s in states for y in years]
+    w = np.array([STATE_WEIGHTS.get(s, 1.0) * YEARS.get(y, (1.0,))[0] for s, y in keys])
+    n = np.maximum(np.floor(rows * w / w.sum()).astype(int), 1)
+    n[np.argmax(w)] += max(0, rows - n.sum())
+    return dict(zip(keys, n.tolist()))
+
+
+class Chunker:
+    """Draws chunks of rows for one (state, year)."""
+
+    def __init__(self, state, year, seed):
+        self.state, self.year = state, year
+        self.rng = np.random.default_rng([seed, year, sum(map(ord, state)) * 7919])
+        lei_rng = np.random.default_rng([seed, 0])
+        alnum = np.frombuffer(b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)
+        self.leis = pa.array(alnum[lei_rng.integers(0, 36, (LENDERS, 20))].view("S20").ravel()
+                             .astype(str))
+        rank = np.arange(LENDERS)
+        self.lei_p = 1 / (rank + 10.0) ** 1.1
+        self.lei_p /= self.lei_p.sum()
+        fips = 1 + sorted(STATE_WEIGHTS).index(state) if state in STATE_WEIGHTS else 99
+        self.counties = pa.array([f"{fips:02d}{c:03d}" for c in range(1, 200, 2)])
+        self.tracts = pa.array([f"{fips:02d}{c:03d}{t:06d}" for c in range(1, 200, 2)
+                                for t in (100, 200, 300, 401, 502, 9800)])
+
+    def pick(self, table, n):
+        """(indices, string array) drawn from a [(value, weight, ...)] table."""
+        p = np.array([t[1] for t in table], dtype=float)
+        idx = self.rng.choice(len(table), n, p=p / p.sum())
+        return idx, pc.take(pa.array([t[0] for t in table]), pa.array(idx))
+
+    def uniform(self, values, n):
+        return pc.take(pa.array(values), pa.array(self.rng.integers(0, len(values), n)))
+
+    def chunk(self, n):
+        rng = self.rng
+        _, base_rate, apor = YEARS.get(self.year, YEARS[2022])
+        cols = {}
+        race_i, cols['derived_race'] = self.pick(RACE, n)
+        _, cols['derived_ethnicity'] = self.pick(ETHNICITY, n)
+        _, cols['derived_sex'] = self.pick(SEX, n)
+        _, cols['loan_purpose'] = self.pick(PURPOSE, n)
+        _, cols['occupancy_type'] = self.pick(OCCUPANCY, n)
+        lt_i, cols['loan_type'] = self.pick(LOAN_TYPE, n)
+        dti_i, dti = self.pick(DTI, n)
+        _, cols['applicant_age'] = self.pick(AGE, n)
+        _, cols['applicant_credit_score_type'] = self.pick(CREDIT_SCORE, n)
+        _, cols['total_units'] = self.pick(UNITS, n)
+        _, cols['conforming_loan_limit'] = self.pick(CONFORMING, n)
+        _, cols['loan_term'] = self.pick(LOAN_TERM, n)
+        hispanic = pc.equal(cols['derived_ethnicity'], 'Hispanic or Latino').to_numpy(zero_copy_only=False)
+        exempt = rng.random(n) < EXEMPT
+
+        # Income in $K (lognormal, lower for Black and Hispanic applicants)
+        black = race_i == 2
+        income = np.round(np.exp(rng.normal(np.log(98) - 0.25 * (black | hispanic), 0.65, n)))
+        income_na = rng.random(n) < 0.03
+        # Loan amount: 10K bands reported at the midpoint, ~2.7x income
+        loan = np.exp(rng.normal(np.log(income * 2.7), 0.45)) * 1000
+        loan = np.clip(np.floor(loan / 10000) * 10000 + 5000, 5000, 5e6)
+        # LTV around the loan type's usual value
+        typical = np.array([t[3] for t in LOAN_TYPE])[lt_i]
+        ltv = np.where(rng.random(n) < 0.5, typical, typical - np.abs(rng.normal(0, 18, n)))
+        ltv = np.round(np.clip(ltv, 5, 105), 3)
+        ltv_na = rng.random(n) < 0.05
+        value = np.floor(loan / (ltv / 100) / 10000) * 10000 + 5000
+
+        rate = (base_rate + np.array([t[2] for t in LOAN_TYPE])[lt_i]
+                + np.array([t[2] for t in RACE])[race_i] + 0.06 * hispanic
+                + np.array([t[2] for t in DTI])[dti_i] + 0.01 * np.maximum(ltv - 80, 0)
+                + rng.normal(0, 0.45, n))
+        rate = np.round(np.clip(rate, 0.5, 15) * 8) / 8  # mostly eighths, as quoted
+        odd = rng.random(n) < 0.25
+        rate[odd] = np.round(rate[odd] + rng.normal(0, 0.06, odd.sum()), 3)
+        rate_na = rng.random(n) < 0.02
+        spread = np.round(rate - apor + rng.normal(0, 0.12, n), 3)
+        spread_na = rate_na | (rng.random(n) < 0.06)
+
+        def text(values, na=None, integer=False):
+            arr = pc.cast(pa.array(values.astype(np.int64) if integer else values), pa.string())
+            if na is not None:
+                arr = pc.if_else(pa.array(na), pa.scalar('NA'), arr)
+            return pc.if_else(pa.array(exempt), pa.scalar('Exempt'), arr)
+
+        cols['interest_rate'] = text(rate, rate_na)
+        typo = rng.random(n) < ODD_RATE
+        if typo.any():
+            cols['interest_rate'] = pc.if_else(pa.array(typo), self.uniform(ODD_RATES, n),
+                                               cols['interest_rate'])
+        cols['rate_spread'] = text(spread, spread_na)
+        cols['loan_to_value_ratio'] = text(ltv, ltv_na)
+        cols['property_value'] = text(value, rng.random(n) < 0.02, integer=True)
+        cols['debt_to_income_ratio'] = pc.if_else(pa.array(exempt), pa.scalar('Exempt'), dti)
+        cols['income'] = pc.if_else(pa.array(income_na), pa.scalar('NA'),
+                                    pc.cast(pa.array(income.astype(np.int64)), pa.string()))
+        cols['loan_amount'] = pc.cast(pa.array(loan.astype(np.int64)), pa.string())
+        cols['lei'] = pc.take(self.leis, pa.array(rng.choice(LENDERS, n, p=self.lei_p)))
+        cols['activity_year'] = pa.array(np.full(n, str(self.year)))
+        cols['state_code'] = pa.array(np.full(n, self.state))
+        cols['lien_status'] = pc.if_else(pa.array(rng.random(n) < 0.08), pa.scalar('2'), pa.scalar('1'))
+
+        county = rng.integers(0, len(self.counties), n)
+        cols['county_code'] = pc.take(self.counties, pa.array(county))
+        cols['census_tract'] = pc.take(self.tracts, pa.array(county * 6 + rng.integers(0, 6, n)))
+        cols['derived_msa-md'] = self.uniform(['99999', '12060', '31080', '35620', '16980'], n)
+        cols['derived_loan_product_type'] = self.uniform(['Conventional:First Lien', 'FHA:First Lien',
+                                                           'VA:First Lien', 'Conventional:Subordinate Lien'], n)
+        cols['derived_dwelling_category'] = self.uniform(['Single Family (1-4 Units):Site-Built',
+                                                           'Single Family (1-4 Units):Manufactured'], n)
+        cols['action_taken'] = pa.array(np.full(n, '1'))
+        cols['total_loan_costs'] = text(rng.integers(1000, 12000, n), rng.random(n) < 0.3, integer=True)
+        cols['origination_charges'] = text(rng.integers(0, 5000, n), rng.random(n) < 0.3, integer=True)
+        cols['tract_population'] = pc.cast(pa.array(rng.integers(800, 9000, n)), pa.string())
+        cols['tract_minority_population_percent'] = pc.cast(
+            pa.array(np.round(rng.uniform(1, 99, n), 2)), pa.string())
+        cols['ffiec_msa_md_median_family_income'] = pc.cast(
+            pa.array(rng.integers(60, 140, n) * 1000), pa.string())
+        cols['tract_owner_occupied_units'] = pc.cast(pa.array(rng.integers(100, 3000, n)), pa.string())
+        for c, values in [('purchaser_type', ['0', '1', '3', '5', '6', '71']), ('preapproval', ['2', '2', '1']),
+                          ('reverse_mortgage', ['2']), ('open-end_line_of_credit', ['2', '2', '2', '1']),
+                          ('business_or_commercial_purpose', ['2']), ('hoepa_status', ['2', '3']),
+                          ('construction_method', ['1', '1', '1', '2']), ('applicant_ethnicity-1', ['1', '2', '3']),
+                          ('applicant_race-1', ['5', '3', '2', '6']), ('applicant_sex', ['1', '2', '3']),
+                          ('submission_of_application', ['1', '2']), ('aus-1', ['1', '2', '6'])]:
+            cols[c] = self.uniform(values, n)
+        return pa.table([cols[c] for c in RAW_COLS], names=RAW_COLS)
+
+
+def write_extract(path, state, year, rows, seed=0):
+    """One <ST>_<YEAR>_raw.csv of `rows` rows. Returns bytes written."""
+    chunker = Chunker(state, year, seed)
+    schema = pa.schema([(c, pa.string()) for c in RAW_COLS])
+    tmp = path + ".tmp"
+    # No value has a comma, quote or newline, so nothing needs quoting (as in the real files)
+    with pacsv.CSVWriter(tmp, schema, write_options=pacsv.WriteOptions(quoting_style="none")) as w:
+        for start in range(0, rows, CHUNK):
+            w.write_table(chunker.chunk(min(CHUNK, rows - start)))
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+def frames(rows, states=None, years=None, seed=0, columns=None):
+    """The rows generate() would write, as DataFrames of strings (at most CHUNK
+    rows each), restricted to `columns` if given."""
+    for (state, year), n in allocate(rows, sorted(states or STATE_WEIGHTS), sorted(years or YEARS)).items():
+        chunker = Chunker(state, year, seed)
+        for start in range(0, n, CHUNK):
+            table = chunker.chunk(min(CHUNK, n - start))
+            yield (table.select(columns) if columns else table).to_pandas()
+
+
+def generate(out, rows, states=None, years=None, seed=0, quiet=False):
+    """Write the extracts (skipped if synth.json shows the same parameters).
+    Returns the synth.json record: parameters, files, sizes and seconds taken,
+    plus reused=True if the files were already there."""
+    states = sorted(states or STATE_WEIGHTS)
+    years = sorted(years or YEARS)
+    params = {"rows": rows, "states": states, "years": years, "seed": seed, "version": VERSION}
+    meta_path = os.path.join(out, "synth.json")
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta["params"] == params and all(os.path.exists(os.path.join(out, p)) for p in meta["files"]):
+            return dict(meta, reused=True)
+    except (OSError, ValueError, KeyError):
+        pass
+    os.makedirs(out, exist_ok=True)
+    files = {}
+    t0 = time.perf_counter()
+    for (state, year), n in allocate(rows, states, years).items():
+        name = f"{state}_{year}_raw.csv"
+        size = write_extract(os.path.join(out, name), state, year, n, seed)
+        files[name] = {"rows": n, "bytes": size}
+        if not quiet:
+            print(f"  {name}: {n:,} rows, {size / 1e6:,.1f} MB")
+    meta = {"params": params, "files": files, "seconds": round(time.perf_counter() - t0, 2)}
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=1)
+    return meta
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=1000000, help="total rows over all files")
+    ap.add_argument("--states", nargs="+", default=None, help="default: all 50 + DC")
+    ap.add_argument("--years", nargs="+", type=int, default=None, help="default: 2018-2023")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default=os.path.join("data", "synth"))
+    args = ap.parse_args()
+
+    meta = generate(args.out, args.rows, args.states, args.years, args.seed)
+    total = sum(f["bytes"] for f in meta["files"].values())
+    took = "already there" if meta.get("reused") else f"{meta['seconds']:.1f}s"
+    print(f"{len(meta['files'])} files, {args.rows:,} rows, {total / 1e6:,.1f} MB in {args.out} ({took})")
+
+
+if __name__ == "__main__":
+    main()
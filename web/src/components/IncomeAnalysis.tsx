@@ -4,16 +4,16 @@ import { useState } from "react";
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from "recharts";
 import Section from "./Section";
 import data from "@/data/precomputed";
+import { useStateShard } from "@/data/stateShard";
 
 export default function IncomeAnalysis() {
-  const statesWithBrackets = data.summary.states.filter((s) => {
-    const st = data.by_state[s as keyof typeof data.by_state];
-    return st.income_brackets && (st.income_brackets as unknown as Array<Record<string, unknown>>).length > 0;
-  });
+  const statesWithBrackets = data.summary.states.filter(
+    (s) => data.state_summary[s as keyof typeof data.state_summary]?.has_income_brackets
+  );
 
   const [selectedState, setSelectedState] = useState<string>(statesWithBrackets[0] || data.summary.states[0]);
-  const stateData = data.by_state[selectedState as keyof typeof data.by_state];
-  const brackets = (stateData?.income_brackets || []) as unknown as Array<Record<string, unknown>>;
+  const stateData = useStateShard(selectedState);
+  const brackets = stateData?.income_brackets || [];
 
   return (
     <Section id="income" dark={false}>
@@ -38,7 +38,7 @@ export default function IncomeAnalysis() {
 
       <div className="mt-8 h-80">
         <ResponsiveContainer width="100%" height="100%">
-          <BarChart data={brackets as Array<Record<string, unknown>>}>
+          <BarChart data={brackets}>
             <CartesianGrid strokeDasharray="3 3" stroke="#334155" />
             <XAxis dataKey="bracket" tick={{ fill: "#94a3b8", fontSize: 12 }} />
             <YAxis tick={{ fill: "#94a3b8", fontSize: 12 }} unit="pp" />
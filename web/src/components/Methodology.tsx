@@ -1,7 +1,7 @@
 "use client";
 
 import Section from "./Section";
-import { regressionResults } from "@/data/precomputed";
+import { regressionResults } from "@/data/regression";
 
 const coefficients = regressionResults.coefficients;
 
@@ -4,6 +4,7 @@ import { useState } from "react";
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from "recharts";
 import Section from "./Section";
 import data from "@/data/precomputed";
+import { useStateShard } from "@/data/stateShard";
 
 const RACE_COLORS: Record<string, string> = {
   white: "#94a3b8",
@@ -15,7 +16,8 @@ const RACE_COLORS: Record<string, string> = {
 export default function RateComparison() {
   const states = data.summary.states;
   const [selectedState, setSelectedState] = useState<string>(states[0]);
-  const stateData = data.by_state[selectedState as keyof typeof data.by_state];
+  const summary = data.state_summary[selectedState as keyof typeof data.state_summary];
+  const stateData = useStateShard(selectedState);
 
   const spreadData = Object.entries(stateData?.avg_spreads || {}).map(([race, spread]) => ({
     race: race.charAt(0).toUpperCase() + race.slice(1),
@@ -23,8 +25,8 @@ export default function RateComparison() {
     fill: RACE_COLORS[race] || "#a78bfa",
   }));
 
-  const bwGap = stateData?.rate_gap_bw || 0;
-  const hwGap = stateData?.rate_gap_hw || 0;
+  const bwGap = summary?.rate_gap_bw || 0;
+  const hwGap = summary?.rate_gap_hw || 0;
 
   return (
     <Section id="rates" dark={false}>
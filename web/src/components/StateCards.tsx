@@ -7,8 +7,8 @@ export default function StateCards() {
   const states = data.summary.states;
   // Sort by B/W gap (worst first)
   const sorted = [...states].sort((a, b) => {
-    const aGap = (data.by_state[a as keyof typeof data.by_state]?.rate_gap_bw as number) || 0;
-    const bGap = (data.by_state[b as keyof typeof data.by_state]?.rate_gap_bw as number) || 0;
+    const aGap = (data.state_summary[a as keyof typeof data.state_summary]?.rate_gap_bw as number) || 0;
+    const bGap = (data.state_summary[b as keyof typeof data.state_summary]?.rate_gap_bw as number) || 0;
     return bGap - aGap;
   });
 
@@ -22,7 +22,7 @@ export default function StateCards() {
 
       <div className="mt-8 grid gap-4 sm:grid-cols-2 lg:grid-cols-3">
         {sorted.slice(0, 15).map((state, i) => {
-          const st = data.by_state[state as keyof typeof data.by_state];
+          const st = data.state_summary[state as keyof typeof data.state_summary];
           const bwGap = (st?.rate_gap_bw as number) || 0;
           const hwGap = (st?.rate_gap_hw as number) || 0;
           const loans = st?.total_loans || 0;
@@ -43,14 +43,14 @@ const STATE_POSITIONS: Record<string, { row: number; col: number }> = {
 };
 
 function getGap(stateName: string, mode: ViewMode): number | null {
-  const st = data.by_state[stateName as keyof typeof data.by_state] as Record<string, unknown> | undefined;
+  const st = data.state_summary[stateName as keyof typeof data.state_summary] as Record<string, unknown> | undefined;
   if (!st) return null;
   const val = mode === "bw" ? st.rate_gap_bw : st.rate_gap_hw;
   return typeof val === "number" ? val : null;
 }
 
 function getStateData(stateName: string) {
-  return data.by_state[stateName as keyof typeof data.by_state] as Record<string, unknown> | undefined;
+  return data.state_summary[stateName as keyof typeof data.state_summary] as Record<string, unknown> | undefined;
 }
 
 function getColor(gap: number | null): string {
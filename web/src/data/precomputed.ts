@@ -1,19 +1,3 @@
-const data = {"summary": {"total_loans": 15278109, "num_states": 51, "states": ["Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware", "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky", "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi", "Missouri", "Montana", "Nebraska", "Nevada", "New Hampshire", "New Jersey", "New Mexico", "New York", "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon", "Pennsylvania", "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah", "Vermont", "Virginia", "Washington", "Washington DC", "West Virginia", "Wisconsin", "Wyoming"], "years": "2018-2023"}, "avg_rates": {"white": 4.193, "black": 4.341, "hispanic": 4.324, "asian": 4.054}, "avg_spreads": {"white": 0.391, "black": 0.552, "hispanic": 0.583, "asian": 0.212}, "yearly_spreads": {"2018": {"white": 0.608, "asian": 0.431, "hispanic": 0.879, "black": 0.864}, "2019": {"white": 0.585, "black": 0.75, "hispanic": 0.807, "asian": 0.335}, "2020": {"white": 0.264, "black": 0.474, "asian": 0.135, "hispanic": 0.5}, "2021": {"black": 0.519, "white": 0.349, "asian": 0.2, "hispanic": 0.536}, "2022": {"white": 0.375, "asian": 0.215, "black": 0.537, "hispanic": 0.572}, "2023": {"white": 0.344, "hispanic": 0.402, "black": 0.328, "asian": 0.101}}, "by_state": {"Alaska": {"total_loans": 67124, "avg_rates": {"white": 3.746, "black": 3.734, "hispanic": 3.809, "asian": 3.827}, "avg_spreads": {"white": 0.207, "black": 0.188, "hispanic": 0.235, "asian": 0.287}, "rate_gap_bw": -0.019, "rate_gap_hw": 0.028, "avg_income": {"white": 112.947, "asian": 105.516, "black": 97.211, "hispanic": 94.813}, "avg_loan_amount": {"white": 303041.876, "asian": 299714.874, "black": 305828.295, "hispanic": 295165.513}, "loan_type_spreads": {"Conventional": {"white": 0.267, "black": 0.319, "hispanic": 0.314}, "FHA": {"white": 0.834, "black": 0.818, "hispanic": 0.8}, "VA": {"white": -0.147, "black": -0.1, "hispanic": -0.115}, "USDA": {"white": 0.307, "hispanic": 0.319}}, "income_brackets": [{"bracket": "<50K", "white": 0.228, "black": 0.166, "hispanic": 0.345}, {"bracket": "50-100K", "white": 0.273, "black": 0.319, "hispanic": 0.288}, {"bracket": "100-150K", "white": 0.244, "black": 0.212, "hispanic": 0.264}, {"bracket": "150K+", "white": 0.194, "black": 0.181, "hispanic": 0.237}], "counts": {"white": 58745, "asian": 3402, "black": 1654, "hispanic": 3323}, "yearly_spreads": {"2022": {"white": 0.284, "asian": 0.337, "black": 0.223, "hispanic": 0.296}, "2023": {"white": 0.179, "hispanic": 0.144, "black": 0.059, "asian": 0.169}, "2018": {"white": 0.391, "asian": 0.425, "hispanic": 0.418, "black": 0.421}, "2019": {"white": 0.265, "black": 0.26, "hispanic": 0.266, "asian": 0.341}, "2020": {"white": 0.098, "black": 0.101, "asian": 0.212, "hispanic": 0.156}, "2021": {"black": 0.164, "white": 0.175, "asian": 0.286, "hispanic": 0.213}}}, "Alabama": {"total_loans": 445261, "avg_rates": {"white": 4.158, "black": 4.359, "hispanic": 4.398, "asian": 3.962}, "avg_spreads": {"white": 0.582, "black": 0.807, "hispanic": 0.704, "asian": 0.293}, "rate_gap_bw": 0.225, "rate_gap_hw": 0.122, "avg_income": {"white": 99.69, "black": 73.704, "asian": 109.296, "hispanic": 78.103}, "avg_loan_amount": {"white": 216323.28, "black": 191752.717, "asian": 261502.934, "hispanic": 196858.078}, "loan_type_spreads": {"Conventional": {"white": 0.608, "black": 1.042, "hispanic": 0.825}, "FHA": {"white": 1.049, "black": 1.112, "hispanic": 1.051}, "VA": {"white": -0.048, "black": 0.006, "hispanic": -0.05}, "USDA": {"white": 0.535, "black": 0.53, "hispanic": 0.581}}, "income_brackets": [{"bracket": "<50K", "white": 0.975, "black": 1.187, "hispanic": 0.976}, {"bracket": "50-100K", "white": 0.637, "black": 0.818, "hispanic": 0.738}, {"bracket": "100-150K", "white": 0.403, "black": 0.527, "hispanic": 0.415}, {"bracket": "150K+", "white": 0.24, "black": 0.4, "hispanic": 0.389}], "counts": {"white": 357944, "black": 68177, "asian": 7838, "hispanic": 11302}, "yearly_spreads": {"2023": {"white": 0.529, "black": 0.545, "asian": 0.17, "hispanic": 0.541}, "2022": {"white": 0.553, "black": 0.711, "hispanic": 0.476, "asian": 0.314}, "2019": {"white": 0.765, "black": 1.066, "asian": 0.461, "hispanic": 1.118}, "2018": {"white": 0.826, "black": 1.115, "hispanic": 1.064, "asian": 0.474}, "2021": {"white": 0.529, "black": 0.749, "hispanic": 0.631, "asian": 0.278}, "2020": {"white": 0.439, "asian": 0.197, "black": 0.743, "hispanic": 0.62}}}, "Arkansas": {"total_loans": 306870, "avg_rates": {"white": 4.178, "black": 4.403, "hispanic": 4.259, "asian": 4.019}, "avg_spreads": {"white": 0.599, "black": 0.882, "hispanic": 0.73, "asian": 0.265}, "rate_gap_bw": 0.283, "rate_gap_hw": 0.131, "avg_income": {"white": 96.103, "asian": 115.266, "black": 72.317, "hispanic": 65.402}, "avg_loan_amount": {"white": 193120.063, "asian": 261031.491, "black": 168391.42, "hispanic": 165835.81}, "loan_type_spreads": {"Conventional": {"white": 0.596, "black": 1.048, "hispanic": 0.685}, "FHA": {"white": 1.068, "black": 1.207, "hispanic": 1.019}, "VA": {"white": 0.018, "black": 0.082, "hispanic": 0.043}, "USDA": {"white": 0.619, "black": 0.757, "hispanic": 0.552}}, "income_brackets": [{"bracket": "<50K", "white": 0.857, "black": 1.128, "hispanic": 0.831}, {"bracket": "50-100K", "white": 0.664, "black": 0.934, "hispanic": 0.739}, {"bracket": "100-150K", "white": 0.47, "black": 0.652, "hispanic": 0.527}, {"bracket": "150K+", "white": 0.307, "black": 0.515, "hispanic": 0.365}], "counts": {"white": 259498, "asian": 6859, "black": 23356, "hispanic": 17157}, "yearly_spreads": {"2022": {"white": 0.648, "asian": 0.273, "black": 0.878, "hispanic": 0.795}, "2023": {"white": 0.63, "black": 0.772, "hispanic": 0.584, "asian": 0.165}, "2018": {"white": 0.83, "asian": 0.508, "hispanic": 0.972, "black": 1.185}, "2019": {"white": 0.768, "black": 1.063, "hispanic": 0.931, "asian": 0.448}, "2020": {"white": 0.422, "asian": 0.141, "hispanic": 0.575, "black": 0.744}, "2021": {"white": 0.54, "asian": 0.26, "hispanic": 0.665, "black": 0.824}}}, "Arizona": {"total_loans": 410444, "avg_rates": {"white": 3.814, "black": 3.925, "hispanic": 3.982, "asian": 3.689}, "avg_spreads": {"white": 0.382, "black": 0.495, "hispanic": 0.644, "asian": 0.218}, "rate_gap_bw": 0.113, "rate_gap_hw": 0.262, "avg_income": {"white": 115.851, "hispanic": 79.101, "black": 93.061, "asian": 127.924}, "avg_loan_amount": {"white": 288993.401, "hispanic": 232759.006, "black": 280121.507, "asian": 340602.842}, "loan_type_spreads": {"Conventional": {"white": 0.371, "black": 0.484, "hispanic": 0.502}, "FHA": {"white": 1.114, "black": 1.131, "hispanic": 1.207}, "VA": {"white": -0.091, "black": -0.06, "hispanic": -0.068}, "USDA": {"white": 0.623, "hispanic": 0.606}}, "income_brackets": [{"bracket": "<50K", "white": 0.483, "black": 0.572, "hispanic": 0.75}, {"bracket": "50-100K", "white": 0.457, "black": 0.583, "hispanic": 0.682}, {"bracket": "100-150K", "white": 0.355, "black": 0.479, "hispanic": 0.496}, {"bracket": "150K+", "white": 0.299, "black": 0.509, "hispanic": 0.446}], "counts": {"white": 303681, "hispanic": 78251, "black": 13168, "asian": 15344}, "yearly_spreads": {"2021": {"white": 0.305, "black": 0.403, "hispanic": 0.527, "asian": 0.194}, "2018": {"white": 0.705, "hispanic": 1.097, "asian": 0.557, "black": 0.912}, "2022": {"white": 0.414, "hispanic": 0.605, "black": 0.463, "asian": 0.212}, "2019": {"white": 0.539, "hispanic": 0.869, "asian": 0.388, "black": 0.68}, "2023": {"hispanic": 0.356, "white": 0.336, "asian": -0.105, "black": 0.257}, "2020": {"white": 0.231, "hispanic": 0.492, "asian": 0.122, "black": 0.355}}}, "California": {"total_loans": 388445, "avg_rates": {"white": 3.572, "black": 3.592, "hispanic": 3.658, "asian": 3.326}, "avg_spreads": {"white": 0.243, "black": 0.345, "hispanic": 0.43, "asian": 0.07}, "rate_gap_bw": 0.102, "rate_gap_hw": 0.187, "avg_income": {"asian": 181.931, "white": 223.764, "hispanic": 165.872, "black": 153.121}, "avg_loan_amount": {"asian": 568383.295, "white": 483416.547, "hispanic": 350649.452, "black": 399183.282}, "loan_type_spreads": {"Conventional": {"white": 0.235, "black": 0.324, "hispanic": 0.329}, "FHA": {"white": 0.992, "black": 0.998, "hispanic": 1.039}, "VA": {"white": -0.21, "black": -0.186, "hispanic": -0.186}, "USDA": {"white": 0.548, "hispanic": 0.551}}, "income_brackets": [{"bracket": "<50K", "white": 0.349, "black": 0.358, "hispanic": 0.517}, {"bracket": "50-100K", "white": 0.298, "black": 0.394, "hispanic": 0.469}, {"bracket": "100-150K", "white": 0.223, "black": 0.401, "hispanic": 0.399}, {"bracket": "150K+", "white": 0.248, "black": 0.373, "hispanic": 0.362}], "counts": {"asian": 75057, "white": 211304, "hispanic": 85934, "black": 16150}, "yearly_spreads": {"2019": {"asian": 0.122, "white": 0.499, "hispanic": 0.543, "black": 0.445}, "2018": {"white": 0.424, "asian": 0.284, "black": 0.629, "hispanic": 0.719}, "2020": {"hispanic": 0.299, "white": 0.107, "asian": 0.007, "black": 0.205}, "2021": {"white": 0.164, "hispanic": 0.357, "asian": 0.052, "black": 0.272}, "2023": {"white": 0.327, "asian": 0.091, "hispanic": 0.427, "black": 0.205}, "2022": {"asian": 0.039, "black": 0.359, "hispanic": 0.466, "white": 0.184}}}, "Colorado": {"total_loans": 415561, "avg_rates": {"white": 3.746, "black": 3.786, "hispanic": 3.864, "asian": 3.704}, "avg_spreads": {"white": 0.256, "black": 0.305, "hispanic": 0.471, "asian": 0.07}, "rate_gap_bw": 0.049, "rate_gap_hw": 0.215, "avg_income": {"white": 175.012, "hispanic": 117.214, "black": 140.103, "asian": 134.647}, "avg_loan_amount": {"white": 355834.381, "hispanic": 293906.394, "black": 325587.497, "asian": 389558.69}, "loan_type_spreads": {"Conventional": {"white": 0.238, "black": 0.271, "hispanic": 0.338}, "FHA": {"white": 1.014, "black": 0.995, "hispanic": 1.1}, "VA": {"white": -0.168, "black": -0.11, "hispanic": -0.121}, "USDA": {"white": 0.569, "hispanic": 0.598}}, "income_brackets": [{"bracket": "<50K", "white": 0.367, "black": 0.37, "hispanic": 0.594}, {"bracket": "50-100K", "white": 0.32, "black": 0.366, "hispanic": 0.511}, {"bracket": "100-150K", "white": 0.255, "black": 0.328, "hispanic": 0.383}, {"bracket": "150K+", "white": 0.195, "black": 0.338, "hispanic": 0.375}], "counts": {"white": 344483, "hispanic": 45574, "black": 11149, "asian": 14355}, "yearly_spreads": {"2018": {"white": 0.561, "hispanic": 0.895, "asian": 0.428, "black": 0.708}, "2019": {"white": 0.385, "black": 0.46, "hispanic": 0.67, "asian": -0.012}, "2021": {"white": 0.201, "hispanic": 0.382, "black": 0.259, "asian": 0.024}, "2022": {"hispanic": 0.392, "white": 0.221, "black": 0.244, "asian": 0.112}, "2020": {"white": 0.123, "hispanic": 0.328, "black": 0.153, "asian": 0.066}, "2023": {"white": 0.189, "hispanic": 0.112, "asian": -0.116, "black": -0.046}}}, "Connecticut": {"total_loans": 394424, "avg_rates": {"white": 3.801, "black": 3.951, "hispanic": 4.062, "asian": 3.672}, "avg_spreads": {"white": 0.274, "black": 0.523, "hispanic": 0.542, "asian": 0.153}, "rate_gap_bw": 0.249, "rate_gap_hw": 0.268, "avg_income": {"white": 152.256, "hispanic": 92.901, "black": 92.833, "asian": 159.707}, "avg_loan_amount": {"white": 314775.419, "hispanic": 248481.658, "black": 239807.476, "asian": 356546.83}, "loan_type_spreads": {"Conventional": {"white": 0.203, "black": 0.161, "hispanic": 0.323}, "FHA": {"white": 1.022, "black": 1.066, "hispanic": 1.027}, "VA": {"white": -0.056, "black": 0.052, "hispanic": -0.01}, "USDA": {"white": 0.575, "hispanic": 0.508}}, "income_brackets": [{"bracket": "<50K", "white": 0.483, "black": 0.637, "hispanic": 0.651}, {"bracket": "50-100K", "white": 0.335, "black": 0.469, "hispanic": 0.498}, {"bracket": "100-150K", "white": 0.307, "black": 0.58, "hispanic": 0.592}, {"bracket": "150K+", "white": 0.131, "black": 0.511, "hispanic": 0.51}], "counts": {"white": 305992, "hispanic": 42362, "black": 27503, "asian": 18567}, "yearly_spreads": {"2022": {"white": 0.164, "hispanic": 0.535, "black": 0.446, "asian": 0.125}, "2023": {"hispanic": -0.214, "white": -0.031, "asian": -0.154, "black": -0.404}, "2018": {"white": 0.394, "asian": 0.313, "hispanic": 0.751, "black": 0.808}, "2019": {"white": 0.415, "hispanic": 0.824, "asian": 0.274, "black": 0.825}, "2020": {"white": 0.253, "asian": 0.136, "hispanic": 0.615, "black": 0.641}, "2021": {"white": 0.313, "asian": 0.192, "hispanic": 0.634, "black": 0.646}}}, "Washington DC": {"total_loans": 73352, "avg_rates": {"white": 3.649, "black": 3.938, "hispanic": 3.761, "asian": 3.611}, "avg_spreads": {"white": 0.05, "black": 0.381, "hispanic": 0.197, "asian": 0.034}, "rate_gap_bw": 0.331, "rate_gap_hw": 0.147, "avg_income": {"black": 126.692, "hispanic": 154.617, "white": 223.27, "asian": 181.744}, "avg_loan_amount": {"black": 394036.329, "hispanic": 457620.675, "white": 594650.12, "asian": 521562.437}, "loan_type_spreads": {"Conventional": {"white": 0.062, "black": 0.337, "hispanic": 0.188}, "FHA": {"white": 0.889, "black": 0.9, "hispanic": 0.953}, "VA": {"white": -0.293, "black": -0.141, "hispanic": -0.251}}, "income_brackets": [{"bracket": "<50K", "white": 0.034, "black": 0.444, "hispanic": 0.452}, {"bracket": "50-100K", "white": 0.121, "black": 0.414, "hispanic": 0.273}, {"bracket": "100-150K", "white": 0.096, "black": 0.392, "hispanic": 0.191}, {"bracket": "150K+", "white": 0.028, "black": 0.332, "hispanic": 0.124}], "counts": {"black": 17672, "hispanic": 4682, "white": 46073, "asian": 4925}, "yearly_spreads": {"2022": {"black": 0.374, "hispanic": 0.216, "white": -0.032, "asian": -0.037}, "2023": {"white": 0.028, "hispanic": 0.216, "asian": -0.055, "black": 0.307}, "2018": {"white": 0.15, "black": 0.575, "asian": 0.125, "hispanic": 0.359}, "2019": {"white": 0.11, "asian": 0.09, "hispanic": 0.256, "black": 0.53}, "2020": {"black": 0.28, "hispanic": 0.095, "white": 0.006, "asian": 0.013}, "2021": {"asian": 0.053, "black": 0.307, "white": 0.071, "hispanic": 0.184}}}, "Delaware": {"total_loans": 139353, "avg_rates": {"white": 3.922, "black": 4.138, "hispanic": 4.275, "asian": 3.813}, "avg_spreads": {"white": 0.428, "black": 0.714, "hispanic": 0.832, "asian": 0.205}, "rate_gap_bw": 0.286, "rate_gap_hw": 0.404, "avg_income": {"white": 106.828, "hispanic": 74.78, "black": 84.922, "asian": 456.312}, "avg_loan_amount": {"white": 259112.89, "hispanic": 231701.495, "black": 255516.691, "asian": 317788.093}, "loan_type_spreads": {"Conventional": {"white": 0.364, "black": 0.529, "hispanic": 0.704}, "FHA": {"white": 1.155, "black": 1.273, "hispanic": 1.279}, "VA": {"white": -0.045, "black": 0.018, "hispanic": -0.041}, "USDA": {"white": 0.574, "black": 0.602, "hispanic": 0.618}}, "income_brackets": [{"bracket": "<50K", "white": 0.632, "black": 0.94, "hispanic": 1.047}, {"bracket": "50-100K", "white": 0.498, "black": 0.792, "hispanic": 0.871}, {"bracket": "100-150K", "white": 0.372, "black": 0.634, "hispanic": 0.614}, {"bracket": "150K+", "white": 0.264, "black": 0.482, "hispanic": 0.407}], "counts": {"white": 101160, "hispanic": 7561, "black": 24115, "asian": 6517}, "yearly_spreads": {"2022": {"white": 0.402, "hispanic": 0.859, "black": 0.709, "asian": 0.238}, "2023": {"white": 0.474, "black": 0.561, "hispanic": 0.754, "asian": 0.229}, "2018": {"white": 0.621, "black": 1.043, "hispanic": 1.163, "asian": 0.334}, "2019": {"white": 0.599, "asian": 0.292, "black": 0.909, "hispanic": 1.087}, "2020": {"white": 0.304, "asian": 0.107, "black": 0.601, "hispanic": 0.692}, "2021": {"black": 0.636, "white": 0.382, "hispanic": 0.696, "asian": 0.187}}}, "Florida": {"total_loans": 423914, "avg_rates": {"white": 3.774, "black": 3.859, "hispanic": 3.846, "asian": 3.639}, "avg_spreads": {"white": 0.492, "black": 0.678, "hispanic": 0.687, "asian": 0.324}, "rate_gap_bw": 0.186, "rate_gap_hw": 0.195, "avg_income": {"white": 128.29, "black": 88.057, "hispanic": 103.555, "asian": 125.179}, "avg_loan_amount": {"white": 271165.378, "black": 243828.441, "hispanic": 265984.107, "asian": 300538.829}, "loan_type_spreads": {"Conventional": {"white": 0.425, "black": 0.601, "hispanic": 0.559}, "FHA": {"white": 1.474, "black": 1.193, "hispanic": 1.174}, "VA": {"white": -0.054, "black": -0.0, "hispanic": -0.055}, "USDA": {"white": 0.667, "black": 0.674, "hispanic": 0.66}}, "income_brackets": [{"bracket": "<50K", "white": 0.667, "black": 0.82, "hispanic": 0.861}, {"bracket": "50-100K", "white": 0.637, "black": 0.76, "hispanic": 0.747}, {"bracket": "100-150K", "white": 0.389, "black": 0.588, "hispanic": 0.532}, {"bracket": "150K+", "white": 0.272, "black": 0.5, "hispanic": 0.47}], "counts": {"white": 284826, "black": 36891, "hispanic": 90041, "asian": 12156}, "yearly_spreads": {"2018": {"white": 0.675, "black": 0.973, "hispanic": 0.958, "asian": 0.59}, "2020": {"white": 0.333, "hispanic": 0.566, "asian": 0.219, "black": 0.579}, "2019": {"white": 0.808, "hispanic": 0.901, "black": 0.862, "asian": 0.459}, "2021": {"white": 0.39, "hispanic": 0.587, "asian": 0.289, "black": 0.581}, "2023": {"white": 0.328, "black": 0.233, "hispanic": 0.351, "asian": 0.065}, "2022": {"black": 0.476, "white": 0.389, "hispanic": 0.591, "asian": 0.249}}}, "Georgia": {"total_loans": 411963, "avg_rates": {"white": 3.81, "black": 3.948, "hispanic": 4.04, "asian": 3.634}, "avg_spreads": {"white": 0.435, "black": 0.649, "hispanic": 0.692, "asian": 0.215}, "rate_gap_bw": 0.214, "rate_gap_hw": 0.257, "avg_income": {"black": 87.339, "hispanic": 81.492, "white": 120.9, "asian": 130.899}, "avg_loan_amount": {"black": 233205.456, "hispanic": 232970.142, "white": 261015.993, "asian": 322939.766}, "loan_type_spreads": {"Conventional": {"white": 0.384, "black": 0.576, "hispanic": 0.588}, "FHA": {"white": 1.104, "black": 1.167, "hispanic": 1.176}, "VA": {"white": -0.025, "black": 0.021, "hispanic": -0.009}, "USDA": {"white": 0.631, "black": 0.631, "hispanic": 0.687}}, "income_brackets": [{"bracket": "<50K", "white": 0.692, "black": 0.83, "hispanic": 0.867}, {"bracket": "50-100K", "white": 0.527, "black": 0.727, "hispanic": 0.713}, {"bracket": "100-150K", "white": 0.365, "black": 0.567, "hispanic": 0.528}, {"bracket": "150K+", "white": 0.22, "black": 0.494, "hispanic": 0.436}], "counts": {"black": 92380, "hispanic": 27731, "white": 265986, "asian": 25866}, "yearly_spreads": {"2021": {"black": 0.566, "white": 0.382, "asian": 0.153, "hispanic": 0.622}, "2018": {"hispanic": 0.922, "white": 0.622, "black": 0.969, "asian": 0.486}, "2023": {"white": 0.442, "black": 0.363, "hispanic": 0.521, "asian": 0.129}, "2019": {"black": 0.826, "white": 0.571, "asian": 0.343, "hispanic": 0.867}, "2020": {"white": 0.309, "hispanic": 0.559, "asian": 0.121, "black": 0.542}, "2022": {"white": 0.446, "black": 0.581, "hispanic": 0.725, "asian": 0.227}}}, "Hawaii": {"total_loans": 103680, "avg_rates": {"white": 3.554, "black": 3.563, "hispanic": 3.541, "asian": 3.442}, "avg_spreads": {"white": -0.007, "black": -0.133, "hispanic": -0.025, "asian": -0.053}, "rate_gap_bw": -0.126, "rate_gap_hw": -0.018, "avg_income": {"asian": 133.857, "white": 149.818, "hispanic": 115.826, "black": 122.89}, "avg_loan_amount": {"asian": 464748.118, "white": 542360.517, "hispanic": 487992.45, "black": 559996.545}, "loan_type_spreads": {"Conventional": {"white": 0.099, "black": 0.243, "hispanic": 0.127}, "FHA": {"white": 0.837, "hispanic": 0.823}, "VA": {"white": -0.309, "black": -0.241, "hispanic": -0.267}, "USDA": {"white": 0.436, "hispanic": 0.33}}, "income_brackets": [{"bracket": "<50K", "white": -0.029, "black": -0.228, "hispanic": -0.039}, {"bracket": "50-100K", "white": 0.097, "black": 0.049, "hispanic": 0.102}, {"bracket": "100-150K", "white": 0.07, "black": -0.008, "hispanic": 0.054}, {"bracket": "150K+", "white": -0.006, "black": -0.058, "hispanic": -0.027}], "counts": {"asian": 55939, "white": 39019, "hispanic": 5828, "black": 2894}, "yearly_spreads": {"2022": {"asian": -0.387, "white": -0.126, "hispanic": -0.086, "black": -0.099}, "2023": {"white": 0.069, "asian": -0.079, "black": -0.216, "hispanic": 0.025}, "2018": {"white": 0.127, "asian": -0.096, "hispanic": 0.139, "black": 0.186}, "2019": {"white": 0.127, "asian": 0.044, "hispanic": 0.139, "black": 0.086}, "2020": {"white": -0.081, "asian": -0.016, "black": -0.259, "hispanic": -0.104}, "2021": {"black": -0.115, "asian": 0.096, "white": 0.051, "hispanic": 0.013}}}, "Iowa": {"total_loans": 409968, "avg_rates": {"white": 4.364, "black": 4.334, "hispanic": 4.456, "asian": 3.957}, "avg_spreads": {"white": 0.457, "black": 0.652, "hispanic": 0.71, "asian": 0.244}, "rate_gap_bw": 0.195, "rate_gap_hw": 0.253, "avg_income": {"white": 98.386, "asian": 102.475, "black": 72.721, "hispanic": 67.358}, "avg_loan_amount": {"white": 177736.092, "asian": 208678.541, "black": 163069.563, "hispanic": 141703.9}, "loan_type_spreads": {"Conventional": {"white": 0.43, "black": 0.586, "hispanic": 0.655}, "FHA": {"white": 1.125, "black": 1.074, "hispanic": 1.138}, "VA": {"white": -0.047, "black": -0.029, "hispanic": -0.018}, "USDA": {"white": 0.555, "black": 0.497, "hispanic": 0.676}}, "income_brackets": [{"bracket": "<50K", "white": 0.652, "black": 0.807, "hispanic": 0.834}, {"bracket": "50-100K", "white": 0.494, "black": 0.636, "hispanic": 0.696}, {"bracket": "100-150K", "white": 0.363, "black": 0.499, "hispanic": 0.488}, {"bracket": "150K+", "white": 0.26, "black": 0.378, "hispanic": 0.277}], "counts": {"white": 376654, "asian": 9376, "black": 7734, "hispanic": 16204}, "yearly_spreads": {"2022": {"white": 0.475, "asian": 0.327, "black": 0.666, "hispanic": 0.724}, "2023": {"white": 0.351, "hispanic": 0.455, "black": 0.289, "asian": 0.083}, "2018": {"white": 1.026, "hispanic": 0.929, "black": 1.026, "asian": 0.47}, "2019": {"white": 0.519, "hispanic": 0.867, "asian": 0.356, "black": 0.917}, "2020": {"white": 0.269, "hispanic": 0.727, "asian": 0.132, "black": 0.616}, "2021": {"white": 0.384, "black": 0.613, "hispanic": 0.692, "asian": 0.211}}}, "Idaho": {"total_loans": 343021, "avg_rates": {"white": 3.963, "black": 4.074, "hispanic": 4.221, "asian": 3.875}, "avg_spreads": {"white": 0.412, "black": 0.493, "hispanic": 0.662, "asian": 0.259}, "rate_gap_bw": 0.081, "rate_gap_hw": 0.25, "avg_income": {"white": 100.038, "hispanic": 76.796, "asian": 106.097, "black": 80.716}, "avg_loan_amount": {"white": 260238.022, "hispanic": 216285.319, "asian": 301159.402, "black": 259657.632}, "loan_type_spreads": {"Conventional": {"white": 0.414, "black": 0.516, "hispanic": 0.642}, "FHA": {"white": 1.002, "black": 1.002, "hispanic": 0.993}, "VA": {"white": -0.082, "black": -0.017, "hispanic": -0.084}, "USDA": {"white": 0.384, "hispanic": 0.379}}, "income_brackets": [{"bracket": "<50K", "white": 0.491, "black": 0.619, "hispanic": 0.727}, {"bracket": "50-100K", "white": 0.453, "black": 0.524, "hispanic": 0.672}, {"bracket": "100-150K", "white": 0.396, "black": 0.473, "hispanic": 0.607}, {"bracket": "150K+", "white": 0.334, "black": 0.469, "hispanic": 0.585}], "counts": {"white": 316652, "hispanic": 20952, "asian": 4015, "black": 1402}, "yearly_spreads": {"2022": {"white": 0.401, "hispanic": 0.649, "asian": 0.266, "black": 0.541}, "2023": {"white": 0.484, "hispanic": 0.645, "asian": 0.15, "black": 0.334}, "2018": {"white": 0.671, "hispanic": 0.975, "asian": 0.497, "black": 0.89}, "2019": {"white": 0.556, "hispanic": 0.829, "asian": 0.431, "black": 0.605}, "2020": {"white": 0.264, "asian": 0.133, "hispanic": 0.493, "black": 0.355}, "2021": {"white": 0.319, "hispanic": 0.501, "asian": 0.234, "black": 0.404}}}, "Illinois": {"total_loans": 441249, "avg_rates": {"white": 3.812, "black": 3.919, "hispanic": 3.936, "asian": 3.524}, "avg_spreads": {"white": 0.373, "black": 0.72, "hispanic": 0.689, "asian": 0.198}, "rate_gap_bw": 0.347, "rate_gap_hw": 0.316, "avg_income": {"white": 131.841, "asian": 145.531, "black": 90.592, "hispanic": 81.062}, "avg_loan_amount": {"white": 250384.689, "asian": 309651.105, "black": 204228.035, "hispanic": 209244.899}, "loan_type_spreads": {"Conventional": {"white": 0.308, "black": 0.426, "hispanic": 0.504}, "FHA": {"white": 1.156, "black": 1.285, "hispanic": 1.208}, "VA": {"white": -0.01, "black": 0.064, "hispanic": -0.014}, "USDA": {"white": 0.699, "black": 0.831, "hispanic": 0.686}}, "income_brackets": [{"bracket": "<50K", "white": 0.634, "black": 0.863, "hispanic": 0.818}, {"bracket": "50-100K", "white": 0.452, "black": 0.774, "hispanic": 0.71}, {"bracket": "100-150K", "white": 0.334, "black": 0.66, "hispanic": 0.567}, {"bracket": "150K+", "white": 0.179, "black": 0.472, "hispanic": 0.37}], "counts": {"white": 325211, "asian": 31958, "black": 31789, "hispanic": 52291}, "yearly_spreads": {"2021": {"white": 0.335, "black": 0.658, "asian": 0.143, "hispanic": 0.602}, "2018": {"white": 0.616, "hispanic": 1.017, "asian": 0.421, "black": 1.098}, "2022": {"asian": 0.261, "white": 0.451, "black": 0.718, "hispanic": 0.718}, "2019": {"white": 0.508, "black": 0.939, "asian": 0.316, "hispanic": 0.902}, "2020": {"white": 0.214, "asian": 0.101, "hispanic": 0.546, "black": 0.58}, "2023": {"white": 0.354, "black": 0.165, "hispanic": 0.348, "asian": 0.244}}}, "Indiana": {"total_loans": 448837, "avg_rates": {"white": 4.031, "black": 4.144, "hispanic": 4.265, "asian": 3.847}, "avg_spreads": {"white": 0.548, "black": 0.727, "hispanic": 0.782, "asian": 0.237}, "rate_gap_bw": 0.179, "rate_gap_hw": 0.234, "avg_income": {"white": 94.584, "black": 76.289, "hispanic": 69.402, "asian": 103.335}, "avg_loan_amount": {"white": 186374.619, "black": 188473.637, "hispanic": 171237.32, "asian": 244062.548}, "loan_type_spreads": {"Conventional": {"white": 0.456, "black": 0.537, "hispanic": 0.644}, "FHA": {"white": 1.239, "black": 1.222, "hispanic": 1.273}, "VA": {"white": 0.077, "black": 0.086, "hispanic": 0.069}, "USDA": {"white": 0.799, "black": 0.61, "hispanic": 0.776}}, "income_brackets": [{"bracket": "<50K", "white": 0.752, "black": 0.871, "hispanic": 0.911}, {"bracket": "50-100K", "white": 0.589, "black": 0.751, "hispanic": 0.787}, {"bracket": "100-150K", "white": 0.424, "black": 0.642, "hispanic": 0.576}, {"bracket": "150K+", "white": 0.261, "black": 0.412, "hispanic": 0.41}], "counts": {"white": 393498, "black": 22475, "hispanic": 19914, "asian": 12950}, "yearly_spreads": {"2023": {"white": 0.498, "black": 0.419, "asian": -0.488, "hispanic": 0.509}, "2021": {"white": 0.493, "hispanic": 0.717, "black": 0.661, "asian": 0.263}, "2018": {"white": 0.797, "black": 1.042, "hispanic": 1.077, "asian": 0.566}, "2020": {"white": 0.393, "black": 0.661, "hispanic": 0.664, "asian": 0.208}, "2022": {"white": 0.539, "black": 0.625, "hispanic": 0.77, "asian": 0.259}, "2019": {"white": 0.714, "hispanic": 1.049, "black": 0.985, "asian": 0.511}}}, "Kansas": {"total_loans": 296647, "avg_rates": {"white": 4.001, "black": 4.211, "hispanic": 4.289, "asian": 3.809}, "avg_spreads": {"white": 0.448, "black": 0.636, "hispanic": 0.712, "asian": 0.255}, "rate_gap_bw": 0.188, "rate_gap_hw": 0.264, "avg_income": {"white": 108.482, "hispanic": 70.919, "asian": 114.901, "black": 85.342}, "avg_loan_amount": {"white": 215041.976, "hispanic": 166940.192, "asian": 266439.219, "black": 203682.959}, "loan_type_spreads": {"Conventional": {"white": 0.394, "black": 0.657, "hispanic": 0.628}, "FHA": {"white": 1.143, "black": 1.15, "hispanic": 1.178}, "VA": {"white": 0.02, "black": 0.056, "hispanic": 0.024}, "USDA": {"white": 0.684, "black": 0.662, "hispanic": 0.543}}, "income_brackets": [{"bracket": "<50K", "white": 0.767, "black": 0.968, "hispanic": 0.906}, {"bracket": "50-100K", "white": 0.506, "black": 0.657, "hispanic": 0.679}, {"bracket": "100-150K", "white": 0.347, "black": 0.507, "hispanic": 0.492}, {"bracket": "150K+", "white": 0.204, "black": 0.364, "hispanic": 0.357}], "counts": {"white": 258482, "hispanic": 19596, "asian": 9526, "black": 9043}, "yearly_spreads": {"2022": {"white": 0.525, "hispanic": 0.739, "asian": 0.3, "black": 0.683}, "2023": {"white": 0.468, "hispanic": 0.62, "asian": 0.246, "black": 0.518}, "2018": {"white": 0.632, "black": 0.835, "hispanic": 0.945, "asian": 0.442}, "2019": {"white": 0.558, "hispanic": 0.884, "black": 0.82, "asian": 0.435}, "2020": {"asian": 0.139, "white": 0.3, "hispanic": 0.591, "black": 0.5}, "2021": {"white": 0.413, "hispanic": 0.641, "asian": 0.201, "black": 0.583}}}, "Kentucky": {"total_loans": 448289, "avg_rates": {"white": 4.151, "black": 4.263, "hispanic": 4.245, "asian": 3.914}, "avg_spreads": {"white": 0.581, "black": 0.669, "hispanic": 0.498, "asian": 0.287}, "rate_gap_bw": 0.088, "rate_gap_hw": -0.083, "avg_income": {"white": 93.451, "black": 74.172, "hispanic": 66.451, "asian": 104.554}, "avg_loan_amount": {"white": 190257.898, "black": 181214.611, "hispanic": 172327.654, "asian": 244393.634}, "loan_type_spreads": {"Conventional": {"white": 0.529, "black": 0.586, "hispanic": 0.381}, "FHA": {"white": 1.176, "black": 1.163, "hispanic": 1.11}, "VA": {"white": 0.037, "black": 0.056, "hispanic": -0.012}, "USDA": {"white": 0.665, "black": 0.668, "hispanic": 0.666}}, "income_brackets": [{"bracket": "<50K", "white": 0.856, "black": 0.796, "hispanic": 0.466}, {"bracket": "50-100K", "white": 0.63, "black": 0.734, "hispanic": 0.582}, {"bracket": "100-150K", "white": 0.419, "black": 0.538, "hispanic": 0.483}, {"bracket": "150K+", "white": 0.268, "black": 0.378, "hispanic": 0.401}], "counts": {"white": 404346, "black": 21052, "hispanic": 13969, "asian": 8922}, "yearly_spreads": {"2023": {"white": 0.57, "black": 0.438, "asian": 0.161, "hispanic": -0.01}, "2022": {"white": 0.558, "black": 0.612, "hispanic": 0.374, "asian": 0.314}, "2019": {"white": 0.766, "black": 0.897, "hispanic": 0.922, "asian": 0.431}, "2018": {"white": 0.793, "hispanic": 0.914, "black": 0.937, "asian": 0.54}, "2021": {"white": 0.517, "black": 0.619, "hispanic": 0.482, "asian": 0.229}, "2020": {"white": 0.433, "hispanic": 0.502, "black": 0.578, "asian": 0.199}}}, "Louisiana": {"total_loans": 421603, "avg_rates": {"white": 4.129, "black": 4.423, "hispanic": 4.299, "asian": 4.004}, "avg_spreads": {"white": 0.611, "black": 1.014, "hispanic": 0.758, "asian": 0.35}, "rate_gap_bw": 0.403, "rate_gap_hw": 0.147, "avg_income": {"white": 107.656, "black": 73.446, "hispanic": 83.956, "asian": 118.347}, "avg_loan_amount": {"white": 225592.87, "black": 190132.177, "hispanic": 206953.574, "asian": 249465.785}, "loan_type_spreads": {"Conventional": {"white": 0.605, "black": 1.266, "hispanic": 0.766}, "FHA": {"white": 1.084, "black": 1.218, "hispanic": 1.098}, "VA": {"white": -0.026, "black": 0.063, "hispanic": -0.042}, "USDA": {"white": 0.545, "black": 0.605, "hispanic": 0.554}}, "income_brackets": [{"bracket": "<50K", "white": 0.984, "black": 1.374, "hispanic": 1.02}, {"bracket": "50-100K", "white": 0.688, "black": 1.01, "hispanic": 0.78}, {"bracket": "100-150K", "white": 0.478, "black": 0.751, "hispanic": 0.549}, {"bracket": "150K+", "white": 0.3, "black": 0.549, "hispanic": 0.427}], "counts": {"white": 321993, "black": 77661, "hispanic": 14087, "asian": 7862}, "yearly_spreads": {"2022": {"white": 0.659, "black": 0.954, "hispanic": 0.792, "asian": 0.368}, "2023": {"white": 0.61, "hispanic": 0.681, "black": 0.757, "asian": 0.197}, "2018": {"white": 0.833, "asian": 0.575, "black": 1.312, "hispanic": 0.986}, "2019": {"black": 1.313, "white": 0.834, "asian": 0.54, "hispanic": 1.005}, "2020": {"white": 0.446, "black": 0.927, "hispanic": 0.618, "asian": 0.327}, "2021": {"white": 0.557, "black": 0.921, "asian": 0.28, "hispanic": 0.699}}}, "Massachusetts": {"total_loans": 418284, "avg_rates": {"white": 3.796, "black": 3.963, "hispanic": 3.96, "asian": 3.594}, "avg_spreads": {"white": 0.184, "black": 0.453, "hispanic": 0.496, "asian": 0.025}, "rate_gap_bw": 0.269, "rate_gap_hw": 0.312, "avg_income": {"white": 154.665, "hispanic": 99.044, "asian": 165.469, "black": 105.689}, "avg_loan_amount": {"white": 372362.383, "hispanic": 343835.433, "asian": 466797.18, "black": 352327.055}, "loan_type_spreads": {"Conventional": {"white": 0.145, "black": 0.265, "hispanic": 0.316}, "FHA": {"white": 0.956, "black": 0.946, "hispanic": 0.98}, "VA": {"white": -0.126, "black": -0.058, "hispanic": -0.08}, "USDA": {"white": 0.539}}, "income_brackets": [{"bracket": "<50K", "white": 0.333, "black": 0.495, "hispanic": 0.543}, {"bracket": "50-100K", "white": 0.271, "black": 0.445, "hispanic": 0.491}, {"bracket": "100-150K", "white": 0.22, "black": 0.484, "hispanic": 0.537}, {"bracket": "150K+", "white": 0.067, "black": 0.401, "hispanic": 0.383}], "counts": {"white": 333752, "hispanic": 30243, "asian": 34326, "black": 19963}, "yearly_spreads": {"2020": {"white": 0.131, "asian": -0.007, "hispanic": 0.422, "black": 0.407}, "2023": {"white": 0.155, "asian": -0.014, "black": 0.284, "hispanic": 0.359}, "2022": {"hispanic": 0.41, "white": 0.019, "black": 0.332, "asian": -0.099}, "2021": {"white": 0.21, "hispanic": 0.478, "black": 0.457, "asian": 0.052}, "2018": {"white": 0.285, "hispanic": 0.602, "asian": 0.145, "black": 0.595}, "2019": {"asian": 0.109, "white": 0.28, "hispanic": 0.635, "black": 0.587}}}, "Maryland": {"total_loans": 406639, "avg_rates": {"white": 3.746, "black": 3.958, "hispanic": 4.113, "asian": 3.618}, "avg_spreads": {"white": 0.275, "black": 0.532, "hispanic": 0.647, "asian": 0.139}, "rate_gap_bw": 0.257, "rate_gap_hw": 0.372, "avg_income": {"white": 137.299, "black": 108.495, "asian": 139.232, "hispanic": 94.209}, "avg_loan_amount": {"white": 333212.569, "black": 319592.847, "asian": 393234.511, "hispanic": 313388.305}, "loan_type_spreads": {"Conventional": {"white": 0.246, "black": 0.408, "hispanic": 0.562}, "FHA": {"white": 0.984, "black": 1.067, "hispanic": 1.112}, "VA": {"white": -0.177, "black": -0.109, "hispanic": -0.17}, "USDA": {"white": 0.437, "black": 0.501, "hispanic": 0.441}}, "income_brackets": [{"bracket": "<50K", "white": 0.461, "black": 0.655, "hispanic": 0.775}, {"bracket": "50-100K", "white": 0.382, "black": 0.644, "hispanic": 0.734}, {"bracket": "100-150K", "white": 0.281, "black": 0.54, "hispanic": 0.574}, {"bracket": "150K+", "white": 0.165, "black": 0.433, "hispanic": 0.416}], "counts": {"white": 242566, "black": 99729, "asian": 32297, "hispanic": 32047}, "yearly_spreads": {"2020": {"white": 0.162, "black": 0.411, "hispanic": 0.474, "asian": 0.043}, "2022": {"black": 0.553, "asian": 0.159, "hispanic": 0.7, "white": 0.275}, "2021": {"white": 0.249, "asian": 0.108, "black": 0.448, "hispanic": 0.503}, "2018": {"white": 0.427, "black": 0.816, "hispanic": 0.908, "asian": 0.326}, "2023": {"asian": 0.191, "white": 0.37, "black": 0.435, "hispanic": 0.683}, "2019": {"white": 0.391, "hispanic": 0.884, "asian": 0.26, "black": 0.684}}}, "Maine": {"total_loans": 155498, "avg_rates": {"white": 4.263, "black": 4.468, "hispanic": 4.189, "asian": 4.041}, "avg_spreads": {"white": 0.449, "black": 0.663, "hispanic": 0.499, "asian": 0.366}, "rate_gap_bw": 0.214, "rate_gap_hw": 0.05, "avg_income": {"white": 101.42, "hispanic": 93.556, "black": 88.971, "asian": 120.739}, "avg_loan_amount": {"white": 229046.345, "hispanic": 234639.233, "black": 285330.189, "asian": 275071.014}, "loan_type_spreads": {"Conventional": {"white": 0.419, "black": 0.492, "hispanic": 0.524}, "FHA": {"white": 1.086, "black": 1.008, "hispanic": 0.958}, "VA": {"white": -0.005, "black": 0.037, "hispanic": -0.013}, "USDA": {"white": 0.345, "hispanic": 0.192}}, "income_brackets": [{"bracket": "<50K", "white": 0.649, "black": 0.648, "hispanic": 0.728}, {"bracket": "50-100K", "white": 0.493, "black": 0.691, "hispanic": 0.517}, {"bracket": "100-150K", "white": 0.395, "black": 0.734, "hispanic": 0.444}, {"bracket": "150K+", "white": 0.252, "black": 0.533, "hispanic": 0.356}], "counts": {"white": 150479, "hispanic": 1774, "black": 1696, "asian": 1549}, "yearly_spreads": {"2022": {"white": 0.376, "hispanic": 0.469, "black": 0.773, "asian": 0.342}, "2023": {"hispanic": 0.464, "white": 0.466, "asian": 0.338, "black": 0.542}, "2018": {"white": 0.637, "hispanic": 0.663, "asian": 0.489, "black": 0.693}, "2019": {"white": 0.617, "asian": 0.479, "hispanic": 0.708, "black": 0.766}, "2020": {"white": 0.314, "hispanic": 0.369, "black": 0.566, "asian": 0.227}, "2021": {"white": 0.433, "hispanic": 0.501, "black": 0.687, "asian": 0.384}}}, "Michigan": {"total_loans": 425052, "avg_rates": {"white": 3.955, "black": 4.209, "hispanic": 4.161, "asian": 3.604}, "avg_spreads": {"white": 0.549, "black": 0.907, "hispanic": 0.757, "asian": 0.158}, "rate_gap_bw": 0.358, "rate_gap_hw": 0.208, "avg_income": {"white": 98.249, "asian": 126.265, "black": 79.314, "hispanic": 79.534}, "avg_loan_amount": {"white": 196579.957, "asian": 276684.03, "black": 169930.052, "hispanic": 181197.952}, "loan_type_spreads": {"Conventional": {"white": 0.488, "black": 0.816, "hispanic": 0.674}, "FHA": {"white": 1.266, "black": 1.308, "hispanic": 1.289}, "VA": {"white": 0.065, "black": 0.1, "hispanic": 0.059}, "USDA": {"white": 0.819, "black": 0.783, "hispanic": 0.829}}, "income_brackets": [{"bracket": "<50K", "white": 0.821, "black": 1.171, "hispanic": 1.032}, {"bracket": "50-100K", "white": 0.605, "black": 0.937, "hispanic": 0.782}, {"bracket": "100-150K", "white": 0.396, "black": 0.694, "hispanic": 0.445}, {"bracket": "150K+", "white": 0.262, "black": 0.555, "hispanic": 0.298}], "counts": {"white": 374238, "asian": 15742, "black": 23160, "hispanic": 11912}, "yearly_spreads": {"2021": {"white": 0.482, "black": 0.804, "asian": 0.125, "hispanic": 0.673}, "2018": {"white": 0.764, "asian": 0.401, "hispanic": 0.985, "black": 1.165}, "2022": {"asian": 0.25, "white": 0.557, "hispanic": 0.79, "black": 0.807}, "2019": {"white": 0.723, "black": 1.098, "asian": 0.324, "hispanic": 0.965}, "2020": {"white": 0.393, "hispanic": 0.589, "asian": -0.007, "black": 0.824}, "2023": {"white": 0.567, "black": 0.793, "hispanic": 0.689, "asian": 0.177}}}, "Minnesota": {"total_loans": 434888, "avg_rates": {"white": 3.842, "black": 4.01, "hispanic": 4.067, "asian": 3.836}, "avg_spreads": {"white": 0.342, "black": 0.466, "hispanic": 0.535, "asian": 0.288}, "rate_gap_bw": 0.124, "rate_gap_hw": 0.193, "avg_income": {"white": 115.82, "black": 88.293, "hispanic": 81.033, "asian": 113.134}, "avg_loan_amount": {"white": 248701.852, "black": 250345.609, "hispanic": 219769.77, "asian": 281046.436}, "loan_type_spreads": {"Conventional": {"white": 0.306, "black": 0.241, "hispanic": 0.394}, "FHA": {"white": 1.042, "black": 1.06, "hispanic": 1.098}, "VA": {"white": -0.077, "black": -0.039, "hispanic": 0.003}, "USDA": {"white": 0.526, "black": 0.643, "hispanic": 0.558}}, "income_brackets": [{"bracket": "<50K", "white": 0.47, "black": 0.458, "hispanic": 0.552}, {"bracket": "50-100K", "white": 0.393, "black": 0.463, "hispanic": 0.566}, {"bracket": "100-150K", "white": 0.32, "black": 0.521, "hispanic": 0.529}, {"bracket": "150K+", "white": 0.22, "black": 0.43, "hispanic": 0.311}], "counts": {"white": 384856, "black": 14554, "hispanic": 13986, "asian": 21492}, "yearly_spreads": {"2020": {"white": 0.211, "black": 0.403, "hispanic": 0.453, "asian": 0.163}, "2023": {"white": 0.261, "black": 0.026, "hispanic": 0.201, "asian": 0.134}, "2022": {"white": 0.367, "asian": 0.306, "hispanic": 0.524, "black": 0.434}, "2018": {"white": 0.574, "asian": 0.622, "hispanic": 0.982, "black": 0.858}, "2021": {"white": 0.307, "hispanic": 0.466, "asian": 0.249, "black": 0.449}, "2019": {"white": 0.472, "asian": 0.423, "black": 0.636, "hispanic": 0.695}}}, "Missouri": {"total_loans": 442802, "avg_rates": {"white": 5.345, "black": 4.513, "hispanic": 4.619, "asian": 4.217}, "avg_spreads": {"white": 0.489, "black": 0.679, "hispanic": 0.637, "asian": 0.201}, "rate_gap_bw": 0.19, "rate_gap_hw": 0.148, "avg_income": {"white": 278.554, "black": 192.869, "hispanic": 128.911, "asian": 360.929}, "avg_loan_amount": {"white": 209473.341, "black": 180137.214, "hispanic": 185109.949, "asian": 284346.225}, "loan_type_spreads": {"Conventional": {"white": 0.406, "black": 0.448, "hispanic": 0.543}, "FHA": {"white": 1.151, "black": 1.179, "hispanic": 1.131}, "VA": {"white": 0.069, "black": 0.129, "hispanic": 0.072}, "USDA": {"white": 0.735, "black": 0.827, "hispanic": 0.716}}, "income_brackets": [{"bracket": "<50K", "white": 0.725, "black": 0.802, "hispanic": 0.817}, {"bracket": "50-100K", "white": 0.542, "black": 0.694, "hispanic": 0.626}, {"bracket": "100-150K", "white": 0.384, "black": 0.643, "hispanic": 0.441}, {"bracket": "150K+", "white": 0.242, "black": 0.468, "hispanic": 0.362}], "counts": {"white": 398702, "black": 23139, "hispanic": 11187, "asian": 9774}, "yearly_spreads": {"2023": {"white": 0.48, "hispanic": 0.481, "black": 0.426, "asian": -0.107}, "2022": {"white": 0.538, "black": 0.622, "hispanic": 0.608, "asian": 0.298}, "2018": {"white": 0.705, "hispanic": 0.9, "asian": 0.46, "black": 0.993}, "2020": {"white": 0.305, "asian": 0.111, "hispanic": 0.511, "black": 0.559}, "2019": {"white": 0.585, "asian": 0.362, "black": 0.838, "hispanic": 0.783}}}, "Mississippi": {"total_loans": 67601, "avg_rates": {"white": 5.658, "black": 5.774, "hispanic": 5.75, "asian": 5.456}, "avg_spreads": {"white": 0.511, "black": 0.783, "hispanic": 0.581, "asian": 0.243}, "rate_gap_bw": 0.272, "rate_gap_hw": 0.07, "avg_income": {"white": 105.126, "black": 76.66, "asian": 134.431, "hispanic": 89.425}, "avg_loan_amount": {"white": 203752.329, "black": 182852.296, "asian": 273180.924, "hispanic": 201932.584}, "loan_type_spreads": {"Conventional": {"white": 0.51, "black": 0.964, "hispanic": 0.662}, "FHA": {"white": 0.829, "black": 0.847, "hispanic": 0.844}, "VA": {"white": -0.002, "black": 0.038, "hispanic": -0.12}, "USDA": {"white": 0.481, "black": 0.537, "hispanic": 0.325}}, "income_brackets": [{"bracket": "<50K", "white": 0.781, "black": 1.035, "hispanic": 0.856}, {"bracket": "50-100K", "white": 0.584, "black": 0.723, "hispanic": 0.506}, {"bracket": "100-150K", "white": 0.408, "black": 0.657, "hispanic": 0.513}, {"bracket": "150K+", "white": 0.182, "black": 0.551, "hispanic": 0.346}], "counts": {"white": 48298, "black": 16506, "asian": 1017, "hispanic": 1780}, "yearly_spreads": {"2022": {"white": 0.534, "black": 0.857, "asian": 0.357, "hispanic": 0.597}, "2023": {"white": 0.482, "black": 0.674, "hispanic": 0.546, "asian": 0.135}}}, "Montana": {"total_loans": 26881, "avg_rates": {"white": 5.487, "black": 5.774, "hispanic": 5.703, "asian": 5.43}, "avg_spreads": {"white": 0.384, "black": 0.418, "hispanic": 0.389, "asian": 0.274}, "rate_gap_bw": 0.034, "rate_gap_hw": 0.005, "avg_income": {"white": 126.935, "hispanic": 109.73, "asian": 135.705, "black": 122.953}, "avg_loan_amount": {"white": 324848.793, "hispanic": 316224.863, "asian": 405842.105, "black": 294080.46}, "loan_type_spreads": {"Conventional": {"white": 0.437, "hispanic": 0.538}, "FHA": {"white": 0.616, "hispanic": 0.593}, "VA": {"white": -0.148, "hispanic": -0.243}, "USDA": {"white": 0.17}}, "income_brackets": [{"bracket": "<50K", "white": 0.4, "hispanic": 0.514}, {"bracket": "50-100K", "white": 0.389, "black": 0.382, "hispanic": 0.401}, {"bracket": "100-150K", "white": 0.411, "hispanic": 0.396}, {"bracket": "150K+", "white": 0.357, "hispanic": 0.326}], "counts": {"white": 26057, "hispanic": 547, "asian": 190, "black": 87}, "yearly_spreads": {"2022": {"white": 0.403, "hispanic": 0.437, "asian": 0.299, "black": 0.487}, "2023": {"white": 0.37, "hispanic": 0.333, "asian": 0.226, "black": 0.329}}}, "North Carolina": {"total_loans": 170224, "avg_rates": {"white": 5.325, "black": 5.257, "hispanic": 5.544, "asian": 5.247}, "avg_spreads": {"white": 0.192, "black": 0.209, "hispanic": 0.34, "asian": -0.011}, "rate_gap_bw": 0.017, "rate_gap_hw": 0.148, "avg_income": {"white": 122.618, "black": 93.282, "hispanic": 91.312, "asian": 145.958}, "avg_loan_amount": {"white": 291679.447, "black": 254291.139, "hispanic": 257858.934, "asian": 417462.773}, "loan_type_spreads": {"Conventional": {"white": 0.144, "black": 0.071, "hispanic": 0.3}, "FHA": {"white": 0.84, "black": 0.751, "hispanic": 0.783}, "VA": {"white": -0.067, "black": -0.024, "hispanic": -0.058}, "USDA": {"white": 0.526, "black": 0.41, "hispanic": 0.542}}, "income_brackets": [{"bracket": "<50K", "white": 0.34, "black": 0.329, "hispanic": 0.443}, {"bracket": "50-100K", "white": 0.24, "black": 0.226, "hispanic": 0.33}, {"bracket": "100-150K", "white": 0.166, "black": 0.16, "hispanic": 0.267}, {"bracket": "150K+", "white": 0.069, "black": 0.102, "hispanic": 0.343}], "counts": {"white": 122320, "black": 25675, "hispanic": 12760, "asian": 9469}, "yearly_spreads": {"2023": {"white": 0.12, "asian": -0.086, "black": 0.029, "hispanic": 0.161}, "2022": {"white": 0.238, "black": 0.329, "hispanic": 0.485, "asian": 0.052}}}, "North Dakota": {"total_loans": 17699, "avg_rates": {"white": 5.421, "black": 5.531, "hispanic": 5.72, "asian": 5.516}, "avg_spreads": {"white": 0.347, "black": 0.373, "hispanic": 0.468, "asian": 0.207}, "rate_gap_bw": 0.026, "rate_gap_hw": 0.121, "avg_income": {"white": 115.513, "hispanic": 94.158, "black": 100.866, "asian": 115.417}, "avg_loan_amount": {"white": 244572.022, "hispanic": 227546.584, "black": 279332.344, "asian": 280112.782}, "loan_type_spreads": {"Conventional": {"white": 0.337, "black": 0.371, "hispanic": 0.504}, "FHA": {"white": 0.802, "black": 0.634, "hispanic": 0.827}, "VA": {"white": -0.167, "black": -0.244, "hispanic": -0.21}, "USDA": {"white": 0.25}}, "income_brackets": [{"bracket": "<50K", "white": 0.394, "hispanic": 0.293}, {"bracket": "50-100K", "white": 0.358, "black": 0.398, "hispanic": 0.468}, {"bracket": "100-150K", "white": 0.384, "black": 0.443, "hispanic": 0.571}, {"bracket": "150K+", "white": 0.297, "hispanic": 0.449}], "counts": {"white": 16613, "hispanic": 483, "black": 337, "asian": 266}, "yearly_spreads": {"2022": {"white": 0.37, "hispanic": 0.545, "black": 0.506, "asian": 0.23}, "2023": {"white": 0.316, "asian": 0.183, "hispanic": 0.391, "black": 0.233}}}, "Nebraska": {"total_loans": 50390, "avg_rates": {"white": 5.463, "black": 5.45, "hispanic": 5.542, "asian": 5.428}, "avg_spreads": {"white": 0.383, "black": 0.339, "hispanic": 0.372, "asian": 0.204}, "rate_gap_bw": -0.044, "rate_gap_hw": -0.011, "avg_income": {"white": 117.96, "hispanic": 77.679, "black": 96.508, "asian": 124.511}, "avg_loan_amount": {"white": 232743.884, "hispanic": 182724.719, "black": 232030.1, "asian": 281282.216}, "loan_type_spreads": {"Conventional": {"white": 0.387, "black": 0.257, "hispanic": 0.235}, "FHA": {"white": 0.837, "black": 0.801, "hispanic": 0.827}, "VA": {"white": -0.062, "black": -0.027, "hispanic": -0.065}, "USDA": {"white": -0.261, "hispanic": -0.403}}, "income_brackets": [{"bracket": "<50K", "white": 0.51, "black": 0.372, "hispanic": 0.415}, {"bracket": "50-100K", "white": 0.363, "black": 0.343, "hispanic": 0.42}, {"bracket": "100-150K", "white": 0.44, "black": 0.421, "hispanic": 0.608}, {"bracket": "150K+", "white": 0.353, "black": 0.463, "hispanic": 0.512}], "counts": {"white": 42715, "hispanic": 4628, "black": 1495, "asian": 1552}, "yearly_spreads": {"2022": {"white": 0.452, "hispanic": 0.507, "black": 0.437, "asian": 0.294}, "2023": {"white": 0.296, "asian": 0.097, "hispanic": 0.229, "black": 0.224}}}, "New Hampshire": {"total_loans": 36611, "avg_rates": {"white": 5.492, "black": 5.576, "hispanic": 5.614, "asian": 5.601}, "avg_spreads": {"white": 0.309, "black": 0.483, "hispanic": 0.498, "asian": 0.276}, "rate_gap_bw": 0.174, "rate_gap_hw": 0.189, "avg_income": {"white": 135.656, "hispanic": 118.052, "black": 119.517, "asian": 153.823}, "avg_loan_amount": {"white": 311278.125, "hispanic": 343937.759, "black": 346578.947, "asian": 395093.458}, "loan_type_spreads": {"Conventional": {"white": 0.276, "black": 0.388, "hispanic": 0.427}, "FHA": {"white": 0.873, "black": 0.902, "hispanic": 0.849}, "VA": {"white": -0.057, "hispanic": -0.04}, "USDA": {"white": 0.438}}, "income_brackets": [{"bracket": "<50K", "white": 0.451, "hispanic": 0.358}, {"bracket": "50-100K", "white": 0.366, "black": 0.497, "hispanic": 0.466}, {"bracket": "100-150K", "white": 0.338, "black": 0.486, "hispanic": 0.572}, {"bracket": "150K+", "white": 0.191, "black": 0.437, "hispanic": 0.52}], "counts": {"white": 33956, "hispanic": 1205, "black": 380, "asian": 1070}, "yearly_spreads": {"2022": {"white": 0.317, "hispanic": 0.518, "black": 0.567, "asian": 0.233}, "2023": {"hispanic": 0.489, "white": 0.308, "asian": 0.339, "black": 0.363}}}, "New Jersey": {"total_loans": 165971, "avg_rates": {"white": 5.384, "black": 5.405, "hispanic": 5.541, "asian": 5.292}, "avg_spreads": {"white": 0.28, "black": 0.499, "hispanic": 0.551, "asian": 0.081}, "rate_gap_bw": 0.219, "rate_gap_hw": 0.271, "avg_income": {"asian": 203.381, "white": 170.538, "black": 124.38, "hispanic": 121.545}, "avg_loan_amount": {"asian": 495730.822, "white": 369983.427, "black": 326409.463, "hispanic": 348752.284}, "loan_type_spreads": {"Conventional": {"white": 0.222, "black": 0.32, "hispanic": 0.435}, "FHA": {"white": 0.808, "black": 0.848, "hispanic": 0.857}, "VA": {"white": -0.014, "black": 0.078, "hispanic": -0.041}, "USDA": {"white": 0.463}}, "income_brackets": [{"bracket": "<50K", "white": 0.395, "black": 0.534, "hispanic": 0.535}, {"bracket": "50-100K", "white": 0.348, "black": 0.467, "hispanic": 0.495}, {"bracket": "100-150K", "white": 0.341, "black": 0.516, "hispanic": 0.575}, {"bracket": "150K+", "white": 0.169, "black": 0.504, "hispanic": 0.57}], "counts": {"asian": 21209, "white": 104687, "black": 15999, "hispanic": 24076}, "yearly_spreads": {"2023": {"asian": 0.134, "white": 0.346, "hispanic": 0.519, "black": 0.433}, "2022": {"asian": 0.046, "white": 0.24, "black": 0.536, "hispanic": 0.567}}}, "New Mexico": {"total_loans": 160580, "avg_rates": {"white": 4.332, "black": 4.494, "hispanic": 4.719, "asian": 4.274}, "avg_spreads": {"white": 0.512, "black": 0.541, "hispanic": 0.942, "asian": 0.345}, "rate_gap_bw": 0.029, "rate_gap_hw": 0.43, "avg_income": {"hispanic": 80.003, "white": 105.872, "black": 105.907, "asian": 121.384}, "avg_loan_amount": {"hispanic": 187329.855, "white": 237388.437, "black": 229572.095, "asian": 269409.668}, "loan_type_spreads": {"Conventional": {"white": 0.525, "black": 0.798, "hispanic": 1.013}, "FHA": {"white": 1.14, "black": 1.083, "hispanic": 1.141}, "VA": {"white": 0.004, "black": 0.029, "hispanic": 0.044}, "USDA": {"white": 0.7, "hispanic": 0.841}}, "income_brackets": [{"bracket": "<50K", "white": 0.722, "black": 0.78, "hispanic": 1.19}, {"bracket": "50-100K", "white": 0.595, "black": 0.686, "hispanic": 0.972}, {"bracket": "100-150K", "white": 0.433, "black": 0.382, "hispanic": 0.707}, {"bracket": "150K+", "white": 0.341, "black": 0.357, "hispanic": 0.522}], "counts": {"hispanic": 61712, "white": 92638, "black": 3003, "asian": 3227}, "yearly_spreads": {"2022": {"hispanic": 0.868, "white": 0.532, "black": 0.533, "asian": 0.37}, "2023": {"hispanic": 0.734, "white": 0.475, "asian": 0.236, "black": 0.301}, "2018": {"white": 0.733, "asian": 0.637, "hispanic": 1.213, "black": 0.89}, "2019": {"white": 0.631, "hispanic": 1.094, "asian": 0.42, "black": 0.617}, "2020": {"white": 0.361, "hispanic": 0.832, "asian": 0.233, "black": 0.464}, "2021": {"white": 0.349, "hispanic": 0.604, "asian": 0.226, "black": 0.499}}}, "Nevada": {"total_loans": 397965, "avg_rates": {"white": 3.844, "black": 3.912, "hispanic": 4.042, "asian": 3.945}, "avg_spreads": {"white": 0.364, "black": 0.433, "hispanic": 0.657, "asian": 0.352}, "rate_gap_bw": 0.069, "rate_gap_hw": 0.293, "avg_income": {"white": 113.98, "black": 89.561, "hispanic": 75.549, "asian": 106.545}, "avg_loan_amount": {"white": 310263.74, "black": 295294.901, "hispanic": 257684.885, "asian": 321139.92}, "loan_type_spreads": {"Conventional": {"white": 0.367, "black": 0.477, "hispanic": 0.536}, "FHA": {"white": 1.061, "black": 1.062, "hispanic": 1.152}, "VA": {"white": -0.113, "black": -0.089, "hispanic": -0.104}, "USDA": {"white": 0.638, "hispanic": 0.626}}, "income_brackets": [{"bracket": "<50K", "white": 0.419, "black": 0.457, "hispanic": 0.725}, {"bracket": "50-100K", "white": 0.445, "black": 0.533, "hispanic": 0.7}, {"bracket": "100-150K", "white": 0.378, "black": 0.454, "hispanic": 0.553}, {"bracket": "150K+", "white": 0.288, "black": 0.461, "hispanic": 0.464}], "counts": {"white": 256863, "black": 25907, "hispanic": 77359, "asian": 37836}, "yearly_spreads": {"2018": {"white": 0.65, "hispanic": 0.999, "black": 0.779, "asian": 0.664}, "2022": {"white": 0.395, "asian": 0.329, "hispanic": 0.63, "black": 0.4}, "2020": {"white": 0.207, "hispanic": 0.5, "black": 0.291, "asian": 0.256}, "2019": {"black": 0.633, "white": 0.502, "hispanic": 0.889, "asian": 0.543}, "2021": {"black": 0.365, "hispanic": 0.575, "white": 0.305, "asian": 0.302}, "2023": {"white": 0.307, "hispanic": 0.313, "asian": 0.072, "black": 0.202}}}, "New York": {"total_loans": 420144, "avg_rates": {"white": 3.804, "black": 3.9, "hispanic": 3.898, "asian": 3.801}, "avg_spreads": {"white": 0.343, "black": 0.577, "hispanic": 0.527, "asian": 0.268}, "rate_gap_bw": 0.234, "rate_gap_hw": 0.184, "avg_income": {"white": 159.489, "asian": 162.389, "black": 115.456, "hispanic": 118.825}, "avg_loan_amount": {"white": 330192.118, "asian": 476053.033, "black": 361189.037, "hispanic": 360675.08}, "loan_type_spreads": {"Conventional": {"white": 0.276, "black": 0.389, "hispanic": 0.385}, "FHA": {"white": 1.102, "black": 1.096, "hispanic": 1.09}, "VA": {"white": 0.083, "black": 0.092, "hispanic": 0.034}, "USDA": {"white": 0.703, "hispanic": 0.677}}, "income_brackets": [{"bracket": "<50K", "white": 0.661, "black": 0.665, "hispanic": 0.64}, {"bracket": "50-100K", "white": 0.466, "black": 0.562, "hispanic": 0.554}, {"bracket": "100-150K", "white": 0.334, "black": 0.615, "hispanic": 0.55}, {"bracket": "150K+", "white": 0.123, "black": 0.5, "hispanic": 0.395}], "counts": {"white": 313791, "asian": 43313, "black": 29444, "hispanic": 33596}, "yearly_spreads": {"2018": {"white": 0.443, "black": 0.735, "asian": 0.383, "hispanic": 0.672}, "2023": {"white": 0.223, "asian": 0.092, "hispanic": 0.405, "black": 0.315}, "2019": {"white": 0.43, "black": 0.715, "asian": 0.312, "hispanic": 0.69}, "2021": {"white": 0.353, "asian": 0.32, "hispanic": 0.468, "black": 0.541}, "2020": {"white": 0.282, "hispanic": 0.446, "black": 0.529, "asian": 0.215}, "2022": {"black": 0.437, "white": 0.22, "hispanic": 0.471, "asian": 0.135}}}, "Ohio": {"total_loans": 440675, "avg_rates": {"white": 4.108, "black": 6.577, "hispanic": 4.062, "asian": 3.644}, "avg_spreads": {"white": 0.518, "black": 0.773, "hispanic": 0.734, "asian": 0.221}, "rate_gap_bw": 0.255, "rate_gap_hw": 0.216, "avg_income": {"white": 100.123, "asian": 117.501, "black": 75.834, "hispanic": 77.9}, "avg_loan_amount": {"white": 187418.298, "asian": 262887.478, "black": 170899.762, "hispanic": 173646.656}, "loan_type_spreads": {"Conventional": {"white": 0.43, "black": 0.577, "hispanic": 0.576}, "FHA": {"white": 1.273, "black": 1.309, "hispanic": 1.328}, "VA": {"white": 0.062, "black": 0.122, "hispanic": 0.022}, "USDA": {"white": 0.77, "black": 0.839, "hispanic": 0.792}}, "income_brackets": [{"bracket": "<50K", "white": 0.799, "black": 0.945, "hispanic": 0.976}, {"bracket": "50-100K", "white": 0.57, "black": 0.809, "hispanic": 0.739}, {"bracket": "100-150K", "white": 0.387, "black": 0.607, "hispanic": 0.437}, {"bracket": "150K+", "white": 0.221, "black": 0.433, "hispanic": 0.296}], "counts": {"white": 393045, "asian": 12762, "black": 25240, "hispanic": 9628}, "yearly_spreads": {"2021": {"white": 0.464, "black": 0.685, "asian": 0.203, "hispanic": 0.653}, "2018": {"asian": 0.375, "white": 0.726, "black": 1.004, "hispanic": 0.915}, "2022": {"white": 0.47, "asian": 0.25, "hispanic": 0.71, "black": 0.698}, "2019": {"white": 0.656, "black": 0.983, "asian": 0.324, "hispanic": 0.93}, "2023": {"white": 0.564, "asian": 0.226, "black": 0.614, "hispanic": 0.717}, "2020": {"white": 0.375, "black": 0.662, "asian": 0.11, "hispanic": 0.605}}}, "Oklahoma": {"total_loans": 326626, "avg_rates": {"white": 4.213, "black": 4.25, "hispanic": 4.469, "asian": 4.047}, "avg_spreads": {"white": 0.615, "black": 0.678, "hispanic": 0.902, "asian": 0.415}, "rate_gap_bw": 0.063, "rate_gap_hw": 0.287, "avg_income": {"white": 99.682, "hispanic": 68.949, "black": 84.44, "asian": 97.758}, "avg_loan_amount": {"white": 201767.991, "hispanic": 168516.953, "black": 195670.914, "asian": 223905.325}, "loan_type_spreads": {"Conventional": {"white": 0.587, "black": 0.755, "hispanic": 0.875}, "FHA": {"white": 1.219, "black": 1.186, "hispanic": 1.272}, "VA": {"white": 0.04, "black": 0.063, "hispanic": 0.055}, "USDA": {"white": 0.7, "black": 0.725, "hispanic": 0.661}}, "income_brackets": [{"bracket": "<50K", "white": 0.903, "black": 0.974, "hispanic": 1.108}, {"bracket": "50-100K", "white": 0.692, "black": 0.724, "hispanic": 0.88}, {"bracket": "100-150K", "white": 0.487, "black": 0.537, "hispanic": 0.573}, {"bracket": "150K+", "white": 0.332, "black": 0.48, "hispanic": 0.499}], "counts": {"white": 275485, "hispanic": 25306, "black": 15695, "asian": 10140}, "yearly_spreads": {"2022": {"white": 0.643, "hispanic": 0.863, "black": 0.702, "asian": 0.444}, "2023": {"white": 0.569, "black": 0.484, "asian": 0.309, "hispanic": 0.641}, "2018": {"white": 0.89, "hispanic": 1.179, "asian": 0.654, "black": 1.009}, "2019": {"black": 0.945, "white": 0.803, "asian": 0.515, "hispanic": 1.261}, "2020": {"white": 0.424, "black": 0.463, "asian": 0.289, "hispanic": 0.828}, "2021": {"white": 0.566, "black": 0.642, "asian": 0.428, "hispanic": 0.837}}}, "Oregon": {"total_loans": 404590, "avg_rates": {"white": 3.877, "black": 4.051, "hispanic": 4.213, "asian": 3.727}, "avg_spreads": {"white": 0.354, "black": 0.392, "hispanic": 0.58, "asian": 0.162}, "rate_gap_bw": 0.038, "rate_gap_hw": 0.226, "avg_income": {"black": 159.332, "white": 154.367, "hispanic": 99.444, "asian": 153.382}, "avg_loan_amount": {"black": 362810.356, "white": 315785.275, "hispanic": 294186.042, "asian": 374445.975}, "loan_type_spreads": {"Conventional": {"white": 0.344, "black": 0.353, "hispanic": 0.52}, "FHA": {"white": 0.985, "black": 0.913, "hispanic": 0.973}, "VA": {"white": -0.085, "black": -0.094, "hispanic": -0.103}, "USDA": {"white": 0.471, "hispanic": 0.49}}, "income_brackets": [{"bracket": "<50K", "white": 0.441, "black": 0.237, "hispanic": 0.625}, {"bracket": "50-100K", "white": 0.412, "black": 0.43, "hispanic": 0.621}, {"bracket": "100-150K", "white": 0.343, "black": 0.415, "hispanic": 0.532}, {"bracket": "150K+", "white": 0.283, "black": 0.444, "hispanic": 0.474}], "counts": {"black": 4809, "white": 354640, "hispanic": 24817, "asian": 20324}, "yearly_spreads": {"2023": {"black": 0.345, "white": 0.447, "asian": 0.1, "hispanic": 0.542}, "2022": {"white": 0.378, "hispanic": 0.605, "asian": 0.13, "black": 0.408}, "2019": {"white": 0.481, "hispanic": 0.75, "asian": 0.282, "black": 0.544}, "2018": {"white": 0.572, "hispanic": 0.838, "asian": 0.367, "black": 0.664}, "2021": {"white": 0.291, "hispanic": 0.486, "asian": 0.151, "black": 0.327}, "2020": {"white": 0.218, "asian": 0.075, "hispanic": 0.436, "black": 0.259}}}, "Pennsylvania": {"total_loans": 430806, "avg_rates": {"white": 3.81, "black": 4.177, "hispanic": 4.006, "asian": 3.653}, "avg_spreads": {"white": 0.378, "black": 0.72, "hispanic": 0.705, "asian": 0.195}, "rate_gap_bw": 0.342, "rate_gap_hw": 0.327, "avg_income": {"white": 113.055, "asian": 129.936, "black": 81.037, "hispanic": 73.003}, "avg_loan_amount": {"white": 218787.871, "asian": 306303.216, "black": 190103.451, "hispanic": 184918.99}, "loan_type_spreads": {"Conventional": {"white": 0.307, "black": 0.521, "hispanic": 0.478}, "FHA": {"white": 1.093, "black": 1.184, "hispanic": 1.178}, "VA": {"white": -0.014, "black": 0.074, "hispanic": 0.055}, "USDA": {"white": 0.539, "black": 0.541, "hispanic": 0.604}}, "income_brackets": [{"bracket": "<50K", "white": 0.585, "black": 0.849, "hispanic": 0.826}, {"bracket": "50-100K", "white": 0.448, "black": 0.763, "hispanic": 0.718}, {"bracket": "100-150K", "white": 0.317, "black": 0.605, "hispanic": 0.505}, {"bracket": "150K+", "white": 0.173, "black": 0.445, "hispanic": 0.321}], "counts": {"white": 368191, "asian": 19590, "black": 23151, "hispanic": 19874}, "yearly_spreads": {"2018": {"white": 0.463, "black": 0.911, "asian": 0.328, "hispanic": 0.898}, "2023": {"asian": 0.184, "white": 0.27, "black": 0.461, "hispanic": 0.502}, "2019": {"white": 0.501, "asian": 0.295, "hispanic": 0.888, "black": 0.932}, "2021": {"white": 0.384, "hispanic": 0.639, "black": 0.647, "asian": 0.177}, "2020": {"asian": 0.116, "white": 0.308, "black": 0.648, "hispanic": 0.616}, "2022": {"white": 0.244, "black": 0.597, "hispanic": 0.664, "asian": 0.175}}}, "Rhode Island": {"total_loans": 147714, "avg_rates": {"white": 3.869, "black": 4.103, "hispanic": 4.285, "asian": 3.841}, "avg_spreads": {"white": 0.304, "black": 0.642, "hispanic": 0.727, "asian": 0.295}, "rate_gap_bw": 0.338, "rate_gap_hw": 0.423, "avg_income": {"black": 86.541, "hispanic": 77.082, "white": 117.024, "asian": 115.032}, "avg_loan_amount": {"black": 259446.05, "hispanic": 248679.93, "white": 264955.689, "asian": 292102.526}, "loan_type_spreads": {"Conventional": {"white": 0.231, "black": 0.395, "hispanic": 0.456}, "FHA": {"white": 1.027, "black": 1.039, "hispanic": 1.116}, "VA": {"white": -0.089, "black": 0.011, "hispanic": -0.048}, "USDA": {"white": 0.518}}, "income_brackets": [{"bracket": "<50K", "white": 0.389, "black": 0.668, "hispanic": 0.975}, {"bracket": "50-100K", "white": 0.388, "black": 0.689, "hispanic": 0.708}, {"bracket": "100-150K", "white": 0.291, "black": 0.627, "hispanic": 0.579}, {"bracket": "150K+", "white": 0.133, "black": 0.399, "hispanic": 0.38}], "counts": {"black": 6228, "hispanic": 13772, "white": 124349, "asian": 3365}, "yearly_spreads": {"2022": {"black": 0.576, "hispanic": 0.533, "white": 0.186, "asian": 0.277}, "2023": {"black": 0.522, "white": 0.266, "hispanic": 0.536, "asian": 0.172}, "2018": {"white": 0.378, "black": 0.965, "hispanic": 0.985, "asian": 0.446}, "2019": {"white": 0.401, "hispanic": 1.193, "black": 0.763, "asian": 0.372}, "2020": {"white": 0.25, "black": 0.588, "hispanic": 0.662, "asian": 0.267}, "2021": {"white": 0.33, "black": 0.56, "asian": 0.272, "hispanic": 0.612}}}, "South Carolina": {"total_loans": 426762, "avg_rates": {"white": 4.044, "black": 4.343, "hispanic": 4.259, "asian": 3.899}, "avg_spreads": {"white": 0.445, "black": 0.813, "hispanic": 0.625, "asian": 0.227}, "rate_gap_bw": 0.368, "rate_gap_hw": 0.18, "avg_income": {"white": 104.98, "black": 71.117, "asian": 112.367, "hispanic": 78.546}, "avg_loan_amount": {"white": 254827.524, "black": 204849.127, "asian": 290140.837, "hispanic": 227144.786}, "loan_type_spreads": {"Conventional": {"white": 0.421, "black": 1.058, "hispanic": 0.645}, "FHA": {"white": 1.107, "black": 1.17, "hispanic": 1.05}, "VA": {"white": -0.05, "black": 0.06, "hispanic": -0.078}, "USDA": {"white": 0.629, "black": 0.651, "hispanic": 0.569}}, "income_brackets": [{"bracket": "<50K", "white": 0.712, "black": 1.143, "hispanic": 0.856}, {"bracket": "50-100K", "white": 0.51, "black": 0.849, "hispanic": 0.61}, {"bracket": "100-150K", "white": 0.35, "black": 0.542, "hispanic": 0.438}, {"bracket": "150K+", "white": 0.214, "black": 0.41, "hispanic": 0.453}], "counts": {"white": 343700, "black": 56604, "asian": 9053, "hispanic": 17405}, "yearly_spreads": {"2021": {"white": 0.413, "black": 0.773, "hispanic": 0.604, "asian": 0.203}, "2023": {"white": 0.335, "black": 0.461, "hispanic": 0.369, "asian": 0.093}, "2022": {"white": 0.443, "black": 0.689, "hispanic": 0.644, "asian": 0.199}, "2018": {"white": 0.65, "black": 1.122, "asian": 0.47, "hispanic": 0.877}, "2020": {"asian": 0.168, "black": 0.796, "white": 0.329, "hispanic": 0.565}, "2019": {"white": 0.596, "black": 1.022, "hispanic": 0.8, "asian": 0.354}}}, "South Dakota": {"total_loans": 103913, "avg_rates": {"white": 3.825, "black": 4.105, "hispanic": 4.142, "asian": 3.976}, "avg_spreads": {"white": 0.33, "black": 0.512, "hispanic": 0.547, "asian": 0.324}, "rate_gap_bw": 0.182, "rate_gap_hw": 0.217, "avg_income": {"white": 103.022, "hispanic": 77.682, "asian": 110.352, "black": 75.046}, "avg_loan_amount": {"white": 222131.471, "hispanic": 203321.711, "asian": 241412.289, "black": 223179.104}, "loan_type_spreads": {"Conventional": {"white": 0.322, "black": 0.429, "hispanic": 0.514}, "FHA": {"white": 0.949, "black": 0.928, "hispanic": 0.946}, "VA": {"white": -0.125, "black": -0.008, "hispanic": -0.061}, "USDA": {"white": 0.276, "hispanic": 0.412}}, "income_brackets": [{"bracket": "<50K", "white": 0.481, "black": 0.639, "hispanic": 0.672}, {"bracket": "50-100K", "white": 0.377, "black": 0.521, "hispanic": 0.566}, {"bracket": "100-150K", "white": 0.275, "black": 0.462, "hispanic": 0.365}, {"bracket": "150K+", "white": 0.217, "black": 0.226, "hispanic": 0.468}], "counts": {"white": 99748, "hispanic": 2151, "asian": 1009, "black": 1005}, "yearly_spreads": {"2022": {"white": 0.465, "hispanic": 0.613, "asian": 0.307, "black": 0.777}, "2023": {"white": 0.379, "hispanic": 0.415, "asian": 0.335, "black": 0.423}, "2018": {"white": 0.621, "hispanic": 0.814, "black": 0.768, "asian": 0.521}, "2019": {"white": 0.469, "black": 0.505, "hispanic": 0.635, "asian": 0.457}, "2020": {"white": 0.108, "hispanic": 0.365, "black": 0.28, "asian": 0.229}, "2021": {"white": 0.295, "black": 0.445, "hispanic": 0.557, "asian": 0.262}}}, "Tennessee": {"total_loans": 435304, "avg_rates": {"white": 4.254, "black": 4.085, "hispanic": 4.353, "asian": 3.84}, "avg_spreads": {"white": 0.474, "black": 0.622, "hispanic": 0.678, "asian": 0.223}, "rate_gap_bw": 0.148, "rate_gap_hw": 0.204, "avg_income": {"black": 81.398, "white": 104.395, "hispanic": 81.772, "asian": 121.691}, "avg_loan_amount": {"black": 223086.615, "white": 251303.749, "hispanic": 237116.126, "asian": 327763.783}, "loan_type_spreads": {"Conventional": {"white": 0.45, "black": 0.581, "hispanic": 0.737}, "FHA": {"white": 1.029, "black": 1.074, "hispanic": 0.995}, "VA": {"white": -0.036, "black": 0.006, "hispanic": -0.049}, "USDA": {"white": 0.589, "black": 0.528, "hispanic": 0.483}}, "income_brackets": [{"bracket": "<50K", "white": 0.732, "black": 0.8, "hispanic": 0.922}, {"bracket": "50-100K", "white": 0.522, "black": 0.67, "hispanic": 0.681}, {"bracket": "100-150K", "white": 0.366, "black": 0.517, "hispanic": 0.47}, {"bracket": "150K+", "white": 0.243, "black": 0.419, "hispanic": 0.369}], "counts": {"black": 35952, "white": 374355, "hispanic": 15311, "asian": 9686}, "yearly_spreads": {"2020": {"black": 0.548, "white": 0.349, "asian": 0.152, "hispanic": 0.594}, "2022": {"white": 0.464, "black": 0.563, "hispanic": 0.652, "asian": 0.241}, "2023": {"white": 0.418, "hispanic": 0.445, "black": 0.35, "asian": 0.089}, "2021": {"white": 0.411, "hispanic": 0.617, "black": 0.558, "asian": 0.187}, "2018": {"white": 0.694, "hispanic": 0.941, "black": 0.886, "asian": 0.445}, "2019": {"white": 0.629, "black": 0.794, "hispanic": 0.921, "asian": 0.352}}}, "Texas": {"total_loans": 418636, "avg_rates": {"white": 3.795, "black": 3.811, "hispanic": 4.024, "asian": 3.424}, "avg_spreads": {"white": 0.492, "black": 0.657, "hispanic": 0.925, "asian": 0.156}, "rate_gap_bw": 0.165, "rate_gap_hw": 0.433, "avg_income": {"white": 137.246, "black": 99.538, "asian": 139.866, "hispanic": 88.128}, "avg_loan_amount": {"white": 278361.717, "black": 248476.774, "asian": 324746.488, "hispanic": 206135.096}, "loan_type_spreads": {"Conventional": {"white": 0.457, "black": 0.605, "hispanic": 0.874}, "FHA": {"white": 1.266, "black": 1.288, "hispanic": 1.337}, "VA": {"white": -0.076, "black": -0.065, "hispanic": -0.043}, "USDA": {"white": 0.632, "black": 0.575, "hispanic": 0.602}}, "income_brackets": [{"bracket": "<50K", "white": 0.888, "black": 0.923, "hispanic": 1.305}, {"bracket": "50-100K", "white": 0.648, "black": 0.804, "hispanic": 1.001}, {"bracket": "100-150K", "white": 0.432, "black": 0.59, "hispanic": 0.712}, {"bracket": "150K+", "white": 0.301, "black": 0.455, "hispanic": 0.467}], "counts": {"white": 250024, "black": 35392, "asian": 34594, "hispanic": 98626}, "yearly_spreads": {"2018": {"white": 0.741, "hispanic": 1.269, "black": 0.994, "asian": 0.386}, "2019": {"white": 0.663, "black": 0.863, "asian": 0.281, "hispanic": 1.211}, "2021": {"asian": 0.129, "hispanic": 0.78, "white": 0.427, "black": 0.564}, "2020": {"white": 0.348, "hispanic": 0.768, "asian": 0.099, "black": 0.538}, "2022": {"white": 0.493, "asian": 0.124, "black": 0.502, "hispanic": 0.773}, "2023": {"asian": -0.07, "hispanic": 0.438, "white": 0.302, "black": 0.138}}}, "Utah": {"total_loans": 436404, "avg_rates": {"white": 3.835, "black": 3.957, "hispanic": 4.172, "asian": 3.717}, "avg_spreads": {"white": 0.371, "black": 0.504, "hispanic": 0.757, "asian": 0.238}, "rate_gap_bw": 0.133, "rate_gap_hw": 0.386, "avg_income": {"white": 108.854, "hispanic": 76.848, "asian": 107.458, "black": 88.742}, "avg_loan_amount": {"white": 299635.911, "hispanic": 258971.689, "asian": 334479.042, "black": 300889.058}, "loan_type_spreads": {"Conventional": {"white": 0.345, "black": 0.525, "hispanic": 0.699}, "FHA": {"white": 0.977, "black": 0.928, "hispanic": 1.077}, "VA": {"white": -0.153, "black": -0.05, "hispanic": -0.135}, "USDA": {"white": 0.357, "hispanic": 0.421}}, "income_brackets": [{"bracket": "<50K", "white": 0.517, "black": 0.629, "hispanic": 0.802}, {"bracket": "50-100K", "white": 0.433, "black": 0.607, "hispanic": 0.831}, {"bracket": "100-150K", "white": 0.299, "black": 0.397, "hispanic": 0.572}, {"bracket": "150K+", "white": 0.257, "black": 0.313, "hispanic": 0.484}], "counts": {"white": 387158, "hispanic": 36594, "asian": 10020, "black": 2632}, "yearly_spreads": {"2021": {"white": 0.27, "hispanic": 0.602, "asian": 0.167, "black": 0.386}, "2018": {"white": 0.707, "hispanic": 1.13, "asian": 0.561, "black": 0.937}, "2023": {"white": 0.369, "hispanic": 0.639, "asian": 0.107, "black": 0.369}, "2020": {"white": 0.229, "hispanic": 0.575, "asian": 0.131, "black": 0.336}, "2019": {"white": 0.549, "hispanic": 1.042, "asian": 0.416, "black": 0.736}}}, "Virginia": {"total_loans": 404706, "avg_rates": {"white": 3.709, "black": 3.924, "hispanic": 3.873, "asian": 3.501}, "avg_spreads": {"white": 0.281, "black": 0.454, "hispanic": 0.465, "asian": 0.089}, "rate_gap_bw": 0.173, "rate_gap_hw": 0.184, "avg_income": {"white": 124.811, "black": 93.532, "hispanic": 93.865, "asian": 145.249}, "avg_loan_amount": {"white": 319310.849, "black": 280563.294, "hispanic": 310840.361, "asian": 423304.695}, "loan_type_spreads": {"Conventional": {"white": 0.295, "black": 0.51, "hispanic": 0.444}, "FHA": {"white": 1.048, "black": 1.073, "hispanic": 1.077}, "VA": {"white": -0.155, "black": -0.076, "hispanic": -0.132}, "USDA": {"white": 0.554, "black": 0.535, "hispanic": 0.571}}, "income_brackets": [{"bracket": "<50K", "white": 0.547, "black": 0.681, "hispanic": 0.683}, {"bracket": "50-100K", "white": 0.419, "black": 0.592, "hispanic": 0.565}, {"bracket": "100-150K", "white": 0.239, "black": 0.414, "hispanic": 0.38}, {"bracket": "150K+", "white": 0.13, "black": 0.302, "hispanic": 0.245}], "counts": {"white": 288848, "black": 52264, "hispanic": 27512, "asian": 36082}, "yearly_spreads": {"2021": {"white": 0.238, "black": 0.396, "asian": 0.051, "hispanic": 0.37}, "2018": {"white": 0.493, "hispanic": 0.729, "black": 0.721, "asian": 0.325}, "2022": {"black": 0.489, "white": 0.339, "asian": 0.135, "hispanic": 0.543}, "2019": {"white": 0.415, "black": 0.592, "hispanic": 0.639, "asian": 0.211}, "2023": {"white": 0.341, "black": 0.406, "hispanic": 0.516, "asian": 0.083}, "2020": {"white": 0.136, "hispanic": 0.294, "black": 0.293, "asian": -0.003}}}, "Vermont": {"total_loans": 59154, "avg_rates": {"white": 3.913, "black": 4.11, "hispanic": 3.95, "asian": 3.819}, "avg_spreads": {"white": 0.285, "black": 0.363, "hispanic": 0.299, "asian": 0.146}, "rate_gap_bw": 0.078, "rate_gap_hw": 0.014, "avg_income": {"black": 96.434, "white": 107.418, "hispanic": 98.106, "asian": 113.894}, "avg_loan_amount": {"black": 249238.806, "white": 223457.469, "hispanic": 225090.09, "asian": 265992.167}, "loan_type_spreads": {"Conventional": {"white": 0.238, "black": 0.246, "hispanic": 0.246}, "FHA": {"white": 1.094, "black": 1.048, "hispanic": 1.044}, "VA": {"white": -0.014, "hispanic": 0.005}, "USDA": {"white": 0.485}}, "income_brackets": [{"bracket": "<50K", "white": 0.483, "black": 0.42, "hispanic": 0.409}, {"bracket": "50-100K", "white": 0.321, "black": 0.25, "hispanic": 0.303}, {"bracket": "100-150K", "white": 0.245, "black": 0.626, "hispanic": 0.354}, {"bracket": "150K+", "white": 0.126, "black": 0.406, "hispanic": 0.149}], "counts": {"black": 335, "white": 57276, "hispanic": 777, "asian": 766}, "yearly_spreads": {"2022": {"black": 0.119, "white": 0.198, "hispanic": 0.239, "asian": 0.135}, "2023": {"white": 0.127, "hispanic": -0.019, "asian": 0.153, "black": 0.088}, "2018": {"white": 0.462, "hispanic": 0.629, "asian": 0.215}, "2019": {"white": 0.381, "black": 0.364, "asian": 0.15, "hispanic": 0.301}, "2020": {"white": 0.203, "hispanic": 0.305, "black": 0.413, "asian": 0.021}, "2021": {"white": 0.321, "hispanic": 0.367, "black": 0.579, "asian": 0.228}}}, "Washington": {"total_loans": 393115, "avg_rates": {"white": 3.707, "black": 3.778, "hispanic": 3.844, "asian": 3.623}, "avg_spreads": {"white": 0.312, "black": 0.35, "hispanic": 0.48, "asian": 0.086}, "rate_gap_bw": 0.038, "rate_gap_hw": 0.168, "avg_income": {"white": 130.935, "asian": 160.22, "hispanic": 97.883, "black": 127.311}, "avg_loan_amount": {"white": 353161.214, "asian": 514298.219, "hispanic": 308394.939, "black": 362715.051}, "loan_type_spreads": {"Conventional": {"white": 0.296, "black": 0.305, "hispanic": 0.386}, "FHA": {"white": 1.096, "black": 1.081, "hispanic": 1.149}, "VA": {"white": -0.096, "black": -0.056, "hispanic": -0.06}, "USDA": {"white": 0.569, "hispanic": 0.528}}, "income_brackets": [{"bracket": "<50K", "white": 0.406, "black": 0.297, "hispanic": 0.569}, {"bracket": "50-100K", "white": 0.387, "black": 0.422, "hispanic": 0.543}, {"bracket": "100-150K", "white": 0.322, "black": 0.407, "hispanic": 0.436}, {"bracket": "150K+", "white": 0.25, "black": 0.391, "hispanic": 0.34}], "counts": {"white": 313261, "asian": 45812, "hispanic": 23591, "black": 10451}, "yearly_spreads": {"2021": {"white": 0.267, "asian": 0.072, "black": 0.303, "hispanic": 0.427}, "2018": {"white": 0.586, "asian": 0.363, "black": 0.689, "hispanic": 0.811}, "2023": {"white": 0.296, "black": 0.117, "asian": -0.004, "hispanic": 0.349}, "2020": {"asian": -0.011, "white": 0.174, "hispanic": 0.333, "black": 0.198}, "2019": {"hispanic": 0.617, "white": 0.427, "black": 0.516, "asian": 0.165}}}, "Wisconsin": {"total_loans": 450942, "avg_rates": {"white": 3.949, "black": 4.732, "hispanic": 4.254, "asian": 3.802}, "avg_spreads": {"white": 0.257, "black": 0.661, "hispanic": 0.554, "asian": 0.199}, "rate_gap_bw": 0.404, "rate_gap_hw": 0.297, "avg_income": {"white": 109.332, "hispanic": 74.275, "black": 96.283, "asian": 117.093}, "avg_loan_amount": {"white": 202682.931, "hispanic": 168223.203, "black": 172169.712, "asian": 249999.495}, "loan_type_spreads": {"Conventional": {"white": 0.203, "black": 0.471, "hispanic": 0.448}, "FHA": {"white": 1.177, "black": 1.281, "hispanic": 1.225}, "VA": {"white": -0.004, "black": 0.114, "hispanic": 0.02}, "USDA": {"white": 0.678, "hispanic": 0.643}}, "income_brackets": [{"bracket": "<50K", "white": 0.498, "black": 0.857, "hispanic": 0.726}, {"bracket": "50-100K", "white": 0.333, "black": 0.717, "hispanic": 0.589}, {"bracket": "100-150K", "white": 0.164, "black": 0.445, "hispanic": 0.268}, {"bracket": "150K+", "white": -0.037, "black": 0.172, "hispanic": 0.019}], "counts": {"white": 415663, "hispanic": 15860, "black": 9522, "asian": 9897}, "yearly_spreads": {"2020": {"white": 0.211, "asian": 0.135, "hispanic": 0.555, "black": 0.706}, "2023": {"white": -0.083, "asian": -0.039, "hispanic": 0.182, "black": 0.312}, "2022": {"white": 0.194, "hispanic": 0.578, "black": 0.574, "asian": 0.214}, "2021": {"white": 0.278, "hispanic": 0.523, "black": 0.621, "asian": 0.197}, "2018": {"white": 0.437, "asian": 0.423, "hispanic": 0.792, "black": 0.862}, "2019": {"white": 0.378, "asian": 0.293, "hispanic": 0.638, "black": 0.832}}}, "West Virginia": {"total_loans": 140729, "avg_rates": {"white": 5.844, "black": 4.846, "hispanic": 4.362, "asian": 6.437}, "avg_spreads": {"white": 0.975, "black": 0.635, "hispanic": 0.615, "asian": 0.328}, "rate_gap_bw": -0.34, "rate_gap_hw": -0.36, "avg_income": {"white": 87.589, "black": 78.981, "hispanic": 81.805, "asian": 119.805}, "avg_loan_amount": {"white": 176857.947, "black": 207765.111, "hispanic": 221219.82, "asian": 245856.531}, "loan_type_spreads": {"Conventional": {"white": 1.111, "black": 0.645, "hispanic": 0.606}, "FHA": {"white": 1.205, "black": 1.063, "hispanic": 1.045}, "VA": {"white": 0.053, "black": 0.068, "hispanic": -0.006}, "USDA": {"white": 0.671, "black": 0.626, "hispanic": 0.571}}, "income_brackets": [{"bracket": "<50K", "white": 0.907, "black": 0.848, "hispanic": 0.871}, {"bracket": "50-100K", "white": 0.681, "black": 0.671, "hispanic": 0.652}, {"bracket": "100-150K", "white": 0.463, "black": 0.633, "hispanic": 0.415}, {"bracket": "150K+", "white": 3.736, "black": 0.354, "hispanic": 0.256}], "counts": {"white": 132781, "black": 3772, "hispanic": 2775, "asian": 1401}, "yearly_spreads": {"2022": {"white": 0.555, "black": 0.617, "hispanic": 0.607, "asian": 0.339}, "2023": {"white": 0.467, "black": 0.279, "hispanic": 0.362, "asian": 0.158}, "2018": {"white": 0.854, "asian": 0.46, "hispanic": 0.946, "black": 0.93}, "2019": {"white": 3.043, "asian": 0.416, "black": 0.913, "hispanic": 0.872}, "2020": {"white": 0.547, "black": 0.605, "hispanic": 0.593, "asian": 0.342}, "2021": {"white": 0.582, "black": 0.584, "hispanic": 0.535, "asian": 0.311}}}, "Wyoming": {"total_loans": 70799, "avg_rates": {"white": 3.747, "black": 3.778, "hispanic": 3.85, "asian": 3.626}, "avg_spreads": {"white": 0.289, "black": 0.299, "hispanic": 0.314, "asian": 0.179}, "rate_gap_bw": 0.01, "rate_gap_hw": 0.025, "avg_income": {"white": 108.182, "hispanic": 78.897, "asian": 106.139, "black": 98.652}, "avg_loan_amount": {"white": 255663.071, "hispanic": 214306.086, "asian": 276132.075, "black": 274536.785}, "loan_type_spreads": {"Conventional": {"white": 0.24, "black": 0.314, "hispanic": 0.162}, "FHA": {"white": 0.888, "black": 0.887, "hispanic": 0.863}, "VA": {"white": -0.121, "black": -0.036, "hispanic": -0.093}, "USDA": {"white": 0.327, "hispanic": 0.277}}, "income_brackets": [{"bracket": "<50K", "white": 0.349, "black": 0.282, "hispanic": 0.429}, {"bracket": "50-100K", "white": 0.309, "black": 0.396, "hispanic": 0.26}, {"bracket": "100-150K", "white": 0.331, "black": 0.486, "hispanic": 0.416}, {"bracket": "150K+", "white": 0.254, "hispanic": 0.408}], "counts": {"white": 66554, "hispanic": 3401, "asian": 477, "black": 367}, "yearly_spreads": {"2022": {"white": 0.298, "hispanic": 0.254, "asian": 0.185, "black": 0.25}, "2023": {"white": 0.111, "hispanic": -0.169, "asian": -0.005, "black": 0.18}, "2018": {"white": 0.553, "hispanic": 0.71, "asian": 0.544, "black": 0.518}, "2019": {"white": 0.417, "hispanic": 0.523, "asian": 0.341, "black": 0.63}, "2020": {"white": 0.185, "hispanic": 0.271, "black": 0.161, "asian": 0.021}, "2021": {"white": 0.279, "hispanic": 0.327, "black": 0.267, "asian": 0.159}}}}} as const;
-
-export const regressionResults = {
-  n: 1892859,
-  r_squared: 0.0431,
-  adj_r_squared: 0.043,
-  controls: ["income", "loan_amount", "loan_to_value_ratio", "debt_to_income_ratio", "loan_type", "occupancy_type", "activity_year", "state"],
-  baseline: "White (non-Hispanic)",
-  coefficients: {
-    "Black": { coef: 0.071, ci_lower: 0.0616, ci_upper: 0.0804, p_value: 0.0, significant: true },
-    "Hispanic": { coef: 0.0966, ci_lower: 0.0873, ci_upper: 0.106, p_value: 0.0, significant: true },
-    "Asian": { coef: -0.1311, ci_lower: -0.1414, ci_upper: -0.1207, p_value: 0.0, significant: true },
-    "American Indian / Alaska Native": { coef: 0.0038, ci_lower: -0.033, ci_upper: 0.0406, p_value: 0.84, significant: false },
-    "Native Hawaiian / Pacific Islander": { coef: 0.0203, ci_lower: -0.0327, ci_upper: 0.0734, p_value: 0.454, significant: false },
-  },
-  methodology_note: "OLS regression on 1.9M originated mortgage loans (2018-2023). Dependent variable: rate spread above APOR benchmark. Controls: income, loan amount, LTV, DTI, loan type, occupancy type, state, and year fixed effects. Race/ethnicity coefficients represent the additional rate spread (in percentage points) relative to White non-Hispanic borrowers with identical observable characteristics."
-} as const;
+const data = {"summary": {"total_loans": 15278109, "num_states": 51, "states": ["Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware", "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky", "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi", "Missouri", "Montana", "Nebraska", "Nevada", "New Hampshire", "New Jersey", "New Mexico", "New York", "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon", "Pennsylvania", "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah", "Vermont", "Virginia", "Washington", "Washington DC", "West Virginia", "Wisconsin", "Wyoming"], "years": "2018-2023"}, "avg_rates": {"white": 4.193, "black": 4.341, "hispanic": 4.324, "asian": 4.054}, "avg_spreads": {"white": 0.391, "black": 0.552, "hispanic": 0.583, "asian": 0.212}, "yearly_spreads": {"2018": {"white": 0.608, "asian": 0.431, "hispanic": 0.879, "black": 0.864}, "2019": {"white": 0.585, "black": 0.75, "hispanic": 0.807, "asian": 0.335}, "2020": {"white": 0.264, "black": 0.474, "asian": 0.135, "hispanic": 0.5}, "2021": {"black": 0.519, "white": 0.349, "asian": 0.2, "hispanic": 0.536}, "2022": {"white": 0.375, "asian": 0.215, "black": 0.537, "hispanic": 0.572}, "2023": {"white": 0.344, "hispanic": 0.402, "black": 0.328, "asian": 0.101}}, "state_summary": {"Alaska": {"total_loans": 67124, "rate_gap_bw": -0.019, "rate_gap_hw": 0.028, "has_income_brackets": true, "shard": "/data/states/AK.1fc5b1ff70.json"}, "Alabama": {"total_loans": 445261, "rate_gap_bw": 0.225, "rate_gap_hw": 0.122, "has_income_brackets": true, "shard": "/data/states/AL.a77c55097d.json"}, "Arkansas": {"total_loans": 306870, "rate_gap_bw": 0.283, "rate_gap_hw": 0.131, "has_income_brackets": true, "shard": "/data/states/AR.96c13d75d5.json"}, "Arizona": {"total_loans": 410444, "rate_gap_bw": 0.113, "rate_gap_hw": 0.262, "has_income_brackets": true, "shard": "/data/states/AZ.40eacd1c23.json"}, "California": {"total_loans": 388445, "rate_gap_bw": 0.102, "rate_gap_hw": 0.187, "has_income_brackets": true, "shard": "/data/states/CA.9a18eb86df.json"}, "Colorado": {"total_loans": 415561, "rate_gap_bw": 0.049, "rate_gap_hw": 0.215, "has_income_brackets": true, "shard": "/data/states/CO.44db03d0ab.json"}, "Connecticut": {"total_loans": 394424, "rate_gap_bw": 0.249, "rate_gap_hw": 0.268, "has_income_brackets": true, "shard": "/data/states/CT.9725964f76.json"}, "Washington DC": {"total_loans": 73352, "rate_gap_bw": 0.331, "rate_gap_hw": 0.147, "has_income_brackets": true, "shard": "/data/states/DC.558cf88e8e.json"}, "Delaware": {"total_loans": 139353, "rate_gap_bw": 0.286, "rate_gap_hw": 0.404, "has_income_brackets": true, "shard": "/data/states/DE.2b4de86e1f.json"}, "Florida": {"total_loans": 423914, "rate_gap_bw": 0.186, "rate_gap_hw": 0.195, "has_income_brackets": true, "shard": "/data/states/FL.692faf5ee3.json"}, "Georgia": {"total_loans": 411963, "rate_gap_bw": 0.214, "rate_gap_hw": 0.257, "has_income_brackets": true, "shard": "/data/states/GA.2068e88abe.json"}, "Hawaii": {"total_loans": 103680, "rate_gap_bw": -0.126, "rate_gap_hw": -0.018, "has_income_brackets": true, "shard": "/data/states/HI.facffb0f4b.json"}, "Iowa": {"total_loans": 409968, "rate_gap_bw": 0.195, "rate_gap_hw": 0.253, "has_income_brackets": true, "shard": "/data/states/IA.cc5e80b219.json"}, "Idaho": {"total_loans": 343021, "rate_gap_bw": 0.081, "rate_gap_hw": 0.25, "has_income_brackets": true, "shard": "/data/states/ID.3e774db6cc.json"}, "Illinois": {"total_loans": 441249, "rate_gap_bw": 0.347, "rate_gap_hw": 0.316, "has_income_brackets": true, "shard": "/data/states/IL.e226327a95.json"}, "Indiana": {"total_loans": 448837, "rate_gap_bw": 0.179, "rate_gap_hw": 0.234, "has_income_brackets": true, "shard": "/data/states/IN.62ceb8afa6.json"}, "Kansas": {"total_loans": 296647, "rate_gap_bw": 0.188, "rate_gap_hw": 0.264, "has_income_brackets": true, "shard": "/data/states/KS.632d589b04.json"}, "Kentucky": {"total_loans": 448289, "rate_gap_bw": 0.088, "rate_gap_hw": -0.083, "has_income_brackets": true, "shard": "/data/states/KY.2b03717566.json"}, "Louisiana": {"total_loans": 421603, "rate_gap_bw": 0.403, "rate_gap_hw": 0.147, "has_income_brackets": true, "shard": "/data/states/LA.b36ae8dbda.json"}, "Massachusetts": {"total_loans": 418284, "rate_gap_bw": 0.269, "rate_gap_hw": 0.312, "has_income_brackets": true, "shard": "/data/states/MA.d17a119b6c.json"}, "Maryland": {"total_loans": 406639, "rate_gap_bw": 0.257, "rate_gap_hw": 0.372, "has_income_brackets": true, "shard": "/data/states/MD.7822a64b42.json"}, "Maine": {"total_loans": 155498, "rate_gap_bw": 0.214, "rate_gap_hw": 0.05, "has_income_brackets": true, "shard": "/data/states/ME.4375ce0807.json"}, "Michigan": {"total_loans": 425052, "rate_gap_bw": 0.358, "rate_gap_hw": 0.208, "has_income_brackets": true, "shard": "/data/states/MI.8fe62ed687.json"}, "Minnesota": {"total_loans": 434888, "rate_gap_bw": 0.124, "rate_gap_hw": 0.193, "has_income_brackets": true, "shard": "/data/states/MN.56d4279930.json"}, "Missouri": {"total_loans": 442802, "rate_gap_bw": 0.19, "rate_gap_hw": 0.148, "has_income_brackets": true, "shard": "/data/states/MO.dc6d06240c.json"}, "Mississippi": {"total_loans": 67601, "rate_gap_bw": 0.272, "rate_gap_hw": 0.07, "has_income_brackets": true, "shard": "/data/states/MS.c9249175eb.json"}, "Montana": {"total_loans": 26881, "rate_gap_bw": 0.034, "rate_gap_hw": 0.005, "has_income_brackets": true, "shard": "/data/states/MT.17ce59d064.json"}, "North Carolina": {"total_loans": 170224, "rate_gap_bw": 0.017, "rate_gap_hw": 0.148, "has_income_brackets": true, "shard": "/data/states/NC.3e537f1bbd.json"}, "North Dakota": {"total_loans": 17699, "rate_gap_bw": 0.026, "rate_gap_hw": 0.121, "has_income_brackets": true, "shard": "/data/states/ND.e0f5b5e269.json"}, "Nebraska": {"total_loans": 50390, "rate_gap_bw": -0.044, "rate_gap_hw": -0.011, "has_income_brackets": true, "shard": "/data/states/NE.9d318b00e0.json"}, "New Hampshire": {"total_loans": 36611, "rate_gap_bw": 0.174, "rate_gap_hw": 0.189, "has_income_brackets": true, "shard": "/data/states/NH.3c35e8849e.json"}, "New Jersey": {"total_loans": 165971, "rate_gap_bw": 0.219, "rate_gap_hw": 0.271, "has_income_brackets": true, "shard": "/data/states/NJ.fc47965aef.json"}, "New Mexico": {"total_loans": 160580, "rate_gap_bw": 0.029, "rate_gap_hw": 0.43, "has_income_brackets": true, "shard": "/data/states/NM.5d1ee9deb0.json"}, "Nevada": {"total_loans": 397965, "rate_gap_bw": 0.069, "rate_gap_hw": 0.293, "has_income_brackets": true, "shard": "/data/states/NV.de85cff5ef.json"}, "New York": {"total_loans": 420144, "rate_gap_bw": 0.234, "rate_gap_hw": 0.184, "has_income_brackets": true, "shard": "/data/states/NY.dfe20965eb.json"}, "Ohio": {"total_loans": 440675, "rate_gap_bw": 0.255, "rate_gap_hw": 0.216, "has_income_brackets": true, "shard": "/data/states/OH.b1d39e8ec1.json"}, "Oklahoma": {"total_loans": 326626, "rate_gap_bw": 0.063, "rate_gap_hw": 0.287, "has_income_brackets": true, "shard": "/data/states/OK.92a16d4a93.json"}, "Oregon": {"total_loans": 404590, "rate_gap_bw": 0.038, "rate_gap_hw": 0.226, "has_income_brackets": true, "shard": "/data/states/OR.8202f82ae4.json"}, "Pennsylvania": {"total_loans": 430806, "rate_gap_bw": 0.342, "rate_gap_hw": 0.327, "has_income_brackets": true, "shard": "/data/states/PA.8da648d5f6.json"}, "Rhode Island": {"total_loans": 147714, "rate_gap_bw": 0.338, "rate_gap_hw": 0.423, "has_income_brackets": true, "shard": "/data/states/RI.c341abe37c.json"}, "South Carolina": {"total_loans": 426762, "rate_gap_bw": 0.368, "rate_gap_hw": 0.18, "has_income_brackets": true, "shard": "/data/states/SC.2cba601c50.json"}, "South Dakota": {"total_loans": 103913, "rate_gap_bw": 0.182, "rate_gap_hw": 0.217, "has_income_brackets": true, "shard": "/data/states/SD.8524a5bbd1.json"}, "Tennessee": {"total_loans": 435304, "rate_gap_bw": 0.148, "rate_gap_hw": 0.204, "has_income_brackets": true, "shard": "/data/states/TN.517017b71c.json"}, "Texas": {"total_loans": 418636, "rate_gap_bw": 0.165, "rate_gap_hw": 0.433, "has_income_brackets": true, "shard": "/data/states/TX.20d3fd40e1.json"}, "Utah": {"total_loans": 436404, "rate_gap_bw": 0.133, "rate_gap_hw": 0.386, "has_income_brackets": true, "shard": "/data/states/UT.57a1948d99.json"}, "Virginia": {"total_loans": 404706, "rate_gap_bw": 0.173, "rate_gap_hw": 0.184, "has_income_brackets": true, "shard": "/data/states/VA.d1dc572e62.json"}, "Vermont": {"total_loans": 59154, "rate_gap_bw": 0.078, "rate_gap_hw": 0.014, "has_income_brackets": true, "shard": "/data/states/VT.9279645b4f.json"}, "Washington": {"total_loans": 393115, "rate_gap_bw": 0.038, "rate_gap_hw": 0.168, "has_income_brackets": true, "shard": "/data/states/WA.a03d5e7c9f.json"}, "Wisconsin": {"total_loans": 450942, "rate_gap_bw": 0.404, "rate_gap_hw": 0.297, "has_income_brackets": true, "shard": "/data/states/WI.7d7765d579.json"}, "West Virginia": {"total_loans": 140729, "rate_gap_bw": -0.34, "rate_gap_hw": -0.36, "has_income_brackets": true, "shard": "/data/states/WV.588101bb4f.json"}, "Wyoming": {"total_loans": 70799, "rate_gap_bw": 0.01, "rate_gap_hw": 0.025, "has_income_brackets": true, "shard": "/data/states/WY.068a71f400.json"}}} as const;
 
 export default data;
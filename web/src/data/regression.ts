@@ -0,0 +1,15 @@
+export const regressionResults = {
+  n: 1892859,
+  r_squared: 0.0431,
+  adj_r_squared: 0.043,
+  controls: ["income", "loan_amount", "loan_to_value_ratio", "debt_to_income_ratio", "loan_type", "occupancy_type", "activity_year", "state"],
+  baseline: "White (non-Hispanic)",
+  coefficients: {
+    "Black": { coef: 0.071, ci_lower: 0.0616, ci_upper: 0.0804, p_value: 0.0, significant: true },
+    "Hispanic": { coef: 0.0966, ci_lower: 0.0873, ci_upper: 0.106, p_value: 0.0, significant: true },
+    "Asian": { coef: -0.1311, ci_lower: -0.1414, ci_upper: -0.1207, p_value: 0.0, significant: true },
+    "American Indian / Alaska Native": { coef: 0.0038, ci_lower: -0.033, ci_upper: 0.0406, p_value: 0.84, significant: false },
+    "Native Hawaiian / Pacific Islander": { coef: 0.0203, ci_lower: -0.0327, ci_upper: 0.0734, p_value: 0.454, significant: false },
+  },
+  methodology_note: "OLS regression on 1.9M originated mortgage loans (2018-2023). Dependent variable: rate spread above APOR benchmark. Controls: income, loan amount, LTV, DTI, loan type, occupancy type, state, and year fixed effects. Race/ethnicity coefficients represent the additional rate spread (in percentage points) relative to White non-Hispanic borrowers with identical observable characteristics."
+} as const;
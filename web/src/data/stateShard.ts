@@ -0,0 +1,52 @@
+import { useEffect, useState } from "react";
+import data from "./precomputed";
+
+// Full per-state stats, written by build_precomputed.py to public/data/states/
+export type StateShard = {
+  total_loans: number;
+  avg_rates: Record<string, number>;
+  avg_spreads: Record<string, number>;
+  rate_gap_bw: number;
+  rate_gap_hw: number;
+  avg_income: Record<string, number>;
+  avg_loan_amount: Record<string, number>;
+  loan_type_spreads: Record<string, Record<string, number>>;
+  income_brackets: Array<Record<string, string | number>>;
+  counts: Record<string, number>;
+  yearly_spreads: Record<string, Record<string, number>>;
+};
+
+const shards = new Map<string, Promise<StateShard>>();
+
+// Shard URLs carry a content hash, so each is fetched at most once per page load
+// (and can be cached by the browser indefinitely).
+export function loadStateShard(state: string): Promise<StateShard> {
+  let shard = shards.get(state);
+  if (!shard) {
+    const entry = data.state_summary[state as keyof typeof data.state_summary];
+    shard = fetch(entry.shard).then((res) => {
+      if (!res.ok) throw new Error(`${entry.shard}: ${res.status}`);
+      return res.json() as Promise<StateShard>;
+    });
+    shard.catch(() => shards.delete(state));
+    shards.set(state, shard);
+  }
+  return shard;
+}
+
+// The selected state's shard, or undefined while it loads.
+export function useStateShard(state: string | null): StateShard | undefined {
+  const [loaded, setLoaded] = useState<{ state: string; shard: StateShard }>();
+  useEffect(() => {
+    if (!state) return;
+    let current = true;
+    loadStateShard(state).then(
+      (shard) => current && setLoaded({ state, shard }),
+      () => {},
+    );
+    return () => {
+      current = false;
+    };
+  }, [state]);
+  return loaded?.state === state ? loaded.shard : undefined;
+}